@@ -0,0 +1,89 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+""" Time of a control step with and without the DEBUG tables """
+import logging
+import random
+import sys
+import types
+from timeit import timeit
+
+from sdwsn_controller.network.network import Network
+from sdwsn_controller.reinforcement_learning.reward_processing import EmulatedRewardProcessing
+from sdwsn_controller.routing.dijkstra import Dijkstra
+from sdwsn_controller.tsch.contention_free_scheduler import ContentionFreeScheduler
+
+NETWORK_SIZES = (20, 100)
+REPEAT = 10
+
+
+def build_network(num_nodes, rng):
+    config = types.SimpleNamespace(
+        network=types.SimpleNamespace(processing_window=200, control_window=1,
+                                      control_mtu=104, control_delta=False,
+                                      samples_window=None),
+        tsch=types.SimpleNamespace(max_channel=3, max_slotframe=500, slot_duration=10))
+    network = Network(config=config, socket=None)
+    network.nodes_add(id=0, sid="1.1", rank=0)
+    network.nodes_add(id=1, rank=0)
+    for node_id in range(2, num_nodes + 1):
+        # Binary tree with some extra links
+        node = network.nodes_add(node_id, rank=node_id.bit_length())
+        node.neighbor_add(node_id // 2, -rng.randrange(40, 70), 1)
+        node.neighbor_add(rng.randrange(1, num_nodes + 1), -rng.randrange(70, 95), 1)
+        for seq in range(1, 11):
+            node.energy_add(seq, rng.randrange(100, 1000))
+            node.delay_add(seq, rng.randrange(10, 500))
+            node.pdr_add(seq)
+    return network
+
+
+def build_reward_processing(network):
+    metric = types.SimpleNamespace(min=0, max=1000, norm_offset=0.1)
+    config = types.SimpleNamespace(performance_metrics=types.SimpleNamespace(
+        energy=metric, delay=metric, pdr=metric))
+    return EmulatedRewardProcessing(config, network=network)
+
+
+def main():
+    # The tables are built if the level is enabled, even if no handler
+    # prints them
+    main_logger = logging.getLogger('main')
+    main_logger.addHandler(logging.NullHandler())
+    main_logger.propagate = False
+    for num_nodes in NETWORK_SIZES:
+        network = build_network(num_nodes, random.Random(0))
+        router = Dijkstra(network)
+        scheduler = ContentionFreeScheduler(network)
+        reward_processing = build_reward_processing(network)
+
+        def step():
+            path = router.run(network.links())
+            scheduler.run(path, 100)
+            reward_processing.calculate_reward(0.3, 0.3, 0.4, None)
+
+        times = {}
+        for level in (logging.DEBUG, logging.INFO):
+            main_logger.setLevel(level)
+            times[level] = timeit(step, number=REPEAT) / REPEAT
+        print(f"{num_nodes:>4} nodes: {times[logging.DEBUG] * 1e3:8.1f} ms/step with DEBUG tables, "
+              f"{times[logging.INFO] * 1e3:6.1f} ms/step without ({times[logging.DEBUG] / times[logging.INFO]:.0f}x)")
+
+
+if __name__ == '__main__':
+    main()
+    sys.exit(0)
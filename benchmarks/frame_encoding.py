@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+""" Per-byte frame encoding against the whole-payload encoder """
+import random
+import sys
+from timeit import timeit
+
+from sdwsn_controller.sink_communication.framing import encode_frame, encode_frames
+
+NUM_PACKETS = 1000
+REPEAT = 20
+
+
+def per_byte_encoder(data):
+    """ Encoder used by SinkABC.send up to now """
+    byte_msg = bytearray()
+    byte_msg.extend(bytes.fromhex('7E'))
+    data = [data[i:i+1] for i in range(len(data))]
+    for byte in data:
+        if (ord(byte) == 0x7E or ord(byte) == 0x7D):
+            byte_msg.extend(bytes.fromhex('7D'))
+            invert = ord(byte) ^ ord(b'\x20')
+            byte_msg.extend(invert.to_bytes(len(byte), sys.byteorder))
+        else:
+            byte_msg.extend(byte)
+    byte_msg.extend(bytes.fromhex('7E'))
+    return bytes(byte_msg)
+
+
+def main():
+    rng = random.Random(0)
+    # RA/SA packets are up to ~100 bytes long
+    packets = [bytes(rng.randrange(256) for _ in range(rng.randrange(30, 110)))
+               for _ in range(NUM_PACKETS)]
+    assert all(per_byte_encoder(p) == encode_frame(p) for p in packets)
+    runs = {
+        "per byte": lambda: [per_byte_encoder(p) for p in packets],
+        "whole payload": lambda: [encode_frame(p) for p in packets],
+        "batched": lambda: encode_frames(packets),
+    }
+    for name, func in runs.items():
+        elapsed = timeit(func, number=REPEAT)
+        print(f"{name:>14}: {NUM_PACKETS*REPEAT/elapsed:,.0f} packets/s")
+
+
+if __name__ == '__main__':
+    main()
+    sys.exit(0)
@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+""" Memory taken by the network state at 1k and 10k nodes """
+import gc
+import random
+import sys
+import tracemalloc
+
+from sdwsn_controller.node.node import Node
+
+NETWORK_SIZES = (1000, 10000)
+NEIGHBORS = 8
+SAMPLES = 20
+
+
+def build_nodes(num_nodes, rng):
+    nodes = {}
+    for node_id in range(1, num_nodes + 1):
+        node = Node(node_id, sid=None, cycle_seq=1, rank=rng.randrange(1, 10))
+        for _ in range(NEIGHBORS):
+            node.neighbor_add(rng.randrange(1, num_nodes + 1), -rng.randrange(40, 90), rng.randrange(64, 512))
+        parent = max(1, node_id // 2)
+        node.route_add(1, parent)
+        node.tsch_add_link(1, 0, node_id % 100, dst=parent)
+        node.tsch_add_link(2, 1, (node_id + 50) % 100, dst=None)
+        for seq in range(1, SAMPLES + 1):
+            node.energy_add(seq, rng.randrange(100, 1000))
+            node.delay_add(seq, rng.randrange(10, 500))
+            node.pdr_add(seq)
+        nodes[node_id] = node
+    return nodes
+
+
+def main():
+    for num_nodes in NETWORK_SIZES:
+        rng = random.Random(0)
+        gc.collect()
+        tracemalloc.start()
+        nodes = build_nodes(num_nodes, rng)
+        size, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{num_nodes:>6} nodes: {size / 2**20:8.1f} MiB, {size / num_nodes:,.0f} bytes/node")
+        del nodes
+
+
+if __name__ == '__main__':
+    main()
+    sys.exit(0)
@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+""" Steps per second of the numerical environment, scalar and vectorized """
+import logging
+import os
+import sys
+import time
+
+import numpy as np
+
+from sdwsn_controller.config import SDWSNControllerConfig, CONTROLLERS
+
+CONFIG_FILE = os.path.normpath(os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "..", "tests",
+    "05-numerical-controller-approximation-model", "numerical_controller_approx_model.json"))
+NUM_ENVS = (1, 64, 1024, 8192)
+DURATION = 2.0
+
+
+def steps_per_second(step, steps_per_call):
+    calls = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < DURATION:
+        step()
+        calls += 1
+    return calls * steps_per_call / (time.perf_counter() - start)
+
+
+def main():
+    logging.getLogger('main').setLevel(logging.WARNING)
+    config = SDWSNControllerConfig.from_json_file(CONFIG_FILE)
+    controller = CONTROLLERS[config.controller_type](config)
+    rng = np.random.default_rng(0)
+    env = controller.reinforcement_learning.env
+    env.reset()
+
+    def env_step():
+        _, _, terminated, truncated, _ = env.step(int(rng.integers(3)))
+        if terminated or truncated:
+            env.reset()
+
+    print(f"Env:                    {steps_per_second(env_step, 1):>12,.0f} steps/s")
+    for num_envs in NUM_ENVS:
+        vec_env = controller.vec_env(num_envs, seed=0)
+        vec_env.reset()
+        actions = rng.integers(3, size=(64, num_envs))
+
+        def vec_env_step():
+            vec_env.step(actions[rng.integers(64)])
+
+        print(f"NumericalVecEnv (K={num_envs:>4}): {steps_per_second(vec_env_step, num_envs):>12,.0f} steps/s")
+
+
+if __name__ == '__main__':
+    main()
+    sys.exit(0)
@@ -0,0 +1,75 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+""" Packets per second encoded and decoded by the packet module """
+import random
+import struct
+import sys
+from timeit import timeit
+
+from sdwsn_controller.packet.packet import (
+    Cell_Packet, NA_Packet, NA_Packet_Payload, SDN_IP_Packet, SerialPacket, SDN_IPH_LEN, SDN_NAPL_LEN)
+
+NUM_PACKETS = 1000
+REPEAT = 10
+
+
+def encode(payload):
+    """ SA packet as built by common.tsch_build_pkt """
+    sa = Cell_Packet(payload, payload_len=len(payload), sf_len=31, seq=1).pack()
+    tlen = len(sa) + SDN_IPH_LEN
+    ip = SDN_IP_Packet(sa, vap=0x24, tlen=tlen, ttl=0x32, scr=0x0101, dest=0).pack()
+    return SerialPacket(ip, message_type=2, payload_len=tlen, reserved0=7).pack()
+
+
+def decode(data):
+    """ NA packet as parsed by the packet dissector """
+    serial_pkt = SerialPacket.unpack(data)
+    ip_pkt = SDN_IP_Packet.unpack(serial_pkt.payload)
+    na_pkt = NA_Packet.unpack(ip_pkt.payload, ip_pkt.tlen - SDN_IPH_LEN)
+    return [NA_Packet_Payload.unpack(na_pkt.payload, offset)
+            for offset in range(0, len(na_pkt.payload), SDN_NAPL_LEN)]
+
+
+def na_frame(rng):
+    # NA packet with a random number of neighbours
+    neighbors = b''.join(struct.pack('!HhH', rng.randrange(1, 50), -rng.randrange(40, 90), rng.randrange(256))
+                         for _ in range(rng.randrange(1, 10)))
+    na = struct.pack('!BBHHBBH', len(neighbors), 3, 100, 1, 1, 0, 0) + neighbors
+    tlen = len(na) + SDN_IPH_LEN
+    ip = SDN_IP_Packet(na, vap=0x22, tlen=tlen, ttl=0x40, scr=0x0202, dest=0x0101).pack()
+    return SerialPacket(ip, message_type=2, payload_len=tlen).pack()
+
+
+def main():
+    rng = random.Random(0)
+    # SA payloads of up to 11 cells
+    payloads = [bytes(rng.randrange(256) for _ in range(8 * rng.randrange(1, 12)))
+                for _ in range(NUM_PACKETS)]
+    frames = [na_frame(rng) for _ in range(NUM_PACKETS)]
+    runs = {
+        "encode": lambda: [encode(p) for p in payloads],
+        "decode": lambda: [decode(f) for f in frames],
+    }
+    for name, func in runs.items():
+        elapsed = timeit(func, number=REPEAT)
+        print(f"{name:>6}: {NUM_PACKETS*REPEAT/elapsed:,.0f} packets/s")
+
+
+if __name__ == '__main__':
+    main()
+    sys.exit(0)
@@ -0,0 +1,96 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+""" Computation time and path quality of the routers on synthetic topologies """
+import math
+import random
+import sys
+import types
+from timeit import timeit
+
+from sdwsn_controller.config import ROUTING_ALGO
+from sdwsn_controller.network.network import Network
+
+NETWORK_SIZES = (50, 200, 1000)
+# Average number of neighbors of a node
+DENSITY = 10
+REPEAT = 10
+
+
+def link_quality(distance, radius, rng):
+    """ RSSI and ETX of a link, from a log-distance path loss model """
+    rssi = -40 - 35 * math.log10(1 + 9 * distance / radius) + rng.gauss(0, 3)
+    prr = min(0.99, max(0.05, (rssi + 95) / 35))
+    return int(rssi), prr
+
+
+def build_network(num_nodes, seed):
+    config = types.SimpleNamespace(
+        network=types.SimpleNamespace(processing_window=200, control_window=1,
+                                      control_mtu=104, control_delta=False,
+                                      samples_window=None),
+        tsch=types.SimpleNamespace(max_channel=3, max_slotframe=500, slot_duration=10))
+    network = Network(config=config, socket=None)
+    network.nodes_add(id=0, sid="1.1", rank=0)
+    rng = random.Random(seed)
+    # Random geometric graph in the unit square, with the sink in the centre
+    radius = math.sqrt(DENSITY / (math.pi * num_nodes))
+    position = {1: (0.5, 0.5)}
+    for node_id in range(2, num_nodes + 1):
+        position[node_id] = (rng.random(), rng.random())
+    prr = {}
+    for node_id in position:
+        node = network.nodes_add(node_id)
+        node.energy_add(1, rng.randrange(100, 1000))
+    for src, (xs, ys) in position.items():
+        for dst, (xd, yd) in position.items():
+            distance = math.hypot(xs - xd, ys - yd)
+            if src < dst and distance < radius:
+                rssi, link_prr = link_quality(distance, radius, rng)
+                prr[(src, dst)] = prr[(dst, src)] = link_prr
+                etx = round(1 / link_prr, 2)
+                network.nodes_get(src).neighbor_add(dst, rssi, etx)
+                network.nodes_get(dst).neighbor_add(src, rssi, etx)
+    return network, prr
+
+
+def path_quality(paths, prr):
+    """ Mean number of hops and end-to-end delivery ratio without retransmissions """
+    hops = [len(path) - 1 for path in paths.values()]
+    pdr = [math.prod(prr[link] for link in zip(path, path[1:])) for path in paths.values()]
+    return sum(hops) / len(hops), sum(pdr) / len(pdr)
+
+
+def main():
+    for num_nodes in NETWORK_SIZES:
+        network, prr = build_network(num_nodes, 0)
+        G = network.links()
+        print(f"{num_nodes} nodes, {G.number_of_edges()} links")
+        for name, router_class in ROUTING_ALGO.items():
+            router = router_class(network)
+            paths = router.shortest_paths(G)
+            cached = timeit(lambda: router.shortest_paths(G), number=REPEAT) / REPEAT
+            # A new router every time, so that nothing is cached
+            fresh = timeit(lambda: router_class(network).shortest_paths(G), number=REPEAT) / REPEAT
+            hops, pdr = path_quality(paths, prr)
+            print(f"  {name:>12}: {fresh * 1e3:8.2f} ms ({cached * 1e3:6.2f} ms cached), "
+                  f"{len(paths)} routes, {hops:5.2f} hops, PDR {pdr:6.1%}")
+
+
+if __name__ == '__main__':
+    main()
+    sys.exit(0)
@@ -0,0 +1,99 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+""" Throughput of the byte-at-a-time deframer against the chunked one """
+import io
+import random
+import sys
+from time import perf_counter
+
+from sdwsn_controller.sink_communication.sink_abc import ByteStreamMixin, SinkABC
+
+NUM_FRAMES = 20000
+
+
+class MemorySink(ByteStreamMixin, SinkABC):
+    def __init__(self, stream):
+        self.stream = io.BytesIO(stream)
+        super().__init__()
+
+    @property
+    def name(self):
+        return "Memory"
+
+    @property
+    def ser(self):
+        return None
+
+    def connect(self, **kwargs):
+        return 0
+
+    def read_byte(self):
+        return self.stream.read(1)
+
+    def read_chunk(self):
+        return self.stream.read(4096)
+
+    def error_exception(self):
+        return OSError
+
+    def send_stream_bytes(self, stream_bytes):
+        pass
+
+
+def build_stream(num_frames):
+    rng = random.Random(0)
+    stream = bytearray()
+    for _ in range(num_frames):
+        # Typical NA/data packets, escaping included
+        frame = bytes(rng.randrange(256) for _ in range(rng.randrange(20, 60)))
+        frame = frame.replace(b'\x7d', b'\x7d\x5d').replace(b'\x7e', b'\x7d\x5e')
+        stream += b'\x7e' + frame + b'\x7e'
+    return bytes(stream)
+
+
+def byte_by_byte(stream):
+    sink = MemorySink(stream)
+    frames = 0
+    for _ in range(len(stream)):
+        if isinstance(sink._recv_internal(), tuple):
+            frames += 1
+    return frames
+
+
+def chunked(stream):
+    sink = MemorySink(stream)
+    frames = 0
+    while sink.recv(1.0) is not None:
+        frames += 1
+    return frames
+
+
+def main():
+    stream = build_stream(NUM_FRAMES)
+    print(f"{NUM_FRAMES} frames, {len(stream)/1e6:.2f} MB")
+    for name, func in (("byte by byte", byte_by_byte), ("chunked", chunked)):
+        start = perf_counter()
+        frames = func(stream)
+        elapsed = perf_counter() - start
+        print(f"{name:>14}: {frames} frames in {elapsed:.3f} s "
+              f"({frames/elapsed:,.0f} frames/s, {len(stream)/elapsed/1e6:.2f} MB/s)")
+
+
+if __name__ == '__main__':
+    main()
+    sys.exit(0)
@@ -37,10 +37,45 @@ def log_table(rich_table):
     return Text.from_ansi(capture.get())
 
 
+def samples_evict(samples, max_samples):
+    """
+    Bound a dict of samples, used as a ring buffer, to its last
+    `max_samples` insertions. Dicts keep the insertion order, so the oldest
+    sample is the first one.
+
+    Args:
+        samples (dict): Samples, oldest first.
+        max_samples (int): Max. number of samples, None for no limit.
+    """
+    if max_samples is not None and len(samples) > max_samples:
+        del samples[next(iter(samples))]
+
+
+def packetize(entries, max_payload_len):
+    """
+    Pack fixed-size control entries (routes or cells) into as few payloads
+    as possible, filling each one up to `max_payload_len` bytes.
+
+    Args:
+        entries (list): Packed entries, all of the same size.
+        max_payload_len (int): Max. payload length of a control packet.
+
+    Returns:
+        list: Payloads (bytes) ready to be sent.
+    """
+    if not entries:
+        return []
+    per_pkt = max_payload_len // len(entries[0])
+    if per_pkt < 1:
+        raise ValueError(
+            f'Control MTU too small for {len(entries[0])} bytes entries')
+    return [b''.join(entries[i:i + per_pkt]) for i in range(0, len(entries), per_pkt)]
+
+
 """ Build SA control packet """
 
 
-def tsch_build_pkt(payloadPacked, sf_len, seq):
+def tsch_build_pkt(payloadPacked, sf_len, seq, reserved0=None):
     logger.debug(f'Building TSCH packet with SF len {sf_len} and seq {seq}')
     payload_len = len(payloadPacked)
     # Build schedule packet header
@@ -64,9 +99,11 @@ def tsch_build_pkt(payloadPacked, sf_len, seq):
     sdn_ip_packed = sdn_ip_pkt.pack()
     logger.debug(repr(sdn_ip_pkt))
     # Build serial packet
+    if reserved0 is None:
+        reserved0 = randrange(1, 254)
     serial_pkt = SerialPacket(sdn_ip_packed, addr=0, pkt_chksum=0,
                               message_type=2, payload_len=length,
-                              reserved0=randrange(1, 254), reserved1=0)
+                              reserved0=reserved0, reserved1=0)
     packedData = serial_pkt.pack()
     logger.debug(repr(serial_pkt))
     return packedData, serial_pkt
@@ -75,7 +112,7 @@ def tsch_build_pkt(payloadPacked, sf_len, seq):
 """ Build RA control packet """
 
 
-def routing_build_pkt(payloadPacked, seq):
+def routing_build_pkt(payloadPacked, seq, reserved0=None):
     logger.debug(f'Building routes packet with seq {seq}')
     payload_len = len(payloadPacked)
     # Build RA packet
@@ -95,9 +132,11 @@ def routing_build_pkt(payloadPacked, seq):
     sdn_ip_pkt = SDN_IP_Packet(ra_packed,
                                vap=vap, tlen=length, ttl=ttl, scr=scr, dest=dest)
     sdn_ip_packed = sdn_ip_pkt.pack()
+    if reserved0 is None:
+        reserved0 = randrange(1, 254)
     serial_pkt = SerialPacket(sdn_ip_packed, addr=0, pkt_chksum=0,
                               message_type=2, payload_len=length,
-                              reserved0=randrange(1, 254), reserved1=0)
+                              reserved0=reserved0, reserved1=0)
     packedData = serial_pkt.pack()
     return packedData, serial_pkt
 
@@ -151,6 +190,7 @@ def build_link_schedules_matrix_obs(packet_dissector, mySchedule):
 eb_size = 397
 common_size = 31
 control_plane_size = 27
+ORCHESTRA_SLOTFRAME_SIZES = (eb_size, common_size, control_plane_size)
 
 
 def gcd(p, q):
@@ -164,32 +204,31 @@ def fc_is_coprime(x, y):
     return gcd(x, y) == 1
 
 
-def compare_coprime(num):
-    sf_sizes = [eb_size, common_size, control_plane_size]
+def compare_coprime(num, sf_sizes=ORCHESTRA_SLOTFRAME_SIZES):
     result = 0
     for sf_size in sf_sizes:
         is_coprime = fc_is_coprime(num, sf_size)
         result += is_coprime
 
-    if result == 3:
+    if result == len(sf_sizes):
         return 1
     else:
         return 0
 
 
-def next_coprime(num):
+def next_coprime(num, sf_sizes=ORCHESTRA_SLOTFRAME_SIZES):
     is_coprime = 0
     while not is_coprime:
         num += 1
         # Check if num is coprime with all other sf sizes
-        is_coprime = compare_coprime(num)
+        is_coprime = compare_coprime(num, sf_sizes)
     return num
 
 
-def previous_coprime(num):
+def previous_coprime(num, sf_sizes=ORCHESTRA_SLOTFRAME_SIZES):
     is_coprime = 0
     while not is_coprime:
         num -= 1
         # Check if num is coprime with all other sf sizes
-        is_coprime = compare_coprime(num)
+        is_coprime = compare_coprime(num, sf_sizes)
     return num
@@ -16,6 +16,8 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 from sdwsn_controller.sink_communication.sink_comm import SinkComm
 from sdwsn_controller.sink_communication.sink_serial import SinkSerial
+from sdwsn_controller.sink_communication.sink_comm_asyncio import AsyncSinkComm
+from sdwsn_controller.sink_communication.sink_serial_asyncio import AsyncSinkSerial
 from sdwsn_controller.reinforcement_learning.reward_processing \
     import EmulatedRewardProcessing
 from sdwsn_controller.reinforcement_learning.numerical_reward_processing import NumericalRewardProcessing
@@ -26,8 +28,13 @@ from sdwsn_controller.config.reinforcement_learning import REINFORCEMENTLEARNING
 
 from sdwsn_controller.tsch.contention_free_scheduler import ContentionFreeScheduler
 from sdwsn_controller.tsch.hard_coded_schedule import HardCodedScheduler
+from sdwsn_controller.tsch.graph_colouring_scheduler import GraphColouringScheduler
+from sdwsn_controller.tsch.traffic_aware_scheduler import TrafficAwareScheduler
 
 from sdwsn_controller.routing.dijkstra import Dijkstra
+from sdwsn_controller.routing.energy_aware import EnergyAwareRouter
+from sdwsn_controller.routing.etx import ETXRouter
+from sdwsn_controller.routing.hop_count import HopCountRouter
 
 
 from sdwsn_controller.exceptions import ConfigurationFileNotFoundError
@@ -49,16 +56,23 @@ REWARD_PROCESSORS = {
 
 SINK_COMMUNICATION = {
     'socket': SinkComm,
-    "serial": SinkSerial
+    "serial": SinkSerial,
+    "asyncio socket": AsyncSinkComm,
+    "asyncio serial": AsyncSinkSerial
 }
 
 TSCH_SCHEDULERS = {
     'Contention Free Scheduler': ContentionFreeScheduler,
-    'Hard Coded Scheduler': HardCodedScheduler
+    'Hard Coded Scheduler': HardCodedScheduler,
+    'Graph Colouring Scheduler': GraphColouringScheduler,
+    'Traffic Aware Scheduler': TrafficAwareScheduler
 }
 
 ROUTING_ALGO = {
-    "Dijkstra": Dijkstra
+    "Dijkstra": Dijkstra,
+    "ETX": ETXRouter,
+    "Hop Count": HopCountRouter,
+    "Energy Aware": EnergyAwareRouter
 }
 
 from sdwsn_controller.controller.container_controller import ContainerController
@@ -17,6 +17,14 @@
 
 # Default values
 DEFAULT_PROC_WINDOW = 200
+DEFAULT_CONTROL_WINDOW = 1
+# Max. length of the SDN IP control packets (RA/SA), headers included
+DEFAULT_CONTROL_MTU = 104
+# Send only the routes and cells that changed since the last acknowledged push
+DEFAULT_CONTROL_DELTA = False
+# Max. number of energy, delay and PDR samples kept per node, None keeps them
+# all
+DEFAULT_SAMPLES_WINDOW = None
 DEFAULT_HOST = 'localhost'
 DEFAULT_PORT = 1883
 DEFAULT_TSCH_MAX_CHANNEL = 3
@@ -25,6 +33,10 @@ DEFAULT_TSCH_MAX_SLOTFRAME = 500
 # Keys in the JSON configuration file
 NAME = "name"
 PROCESSING_WINDOW = 'processing_window'
+CONTROL_WINDOW = 'control_window'
+CONTROL_MTU = 'control_mtu'
+CONTROL_DELTA = 'control_delta'
+SAMPLES_WINDOW = 'samples_window'
 HOST = "host"
 PORT = 'port'
 TSCH = 'tsch'
@@ -46,7 +58,11 @@ class NETWORKConfig:
 
     def __init__(self,
                  name=None,
-                 processing_window=DEFAULT_PROC_WINDOW
+                 processing_window=DEFAULT_PROC_WINDOW,
+                 control_window=DEFAULT_CONTROL_WINDOW,
+                 control_mtu=DEFAULT_CONTROL_MTU,
+                 control_delta=DEFAULT_CONTROL_DELTA,
+                 samples_window=DEFAULT_SAMPLES_WINDOW
                  ):
         """Initialize a :class:`.MQTTConfig` object.
 
@@ -65,6 +81,10 @@ class NETWORKConfig:
         """
         self.name = name
         self.processing_window = processing_window
+        self.control_window = control_window
+        self.control_mtu = control_mtu
+        self.control_delta = control_delta
+        self.samples_window = samples_window
 
     @classmethod
     def from_json(cls, json_object=None):
@@ -82,7 +102,11 @@ class NETWORKConfig:
 
         {
             "name": "Cooja",
-            "processing_window": 200
+            "processing_window": 200,
+            "control_window": 1,
+            "control_mtu": 104,
+            "control_delta": false,
+            "samples_window": null
         }
         """
         if json_object is None:
@@ -91,5 +115,13 @@ class NETWORKConfig:
         return cls(
             name=json_object.get(NAME),
             processing_window=json_object.get(
-                PROCESSING_WINDOW, DEFAULT_PROC_WINDOW)
+                PROCESSING_WINDOW, DEFAULT_PROC_WINDOW),
+            control_window=json_object.get(
+                CONTROL_WINDOW, DEFAULT_CONTROL_WINDOW),
+            control_mtu=json_object.get(
+                CONTROL_MTU, DEFAULT_CONTROL_MTU),
+            control_delta=json_object.get(
+                CONTROL_DELTA, DEFAULT_CONTROL_DELTA),
+            samples_window=json_object.get(
+                SAMPLES_WINDOW, DEFAULT_SAMPLES_WINDOW)
         )
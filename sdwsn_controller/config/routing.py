@@ -15,8 +15,14 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+# Default values
+# Relative improvement needed to change the parent of a node, None disables
+# the hysteresis
+DEFAULT_HYSTERESIS = None
+
 # Keys in the JSON configuration file
 ALGO = "algo"
+HYSTERESIS = "hysteresis"
 
 
 class ROUTINGConfig:
@@ -30,7 +36,7 @@ class ROUTINGConfig:
             `None`.
     """
 
-    def __init__(self, algo=None):
+    def __init__(self, algo=None, hysteresis=DEFAULT_HYSTERESIS):
         """Initialize a :class:`.MQTTAuthConfig` object.
 
         Args:
@@ -42,6 +48,7 @@ class ROUTINGConfig:
         All arguments are optional.
         """
         self.algo = algo
+        self.hysteresis = hysteresis
 
     @classmethod
     def from_json(cls, json_object=None):
@@ -58,9 +65,11 @@ class ROUTINGConfig:
 
         The JSON object should have the following format:
 
-         "algo": "Dijkstra"
+         "algo": "Dijkstra",
+         "hysteresis": 0.1
         """
         if json_object is None:
             json_object = {}
 
-        return cls(algo=json_object.get(ALGO))
+        return cls(algo=json_object.get(ALGO),
+                   hysteresis=json_object.get(HYSTERESIS, DEFAULT_HYSTERESIS))
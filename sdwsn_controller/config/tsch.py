@@ -19,12 +19,14 @@
 DEFAULT_MAX_CHANNEL = 3
 DEFAULT_MAX_SLOTFRAME = 70
 DEFAULT_SLOT_DURATION = 10
+DEFAULT_ORCHESTRA_SLOTFRAMES = [397, 31, 27]
 
 # Keys in the JSON configuration file
 SCHEDULER = "scheduler"
 MAX_CHANNEL = "max_channel"
 MAX_SLOTFRAME = "max_slotframe"
 SLOT_DURATION = "slot_duration"
+ORCHESTRA_SLOTFRAMES = "orchestra_slotframes"
 
 
 class TSCHConfig:
@@ -39,7 +41,8 @@ class TSCHConfig:
     """
 
     def __init__(self, scheduler=None, max_channel=None,
-                 max_slotframe=None, slot_duration=None):
+                 max_slotframe=None, slot_duration=None,
+                 orchestra_slotframes=None):
         """Initialize a :class:`.MQTTAuthConfig` object.
 
         Args:
@@ -54,6 +57,7 @@ class TSCHConfig:
         self.max_channel = max_channel
         self.max_slotframe = max_slotframe
         self.slot_duration = slot_duration
+        self.orchestra_slotframes = orchestra_slotframes
 
     @classmethod
     def from_json(cls, json_object=None):
@@ -74,7 +78,8 @@ class TSCHConfig:
             "scheduler": "Contention Free Scheduler",
             "max_channel": 3,
             "max_slotframe": 500,
-            "slot_duration": 10
+            "slot_duration": 10,
+            "orchestra_slotframes": [397, 31, 27]
         }
         """
         if json_object is None:
@@ -86,4 +91,6 @@ class TSCHConfig:
                    max_slotframe=json_object.get(
                        MAX_SLOTFRAME, DEFAULT_MAX_SLOTFRAME),
                    slot_duration=json_object.get(
-                       SLOT_DURATION, DEFAULT_SLOT_DURATION))
+                       SLOT_DURATION, DEFAULT_SLOT_DURATION),
+                   orchestra_slotframes=json_object.get(
+                       ORCHESTRA_SLOTFRAMES, DEFAULT_ORCHESTRA_SLOTFRAMES))
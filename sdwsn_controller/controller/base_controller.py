@@ -23,12 +23,14 @@ import gymnasium as gym
 
 import numpy as np
 
+from sdwsn_controller.exceptions import SlotframeFullError
 from sdwsn_controller.config import REWARD_PROCESSORS, TSCH_SCHEDULERS, ROUTING_ALGO, SINK_COMMUNICATION
 from sdwsn_controller.reinforcement_learning.reinforcement_learning import ReinforcementLearning
 from sdwsn_controller.sink_communication.sink_abc import SinkABC
 from sdwsn_controller.reinforcement_learning.env import Env
 from sdwsn_controller.mqtt.app_layer import AppLayer
 from sdwsn_controller.network.network import Network
+from sdwsn_controller.routing.route_stabiliser import RouteStabiliser
 
 
 from time import sleep
@@ -88,7 +90,8 @@ class BaseController(ABC):
         env = Env(
             # config.reinforcement_learning.id,
             controller=self,
-            max_slotframe_size=config.tsch.max_slotframe
+            max_slotframe_size=config.tsch.max_slotframe,
+            orchestra_sizes=config.tsch.orchestra_slotframes
         )
         env = gym.wrappers.TimeLimit(
             env,
@@ -118,6 +121,11 @@ class BaseController(ABC):
             self.router = router_class(
                 network=self.network
             )
+            if config.routing.hysteresis is not None:
+                self.router = RouteStabiliser(
+                    router=self.router,
+                    margin=config.routing.hysteresis
+                )
             logger.info(f'Routing: {self.router.name}')
         else:
             logger.warn("No routing algorithm running")
@@ -210,8 +218,21 @@ class BaseController(ABC):
             return self.network.tsch_sendall()
 
     def compute_tsch_schedule(self, path, current_sf_size):
+        """
+        It computes the TSCH schedule of the given routes.
+
+        Returns:
+            bool: False if the links do not fit in the slotframe, the
+            schedule is then incomplete and it has to be computed again
+            with a larger slotframe; True otherwise.
+        """
         if self.tsch_scheduler:
-            self.tsch_scheduler.run(path, current_sf_size)
+            try:
+                self.tsch_scheduler.run(path, current_sf_size)
+            except SlotframeFullError as ex:
+                logger.warning(f"{self.tsch_scheduler.name}: {ex}")
+                return False
+        return True
 
     @ property
     def last_tsch_link(self):
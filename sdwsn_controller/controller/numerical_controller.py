@@ -17,6 +17,7 @@
 from datetime import datetime
 
 from sdwsn_controller.controller.base_controller import BaseController
+from sdwsn_controller.reinforcement_learning.numerical_vec_env import NumericalVecEnv
 
 import logging
 
@@ -31,10 +32,36 @@ class NumericalController(BaseController):
 
         logger.info("Building numerical controller")
 
+        self.__max_slotframe_size = config.tsch.max_slotframe
+        self.__orchestra_sizes = config.tsch.orchestra_slotframes
+        self.__max_episode_steps = config.reinforcement_learning.max_episode_steps
+
         super().__init__(
             config=config
         )
 
+    def vec_env(self, num_envs, seed=None):
+        """
+        Vectorized environment that steps `num_envs` copies of the
+        numerical environment at once, for stable-baselines3.
+
+        Args:
+            num_envs (int): Number of environments.
+            seed (int, optional): Seed of the random generator. Defaults
+                to None.
+
+        Returns:
+            NumericalVecEnv: The vectorized environment.
+        """
+        return NumericalVecEnv(
+            reward_processor=self.reinforcement_learning.reward_processor,
+            num_envs=num_envs,
+            max_slotframe_size=self.__max_slotframe_size,
+            orchestra_sizes=self.__orchestra_sizes,
+            max_episode_steps=self.__max_episode_steps,
+            seed=seed
+        )
+
     # Controller related functions
     def timeout(self):
         pass
@@ -14,3 +14,12 @@ class ConfigurationFileNotFoundError(SDWSNControllerError):
     def __init__(self, filename):
         """Initialize the exception with a string representing the filename."""
         self.filename = filename
+
+
+class SlotframeFullError(SDWSNControllerError):
+    """Raised when a TSCH scheduler runs out of free timeslots."""
+
+    def __init__(self, slotframe_size):
+        """Initialize the exception with the slotframe size that is full."""
+        self.slotframe_size = slotframe_size
+        super().__init__(f"No free timeslot left in a slotframe of size {slotframe_size}")
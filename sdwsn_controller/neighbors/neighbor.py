@@ -16,6 +16,7 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import logging
+import threading
 
 from rich.table import Table
 
@@ -26,29 +27,56 @@ logger = logging.getLogger(f'main.{__name__}')
 
 
 class Neighbor():
+    __slots__ = ('neighbor_id', 'rssi', 'etx')
+
     def __init__(
         self,
         neighbor_id,
         rssi,
         etx
     ) -> None:
-        assert isinstance(neighbor_id, int)
-        assert isinstance(rssi, int)
-        assert isinstance(etx, int)
         self.neighbor_id = neighbor_id
         self.rssi = rssi
         self.etx = etx
 
 
 class NeighborTable():
+    __slots__ = ('node', 'graph', 'lock', 'neighbors')
+
     def __init__(
         self,
-        node
+        node,
+        graph=None,
+        lock=None
     ) -> None:
+        """
+        Neighbors of a node, as reported in its NA packets.
+
+        Args:
+            node (Node): Owner of the table.
+            graph (networkx.DiGraph, optional): Network-wide link graph
+                kept up to date with the links of this table. Defaults to
+                None.
+            lock (threading.Lock, optional): Lock that guards the link
+                graph, shared with its readers. Defaults to None.
+        """
         self.node = node
-        self.clear()
+        self.graph = graph
+        self.lock = lock if lock is not None else threading.Lock()
+        self.neighbors = {}
+
+    def __remove_links(self, ends):
+        self.graph.remove_edges_from(
+            [(self.node.id, nbr) for nbr in ends if self.graph.has_edge(self.node.id, nbr)])
+        # Only keep the nodes that still have links
+        self.graph.remove_nodes_from(
+            [id for id in (self.node.id, *ends) if id in self.graph and not self.graph.degree(id)])
 
     def clear(self):
+        if self.graph is not None:
+            with self.lock:
+                if self.node.id in self.graph:
+                    self.__remove_links(list(self.graph.successors(self.node.id)))
         self.neighbors = {}
 
     def size(self) -> int:
@@ -64,18 +92,34 @@ class NeighborTable():
                 f"Neighbor ID {neighbor_id} already exists. Updating RSSI and ETX.")
             nbr.rssi = rssi
             nbr.etx = etx
+            self.__add_link(nbr)
             return nbr
         logger.debug(
             f'Node {self.node.id}: add neighbor to {neighbor_id} ({rssi}, {etx})')
         nbr = Neighbor(neighbor_id=neighbor_id, rssi=rssi, etx=etx)
         self.neighbors.update({neighbor_id: nbr})
+        self.__add_link(nbr)
         return nbr
 
+    def __add_link(self, nbr):
+        if self.graph is None:
+            return
+        with self.lock:
+            if nbr.rssi == 0:
+                # No RSSI, no link
+                if self.node.id in self.graph:
+                    self.__remove_links([nbr.neighbor_id])
+                return
+            self.graph.add_edge(self.node.id, nbr.neighbor_id,
+                                weight=-nbr.rssi, rssi=nbr.rssi, etx=nbr.etx)
+
     def lookup_neighbor(self, neighbor_id) -> Neighbor:
         if neighbor_id in self.neighbors:
             return self.neighbors.get(neighbor_id)
 
     def print(self):
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         table = Table(title=f"Neighbor table for node: {self.node.id}")
 
         table.add_column("Neighbor", justify="center",
@@ -19,7 +19,7 @@ from typing import Dict, Optional, List, Any, Callable
 import time
 import logging
 import threading
-import numpy as np
+from collections import deque
 import pandas as pd
 import networkx as nx
 from rich.table import Table
@@ -27,12 +27,18 @@ from rich.progress import Progress
 
 from sdwsn_controller.common import common
 from sdwsn_controller.node.node import Node
+from sdwsn_controller.tsch.schedule import TSCHOccupancy
+from sdwsn_controller.network.rtt_estimator import RTTEstimator
 from sdwsn_controller.packet.packet import Cell_Packet_Payload, RA_Packet_Payload
+from sdwsn_controller.packet.packet import SDN_IPH_LEN, SDN_RAH_LEN, SDN_SAH_LEN, SDN_RA_ENTRY_LEN, SDN_SA_ENTRY_LEN
 from sdwsn_controller.packet.packet_dissector import PacketDissector
 
 
 logger = logging.getLogger(f'main.{__name__}')
 
+# Max. number of transmissions of a control packet
+RTX_LIMIT = 7
+
 
 class Network:
     def __init__(
@@ -41,9 +47,20 @@ class Network:
         socket: Any
     ) -> None:
         processing_window = config.network.processing_window
+        control_window = config.network.control_window
+        control_mtu = config.network.control_mtu
+        control_delta = config.network.control_delta
+        samples_window = config.network.samples_window
         tsch_max_ch = config.tsch.max_channel
         tsch_max_sf = config.tsch.max_slotframe
         self.nodes: Dict[int, Node] = {}
+        # Cells in use across all nodes
+        self.tsch_occupancy: TSCHOccupancy = TSCHOccupancy()
+        # Links reported in the NA packets, kept up to date as they arrive.
+        # The weight of a link is its RSSI, in absolute value. The sink
+        # reader updates it, so it is only accessed holding link_lock.
+        self.link_graph: nx.DiGraph = nx.DiGraph()
+        self.link_lock: threading.Lock = threading.Lock()
         self.max_node_id: int = 0
         self.socket: Any = socket
         self.packet_dissector: PacketDissector = PacketDissector(
@@ -52,12 +69,28 @@ class Network:
         )
         self.network_running: bool = False
         self.processing_window: int = processing_window
+        # Max. number of unacknowledged control packets
+        self.control_window: int = control_window
+        # Max. length of the SDN IP control packets, headers included
+        self.control_mtu: int = control_mtu
+        # Only push what changed since the last acknowledged push
+        self.control_delta: bool = control_delta
+        # Max. number of metric samples kept per node, None keeps them all
+        self.samples_window: Optional[int] = samples_window
+        # Snapshot of what the network has acknowledged. None means that we
+        # do not know it, so the next push has to be a full one.
+        self.routes_acked: Optional[Dict[bytes, bytes]] = None
+        self.tsch_acked: Optional[set] = None
+        self.tsch_acked_sf: int = 0
+        self.control_pkt_results: List[bool] = []
+        self.__reserved0: int = 0
         self.read_socket_thread: Optional[threading.Thread] = None
         self.tsch_slotframe_size: int = 0
         self.tsch_max_ch: int = tsch_max_ch
         self.tsch_max_sf: int = tsch_max_sf
         self.name: str = "Cooja network"
         self.__timeout: float = 1.2
+        self.rtt_estimator: RTTEstimator = RTTEstimator(self.__timeout)
         self.energy_callback: Optional[Callable] = None
         self.delay_callback: Optional[Callable] = None
         self.pdr_callback: Optional[Callable] = None
@@ -71,6 +104,9 @@ class Network:
 
     def nodes_clear(self) -> None:
         self.nodes = {}
+        self.tsch_occupancy.clear()
+        with self.link_lock:
+            self.link_graph.clear()
 
     def nodes_size(self) -> int:
         return len(self.nodes)
@@ -93,7 +129,11 @@ class Network:
             if cycle_seq is not None:
                 node.cycle_seq = cycle_seq
             return node
-        node = Node(id, sid=sid, rank=rank, cycle_seq=cycle_seq)
+        node = Node(id, sid=sid, rank=rank, cycle_seq=cycle_seq,
+                    tsch_occupancy=self.tsch_occupancy,
+                    link_graph=self.link_graph,
+                    link_lock=self.link_lock,
+                    samples_window=self.samples_window)
         if self.energy_callback:
             node.energy_register_callback(callback=self.energy_callback)
         if self.delay_callback:
@@ -132,6 +172,10 @@ class Network:
             node.route_clear()
 
     def routes_print(self) -> None:
+        # Building and rendering the tables is expensive, skip it when
+        # the message would be dropped anyway
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         table = Table(title="Network routing table")
 
         table.add_column("Source", justify="center",
@@ -152,46 +196,84 @@ class Network:
             routes[node] = node.routes_get()
         return routes
 
-    def routes_sendall(self):
-        logger.debug('Sending all routes')
-        sent = 0
-        num_pkts = 0
-        payload = None
+    def routes_entries(self) -> Dict[bytes, bytes]:
+        """
+        Packed RA entries of all routes, keyed by their (src, dst) address
+        pair.
+        """
+        entries = {}
         for node, routes in self.routes_get().items():
             for route in routes.values():
                 src = node.sid
                 dst = self.nodes_get(route.dst_id).sid
                 via = self.nodes_get(route.nexthop_id).sid
-                route_pkt = RA_Packet_Payload(
-                    dst=dst, src=src, via=via, payload=payload)
-                routed_pkt = route_pkt.pack()
-                if len(routed_pkt) > 80:
-                    num_pkts += 1
-                    logger.debug(
-                        f'Sending routing packet {num_pkts} with {len(routed_pkt)} bytes')
-                    # We send the current payload
-                    if self.send_routing_packet(routed_pkt):
-                        sent += 1
-                    payload = None
-                else:
-                    # Append the packet to the payload
-                    payload = routed_pkt
-        # Send the remaining payload if there is one
-        if payload:
-            num_pkts += 1
+                entry = RA_Packet_Payload(
+                    dst=dst, src=src, via=via, payload=None).pack()
+                entries[entry[:4]] = entry
+        return entries
+
+    def routes_payloads(self) -> list:
+        """
+        Pack all routes into as few RA payloads as the control MTU allows.
+
+        Returns:
+            list: RA payloads, one per control packet.
+        """
+        return common.packetize(list(self.routes_entries().values()),
+                                self.control_mtu - SDN_IPH_LEN - SDN_RAH_LEN)
+
+    def routes_delta(self, entries) -> Optional[list]:
+        """
+        Routes that are new or changed since the last acknowledged push.
+
+        Args:
+            entries (dict): Current entries, as returned by `routes_entries`.
+
+        Returns:
+            list: Entries to send, or None if a full push is needed, i.e.,
+            there is no snapshot or some routes have been removed.
+        """
+        acked = self.routes_acked
+        if not self.control_delta or acked is None or not acked.keys() <= entries.keys():
+            return None
+        return [entry for key, entry in entries.items() if acked.get(key) != entry]
+
+    def routes_sendall(self):
+        logger.debug('Sending all routes')
+        entries = self.routes_entries()
+        changes = self.routes_delta(entries)
+        full = changes is None
+        if full:
+            changes = list(entries.values())
+        payloads = common.packetize(changes, self.control_mtu - SDN_IPH_LEN - SDN_RAH_LEN)
+        logger.info(f'Sending {len(changes)}/{len(entries)} routes in {len(payloads)} packets')
+        packets = []
+        for num_pkt, payload in enumerate(payloads, start=1):
             logger.debug(
-                f'Sending routing packet {num_pkts} with {len(payload)} bytes')
-            if self.send_routing_packet(payload):
-                sent += 1
+                f'Sending routing packet {num_pkt} with {len(payload)} bytes')
+            packets.append(self.build_routing_packet(payload))
+        results = self.reliable_send_window(packets)
+        # Update the snapshot with what the network has acknowledged
+        if full:
+            self.routes_acked = entries if all(results) else None
+        else:
+            for payload, acked in zip(payloads, results):
+                if acked:
+                    for idx in range(0, len(payload), SDN_RA_ENTRY_LEN):
+                        entry = payload[idx:idx + SDN_RA_ENTRY_LEN]
+                        self.routes_acked[entry[:4]] = entry
         # Update stats
-        self.stats_routing_pkt_sent += num_pkts
-        return sent == num_pkts
+        self.stats_routing_pkt_sent += len(packets)
+        return all(results)
 
-    def send_routing_packet(self, payload):
+    def build_routing_packet(self, payload):
         packed_data, serial_pkt = common.routing_build_pkt(
-            payload, self.cycle_sequence_increase())
+            payload, self.cycle_sequence_increase(), self.next_reserved0())
+        return packed_data, serial_pkt.reserved0+1
+
+    def send_routing_packet(self, payload):
         # Send NC packet
-        return self.reliable_send(packed_data, serial_pkt.reserved0+1)
+        return self.reliable_send(*self.build_routing_packet(payload))
 
     # ---------------------------------------------------------------------------
     def cycle_sequence(self) -> int:
@@ -210,24 +292,23 @@ class Network:
         return tx.tsch_link_exists(rx.id)
 
     def tsch_timeslot_free(self, ts: int) -> bool:
-        for node in self.nodes.values():
-            if not node.tsch_timeslot_free(ts):
-                return False
-        return True
+        return self.tsch_occupancy.timeslot_free(ts)
+
+    def tsch_free_timeslots(self, num_timeslots: int) -> List[int]:
+        """
+        Timeslots in [0, num_timeslots) that no node uses in any channel.
+        """
+        return self.tsch_occupancy.free_timeslots(num_timeslots)
 
     def tsch_last_ts(self) -> int:
-        last_ts = 0
-        for node in self.nodes.values():
-            last_ts = max(last_ts, node.tsch_last_ts())
-        return last_ts
+        return self.tsch_occupancy.last_ts
 
     def tsch_last_ch(self) -> int:
-        last_ch = 0
-        for node in self.nodes.values():
-            last_ch = max(last_ch, node.tsch_last_ch())
-        return last_ch
+        return self.tsch_occupancy.last_ch
 
     def tsch_print(self):
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         # Get the last active timeslot and channel
         max_columns = self.tsch_last_ts()
         max_rows = self.tsch_last_ch()
@@ -277,70 +358,104 @@ class Network:
             routes[node_id] = schedules.tsch_get()
         return routes
 
-    def tsch_sendall(self):
-        logger.debug(f"Sending all schedules (SF: {self.tsch_slotframe_size})")
-        sent = 0
-        num_pkts = 0
-        payload = None
+    def tsch_entries(self) -> List[bytes]:
+        """
+        Packed SA entries of all scheduled cells.
+        """
+        entries = []
         for node_id, schedules in self.tsch_schedules().items():
             for schedule in schedules.values():
-                ch = schedule.ch
-                ts = schedule.ts
-                dst = schedule.dst_id
-                schedule_type = schedule.schedule_type
-                cell_pkt = Cell_Packet_Payload(payload=payload, type=schedule_type,
-                                               channel=ch, timeslot=ts, scr=node_id,
-                                               dst=dst)
-                cell_packed = cell_pkt.pack()
-                if len(cell_packed) > 80:
-                    num_pkts += 1
-                    logger.debug(
-                        f'Sending TSCH packet {num_pkts} with {len(payload)} bytes')
-                    # We send the current payload
-                    current_sf_size = self.tsch_slotframe_size if num_pkts == 1 else 0
-                    # We send the current payload
-                    if self.send_tsch_packet(cell_packed, current_sf_size):
-                        sent += 1
-                    payload = None
-                else:
-                    payload = cell_packed
-        # Send the remain payload if there is one
-        if payload:
-            num_pkts += 1
+                entries.append(Cell_Packet_Payload(
+                    payload=None, type=schedule.schedule_type,
+                    channel=schedule.ch, timeslot=schedule.ts, scr=node_id,
+                    dst=schedule.dst_id).pack())
+        return entries
+
+    def tsch_payloads(self) -> list:
+        """
+        Pack all scheduled cells into as few SA payloads as the control MTU
+        allows.
+
+        Returns:
+            list: SA payloads, one per control packet.
+        """
+        return common.packetize(self.tsch_entries(), self.control_mtu - SDN_IPH_LEN - SDN_SAH_LEN)
+
+    def tsch_delta(self, entries) -> Optional[list]:
+        """
+        Cells added since the last acknowledged push.
+
+        Args:
+            entries (list): Current entries, as returned by `tsch_entries`.
+
+        Returns:
+            list: Entries to send, or None if a full push is needed, i.e.,
+            there is no snapshot or some cells have been removed or changed.
+        """
+        acked = self.tsch_acked
+        if not self.control_delta or acked is None or not acked <= set(entries):
+            return None
+        return [entry for entry in entries if entry not in acked]
+
+    def tsch_sendall(self):
+        logger.debug(f"Sending all schedules (SF: {self.tsch_slotframe_size})")
+        sf_size = self.tsch_slotframe_size
+        entries = self.tsch_entries()
+        changes = self.tsch_delta(entries)
+        full = changes is None
+        if full:
+            changes = entries
+        payloads = common.packetize(changes, self.control_mtu - SDN_IPH_LEN - SDN_SAH_LEN)
+        sf_changed = full or sf_size != self.tsch_acked_sf
+        if not payloads and not full and sf_changed:
+            # Only the slotframe size has changed
+            payloads = [b'']
+        logger.info(f'Sending {len(changes)}/{len(entries)} cells in {len(payloads)} packets')
+        packets = []
+        for num_pkt, payload in enumerate(payloads, start=1):
             logger.debug(
-                f'Sending TSCH packet {num_pkts} with {len(payload)} bytes')
-            current_sf_size = self.tsch_slotframe_size if num_pkts == 1 else 0
-            if self.send_tsch_packet(payload, current_sf_size):
-                sent += 1
+                f'Sending TSCH packet {num_pkt} with {len(payload)} bytes')
+            # Only the first packet carries the slotframe size
+            current_sf_size = sf_size if num_pkt == 1 and sf_changed else 0
+            packets.append(self.build_tsch_packet(payload, current_sf_size))
+        results = self.reliable_send_window(packets)
+        # Update the snapshot with what the network has acknowledged
+        if full:
+            self.tsch_acked = set(entries) if all(results) else None
+            self.tsch_acked_sf = sf_size
+        else:
+            if sf_changed and results[0]:
+                self.tsch_acked_sf = sf_size
+            for payload, acked in zip(payloads, results):
+                if acked:
+                    self.tsch_acked.update(
+                        payload[idx:idx + SDN_SA_ENTRY_LEN]
+                        for idx in range(0, len(payload), SDN_SA_ENTRY_LEN))
         # Update stats
-        self.stats_tsch_pkt_sent += num_pkts
-        return sent == num_pkts
+        self.stats_tsch_pkt_sent += len(packets)
+        return all(results)
 
-    def send_tsch_packet(self, payload, sf):
+    def build_tsch_packet(self, payload, sf):
         packed_data, serial_pkt = common.tsch_build_pkt(
-            payload, sf, self.cycle_sequence_increase())
+            payload, sf, self.cycle_sequence_increase(), self.next_reserved0())
+        return packed_data, serial_pkt.reserved0+1
+
+    def send_tsch_packet(self, payload, sf):
         # Send NC packet
-        return self.reliable_send(packed_data, serial_pkt.reserved0+1)
+        return self.reliable_send(*self.build_tsch_packet(payload, sf))
 
     # --------------------------------------------------------------------
 
     def links(self) -> nx.DiGraph:
         """
-        Construct a directed graph of neighbor relationships based on RSSI values.
+        Directed graph of neighbor relationships based on RSSI values.
+
+        The graph is updated as the NA packets arrive, so this is a
+        snapshot of it. Edges have the `weight` (-RSSI), `rssi` and `etx`
+        attributes.
         """
-        num_nodes = self.max_node_id + 1
-        neighbor_matrix = np.zeros(shape=(num_nodes, num_nodes))
-        for node in self.nodes.values():
-            neighbors = node.neighbors_get().values()
-            for nbr in neighbors:
-                src = node.id
-                dst = nbr.neighbor_id
-                rssi = nbr.rssi
-                neighbor_matrix[int(src)][int(dst)] = rssi
-        matrix = neighbor_matrix * -1
-        graph = nx.from_numpy_array(matrix, create_using=nx.DiGraph)
-        graph.remove_nodes_from(list(nx.isolates(graph)))
-        return graph
+        with self.link_lock:
+            return self.link_graph.copy()
 
     def wait(self) -> bool:
         """Wait for the current cycle to finish."""
@@ -373,7 +488,9 @@ class Network:
 
     @timeout.setter
     def timeout(self, val):
+        # Initial retransmission timeout, until we measure the RTT
         self.__timeout = val
+        self.rtt_estimator = RTTEstimator(val)
 
     def send(self, data):
         if self.socket is not None:
@@ -383,10 +500,35 @@ class Network:
             else:
                 logger.warning("Couldn't send data, network is not running")
 
+    def send_many(self, packets):
+        """
+        Send several packets to the sink in a single write.
+
+        Args:
+            packets (list): Packets to send.
+        """
+        if not packets:
+            return
+        if self.socket is not None:
+            if self.network_running:
+                self.socket.send_many(packets)
+            else:
+                logger.warning("Couldn't send data, network is not running")
+
+    def next_reserved0(self) -> int:
+        """
+        Token for the reserved0 field of the next control packet. Tokens go
+        round robin over 1..253 (the ACK carries reserved0+1), so packets in
+        flight never share a token.
+        """
+        self.__reserved0 = self.__reserved0 % 253 + 1
+        return self.__reserved0
+
     def reliable_send(self, data, ack) -> bool:
         """
         Send data reliably to the serial interface.
-        Retry sending up to `rtx_limit` times if no ACK is received.
+        Retry sending up to `RTX_LIMIT` times if no ACK is received.
+        The retransmission timeout adapts to the measured RTTs.
         Return `True` if the ACK is received, `False` otherwise.
         """
         if not self.packet_dissector:
@@ -394,37 +536,136 @@ class Network:
             return False
 
         # Reliable socket data transmission
-        rtx_limit = 7
         ack_received = False
 
-        # Send packet and wait for ACK
-        for rtx in range(rtx_limit):
-            self.send(data)
-            time.sleep(self.timeout)
-            if self.packet_dissector.ack_pkt is not None:
-                if self.packet_dissector.ack_pkt.reserved0 == ack:
+        # Register the ACK before sending, it may come back right away
+        ack_event = self.packet_dissector.ack_expect(ack)
+        try:
+            # Send packet and wait for ACK
+            for rtx in range(RTX_LIMIT):
+                start = time.monotonic()
+                self.send(data)
+                if ack_event.wait(self.rtt_estimator.rto):
                     logger.debug("Correct ACK received")
+                    # Karn's algorithm: no RTT samples from retransmissions
+                    if rtx == 0:
+                        self.rtt_estimator.update(time.monotonic() - start)
                     ack_received = True
                     break
-                else:
-                    logger.debug("Incorrect ACK received")
-        else:
-            # We reached the maximum number of retries without receiving an ACK
-            logger.warning("Failed to send data reliably")
+                self.rtt_estimator.backoff()
+            else:
+                # We reached the maximum number of retries without receiving an ACK
+                logger.warning("Failed to send data reliably")
+        finally:
+            self.packet_dissector.ack_forget(ack)
 
         return ack_received
 
+    def reliable_send_window(self, packets, window=None) -> List[bool]:
+        """
+        Send several packets reliably, keeping up to `window` of them
+        unacknowledged at once. Packets whose ACK does not arrive within the
+        retransmission timeout are retransmitted individually, up to
+        `RTX_LIMIT` times.
+
+        Args:
+            packets (list): (data, ack) tuples.
+            window (int, optional): Max. number of packets in flight.
+                Defaults to `self.control_window`.
+
+        Returns:
+            list: Per-packet outcome, `True` if the ACK was received.
+        """
+        results = [False] * len(packets)
+        self.control_pkt_results = results
+        if not self.packet_dissector:
+            # Packet dissector not available
+            return results
+        if window is None:
+            window = self.control_window
+        window = max(1, min(window, 253))
+        if window == 1:
+            for idx, (data, ack) in enumerate(packets):
+                results[idx] = self.reliable_send(data, ack)
+            return results
+
+        pending = deque(range(len(packets)))
+        # idx -> [event, deadline, time of the first transmission, retries]
+        in_flight = {}
+        ack_any = self.packet_dissector.ack_any
+        try:
+            while pending or in_flight:
+                self.__window_fill(packets, pending, in_flight, window)
+                # Clear before checking, so we do not miss ACKs in between
+                ack_any.clear()
+                self.__window_check(packets, in_flight, results)
+                if in_flight and (not pending or len(in_flight) >= window):
+                    # Sleep until an ACK arrives or the nearest timeout expires
+                    next_deadline = min(v[1] for v in in_flight.values())
+                    ack_any.wait(max(0, next_deadline - time.monotonic()))
+        finally:
+            for idx in in_flight:
+                self.packet_dissector.ack_forget(packets[idx][1])
+
+        logger.debug(f"{sum(results)}/{len(results)} control packets acknowledged")
+        return results
+
+    def __window_fill(self, packets, pending, in_flight, window):
+        # Fill the window, all the new packets go in a single write
+        batch = []
+        now = time.monotonic()
+        while pending and len(in_flight) < window:
+            idx = pending.popleft()
+            data, ack = packets[idx]
+            event = self.packet_dissector.ack_expect(ack)
+            batch.append(data)
+            in_flight[idx] = [event, now + self.rtt_estimator.rto, now, 0]
+        self.send_many(batch)
+
+    def __window_check(self, packets, in_flight, results):
+        # Release the acknowledged packets and retransmit the expired ones
+        now = time.monotonic()
+        expired = []
+        for idx in list(in_flight):
+            event, deadline, first_tx, retries = in_flight[idx]
+            if event.is_set():
+                # Karn's algorithm: no RTT samples from retransmissions
+                if retries == 0:
+                    self.rtt_estimator.update(now - first_tx)
+                results[idx] = True
+                del in_flight[idx]
+                self.packet_dissector.ack_forget(packets[idx][1])
+            elif now >= deadline:
+                expired.append(idx)
+        if not expired:
+            return
+        # The timeouts of a round are a single loss event, back off once
+        # (RFC 6298, section 5.5)
+        self.rtt_estimator.backoff()
+        batch = []
+        for idx in expired:
+            event, _, first_tx, retries = in_flight[idx]
+            data, ack = packets[idx]
+            if retries + 1 < RTX_LIMIT:
+                logger.debug(f"Retransmitting control packet {idx}")
+                batch.append(data)
+                in_flight[idx] = [event, now + self.rtt_estimator.rto,
+                                  first_tx, retries + 1]
+            else:
+                logger.warning(
+                    f"Failed to send control packet {idx} reliably")
+                del in_flight[idx]
+                self.packet_dissector.ack_forget(ack)
+        self.send_many(batch)
+
     # --------------------------socket primitives-----------------------
 
     def read_socket(self):
         if self.socket is not None:
             while (1):
-                try:
-                    msg = self.socket.recv(0.1)
-                    if (len(msg) > 0):
-                        self.packet_dissector.handle_serial_packet(msg)
-                except TypeError:
-                    pass
+                msg = self.socket.recv(0.1)
+                if msg:
+                    self.packet_dissector.handle_serial_packet(msg)
                 if not self.network_running:
                     break
             logger.debug("Socket reading thread exited.")
@@ -437,6 +678,9 @@ class Network:
                     f'unsuccessful serial connection (host:{self.socket.host}, port: {self.socket.port})')
                 return False
             logger.info("Socket up and running")
+            # asyncio sinks feed the packet dissector on their own
+            if self.socket.attach(self.packet_dissector):
+                return True
             # Read serial
             self.read_socket_thread = threading.Thread(
                 target=self.read_socket)
@@ -471,10 +715,20 @@ class Network:
         self.pdr_callback = callback
     # --------------------------Controller primitives-----------------------
 
+    def control_snapshot_clear(self):
+        """
+        Forget what the network has acknowledged, the next route and
+        schedule pushes will be full ones.
+        """
+        self.routes_acked = None
+        self.tsch_acked = None
+        self.tsch_acked_sf = 0
+
     def stop(self):
         # Clear the running flag
         self.network_running = False
         self.nodes_clear()
+        self.control_snapshot_clear()
         # Stop the socket
         self.stop_socket()
 
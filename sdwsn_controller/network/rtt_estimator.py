@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import logging
+
+
+logger = logging.getLogger(f'main.{__name__}')
+
+# RFC 6298 constants
+RTT_ALPHA = 1/8
+RTT_BETA = 1/4
+RTT_K = 4
+# Clock granularity in seconds
+RTT_G = 0.01
+# Bounds of the retransmission timeout in seconds
+DEFAULT_MIN_RTO = 0.2
+DEFAULT_MAX_RTO = 5.0
+
+
+class RTTEstimator():
+    def __init__(
+        self,
+        initial_rto: float,
+        min_rto: float = DEFAULT_MIN_RTO,
+        max_rto: float = DEFAULT_MAX_RTO
+    ) -> None:
+        """
+        Retransmission timeout of the control packets, computed as in
+        RFC 6298 from the round trip times of the ACKs.
+
+        Args:
+            initial_rto (float): RTO in seconds until we get the first RTT.
+            min_rto (float, optional): Lower bound of the RTO. Defaults to
+                DEFAULT_MIN_RTO.
+            max_rto (float, optional): Upper bound of the RTO. Defaults to
+                DEFAULT_MAX_RTO.
+        """
+        self.initial_rto = initial_rto
+        self.min_rto = min(min_rto, initial_rto)
+        self.max_rto = max(max_rto, initial_rto)
+        self.reset()
+
+    def reset(self):
+        self.srtt = None
+        self.rttvar = None
+        self.rto = self.initial_rto
+
+    def __bound(self, rto):
+        return min(max(rto, self.min_rto), self.max_rto)
+
+    def update(self, rtt):
+        """
+        Add a new RTT sample. Following Karn's algorithm, samples must
+        only come from packets that have not been retransmitted.
+
+        Args:
+            rtt (float): Round trip time in seconds.
+        """
+        if self.srtt is None:
+            self.srtt = rtt
+            self.rttvar = rtt / 2
+        else:
+            self.rttvar = (1 - RTT_BETA) * self.rttvar + \
+                RTT_BETA * abs(self.srtt - rtt)
+            self.srtt = (1 - RTT_ALPHA) * self.srtt + RTT_ALPHA * rtt
+        self.rto = self.__bound(self.srtt + max(RTT_G, RTT_K * self.rttvar))
+        logger.debug(
+            f'RTT {rtt:.3f} s, SRTT {self.srtt:.3f} s, RTO {self.rto:.3f} s')
+
+    def backoff(self):
+        """
+        Double the RTO after a timeout.
+        """
+        self.rto = self.__bound(self.rto * 2)
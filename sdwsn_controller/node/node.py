@@ -16,24 +16,34 @@
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import logging
+import threading
+
+import networkx as nx
 
 from sdwsn_controller.neighbors.neighbor import NeighborTable, Neighbor
 from sdwsn_controller.performance_metrics.energy import EnergySamples
 from sdwsn_controller.performance_metrics.delay import DelaySamples
 from sdwsn_controller.performance_metrics.pdr import PDRSamples
 from sdwsn_controller.routing.route import RoutingTable
-from sdwsn_controller.tsch.schedule import TSCHScheduleTable
+from sdwsn_controller.tsch.schedule import TSCHOccupancy, TSCHScheduleTable
 
 logger = logging.getLogger(f'main.{__name__}')
 
 
 class Node():
+    __slots__ = ('id', 'sid', 'neighbors', 'tsch_schedules', 'routes', 'energy', 'delay', 'pdr',
+                 'rank', 'cycle_seq', 'tsch_pkt_sent', 'routing_pkt_sent', 'na_rcv')
+
     def __init__(
         self,
         id,
         sid: str | None,
         cycle_seq: int = 0,
         rank: int = 255,
+        tsch_occupancy: TSCHOccupancy | None = None,
+        link_graph: nx.DiGraph | None = None,
+        link_lock: 'threading.Lock | None' = None,
+        samples_window: int | None = None
     ) -> None:
         assert isinstance(id, int), "node ID must be a integer"
         assert id >= 0, "node ID must be positive"
@@ -42,12 +52,12 @@ class Node():
             self.sid = str(id) + ".0"
         else:
             self.sid = sid
-        self.neighbors = NeighborTable(self)
-        self.tsch_schedules = TSCHScheduleTable(self)
+        self.neighbors = NeighborTable(self, link_graph, link_lock)
+        self.tsch_schedules = TSCHScheduleTable(self, tsch_occupancy)
         self.routes = RoutingTable(self)
-        self.energy = EnergySamples(self)
-        self.delay = DelaySamples(self)
-        self.pdr = PDRSamples(self)
+        self.energy = EnergySamples(self, samples_window)
+        self.delay = DelaySamples(self, samples_window)
+        self.pdr = PDRSamples(self, samples_window)
         self.rank = rank
         self.cycle_seq = cycle_seq
         self.reset_stats()
@@ -27,6 +27,8 @@ SDN_NAPL_LEN = 6  # Size of neighbor advertisement payload size */
 # SDN_NCH_LEN = 6   # Size of network configuration routing and schedules packet header */
 SDN_RAH_LEN = 6  # Size of RA header routing packet*/
 SDN_SAH_LEN = 6  # Size of SA header schedule packet*/
+SDN_RA_ENTRY_LEN = 6  # Size of one route (src, dst, via) in the RA payload */
+SDN_SA_ENTRY_LEN = 8  # Size of one cell in the SA payload */
 SDN_DATA_LEN = 11  # Size of data packet */
 SDN_SERIAL_PACKETH_LEN = 8
 
@@ -42,20 +44,51 @@ sdn_protocols.SDN_PROTO_RA = 3        # Routes Advertisement
 sdn_protocols.SDN_PROTO_SA = 4        # Schedule Advertisement
 sdn_protocols.SDN_PROTO_DATA = 5      # Data packet
 
+# Precompiled header codecs
+_U16 = struct.Struct('!H')
+_SERIAL_HDR = struct.Struct('!HHBBBB')
+# Serial headers have always been parsed in the host byte order
+_SERIAL_HDR_RX = struct.Struct('HHBBBB')
+_SDN_IP_HDR = struct.Struct('!BBBBHHH')
+_RA_HDR = struct.Struct('!BBHH')
+_SA_HDR = struct.Struct('!BBHH')
+_NA_HDR = struct.Struct('!BBHHBBH')
+_RA_ENTRY = struct.Struct('!2s2s2s')
+_SA_ENTRY = struct.Struct('!bBBB2s2s')
+_DATA = struct.Struct('!HBBBBHHB')
+_NA_ENTRY = struct.Struct('!HhH')
+
 
 def chksum(sum, data, len):
-    total = sum
-    # Add up 16-bit words
-    num_words = len // 2
-    for chunk in struct.unpack("!%sH" % num_words, data[0:num_words * 2]):
-        total += chunk
-    # Add any left over byte
+    """
+    Internet checksum (RFC 1071) of the first `len` bytes of `data`, plus
+    the partial sum `sum`.
+
+    The whole buffer is read as one big-endian integer. As 2^16 = 1
+    (mod 0xffff), reducing it modulo 0xffff gives the ones' complement sum
+    of its 16-bit words without iterating over them.
+    """
+    total = int.from_bytes(memoryview(data)[:len], 'big')
     if len % 2:
-        total += data[-1] << 8
-    # Fold 32-bits into 16-bits
-    total = (total >> 16) + (total & 0xffff)
+        # Pad the left over byte
+        total <<= 8
+    total += sum
+    if total:
+        # Ones' complement sum, zero is only reached if all words are zero
+        total = (total - 1) % 0xffff + 1
+    return ~total & 0xffff
+
+
+def chksum_update(chksum, old_word, new_word):
+    """
+    Update a checksum after a 16-bit word of the data it covers has changed
+    from `old_word` to `new_word` (RFC 1624, eqn. 3), without summing the
+    whole buffer again.
+    """
+    total = (~chksum & 0xffff) + (~old_word & 0xffff) + new_word
+    total = (total & 0xffff) + (total >> 16)
     total += total >> 16
-    return ~total + 0x10000 & 0xffff
+    return ~total & 0xffff
 
 
 def sdn_ip_checksum(msg, len):
@@ -82,23 +115,32 @@ class addrConversion:
     # TODO: This methods' names are confusing.
     @classmethod
     def to_int(cls, addrStr):
-        # Packs addrStr into two byte addr
-        addrs = addrStr.split(".")
-        payload = []
-        for addr in addrs:
-            if payload:
-                pkt = struct.pack('!B'+str(len(payload)) +
-                                  's', int(addr), bytes(payload))
-            else:
-                pkt = struct.pack('!B', int(addr))
-            payload = pkt
+        # Packs addrStr into two byte addr, the last byte of the string goes
+        # first
+        pkt = bytes([int(addr) for addr in reversed(addrStr.split("."))])
         return cls(addr=pkt, addrStr=addrStr)
 
     @classmethod
     def to_string(cls, addr):
-        addr_packed = struct.pack("!H", addr)
-        addrStr = str(addr_packed[1])+"."+str(addr_packed[0])
-        return cls(addr=addr_packed, addrStr=addrStr)
+        return cls(addr=_U16.pack(addr), addrStr=_addr_str(addr))
+
+
+def _addr_str(addr):
+    # x.x format of a two byte address, the least significant byte goes first
+    return f"{addr & 0xff}.{addr >> 8}"
+
+
+def _pack_with_chksum(codec, fields, chksum_offset, payload, chksum_len):
+    """
+    Pack a header and its payload into a single buffer, then write the
+    checksum, computed over the first `chksum_len` bytes, in place at
+    `chksum_offset`.
+    """
+    buf = bytearray(codec.pack(*fields))
+    buf += payload
+    chksum = sdn_ip_checksum(buf, chksum_len)
+    _U16.pack_into(buf, chksum_offset, chksum)
+    return chksum, buf
 
 
 class SerialPacket:
@@ -113,31 +155,30 @@ class SerialPacket:
         self.payload = payload
 
     def pack(self):
-        #  Let's first compute the checksum
-        data = struct.pack('!HHBBBB' + str(len(self.payload)) + 's', self.addr, self.pkt_chksum, self.message_type,
-                           self.payload_len, self.reserved0, self.reserved1, bytes(self.payload))
-        self.pkt_chksum = sdn_ip_checksum(
-            data, self.payload_len+SDN_SERIAL_PACKETH_LEN)
-
-        return struct.pack('!HHBBBB' + str(len(self.payload)) + 's', self.addr, self.pkt_chksum, self.message_type,
-                           self.payload_len, self.reserved0, self.reserved1, bytes(self.payload))
+        self.pkt_chksum, packed = _pack_with_chksum(
+            _SERIAL_HDR, (self.addr, self.pkt_chksum, self.message_type, self.payload_len,
+                          self.reserved0, self.reserved1),
+            2, self.payload, self.payload_len+SDN_SERIAL_PACKETH_LEN)
+        return packed
 
     # optional: nice string representation of packet for printing purposes
     def __repr__(self):
         return "SerialPacket(addr={}, pkt_chksum={}, message_type={}, \
         payload_len={}, reserved0={}, reserved1={}, payload={})".format(
             hex(self.addr), self.pkt_chksum, self.message_type,
-            self.payload_len, self.reserved0, self.reserved1, self.payload)
+            self.payload_len, self.reserved0, self.reserved1, bytes(self.payload))
 
     @classmethod
     def unpack(cls, packed_data):
-        addr, pkt_chksum, message_type, payload_len, reserved0, reserved1, payload = struct.unpack(
-            'HHBBBB' + str(len(packed_data)-SDN_SERIAL_PACKETH_LEN) + 's', packed_data)
+        # The payload is a view on `packed_data`, it is not copied
+        addr, pkt_chksum, message_type, payload_len, reserved0, reserved1 = _SERIAL_HDR_RX.unpack_from(
+            packed_data)
+        payload = memoryview(packed_data)[SDN_SERIAL_PACKETH_LEN:]
         return cls(payload, addr=addr, pkt_chksum=pkt_chksum, message_type=message_type, payload_len=payload_len,
                    reserved0=reserved0, reserved1=reserved1)
 
     def toJSON(self):
-        return json.dumps(self, default=lambda o: o.__dict__ if type(o) is not bytes else str(o),
+        return json.dumps(self, default=lambda o: str(bytes(o)) if isinstance(o, (bytes, memoryview)) else o.__dict__,
                           sort_keys=True, indent=4)
 
 
@@ -160,29 +201,25 @@ class SDN_IP_Packet:
         self.payload = payload
 
     def pack(self):
-        #  Let's first compute the checksum
-        data = struct.pack('!BBBBHHH', self.vap, self.tlen,
-                           self.ttl, self.padding, self.hdr_chksum, self.scr, self.dest)
-        self.hdr_chksum = sdn_ip_checksum(data, SDN_IPH_LEN)
-
-        return struct.pack('!BBBBHHH' + str(len(self.payload)) + 's', self.vap, self.tlen,
-                           self.ttl, self.padding, self.hdr_chksum, self.scr, self.dest, bytes(self.payload))
+        self.hdr_chksum, packed = _pack_with_chksum(
+            _SDN_IP_HDR, (self.vap, self.tlen, self.ttl, self.padding, self.hdr_chksum,
+                          self.scr, self.dest),
+            4, self.payload, SDN_IPH_LEN)
+        return packed
 
     # optional: nice string representation of packet for printing purposes
     def __repr__(self):
         return "SDN_IP_Packet(vap={}, tlen={}, ttl={}, padding={}, hdr_chksum={}, scr={}, dest={}, payload={})".format(
             hex(self.vap), hex(self.tlen), hex(
                 self.ttl), hex(self.padding), hex(self.hdr_chksum),
-            hex(self.scr), hex(self.dest), self.payload)
+            hex(self.scr), hex(self.dest), bytes(self.payload))
 
     @classmethod
     def unpack(cls, packed_data):
-        vap, tlen, ttl, padding, hdr_chksum, scr, dest, payload = struct.unpack(
-            '!BBBBHHH' + str(len(packed_data)-SDN_IPH_LEN) + 's', packed_data)
-        scrStr = addrConversion.to_string(scr)
-        destStr = addrConversion.to_string(dest)
+        vap, tlen, ttl, padding, hdr_chksum, scr, dest = _SDN_IP_HDR.unpack_from(packed_data)
+        payload = memoryview(packed_data)[SDN_IPH_LEN:]
         return cls(payload, vap=vap, tlen=tlen, ttl=ttl, padding=padding, hdr_chksum=hdr_chksum,
-                   scr=scr, scrStr=scrStr.addrStr, dest=dest, destStr=destStr.addrStr)
+                   scr=scr, scrStr=_addr_str(scr), dest=dest, destStr=_addr_str(dest))
 
 
 class RA_Packet:
@@ -195,25 +232,22 @@ class RA_Packet:
         self.payload = payload
 
     def pack(self):
-        #  Let's first compute the checksum
-        data = struct.pack('!BBHH' + str(len(self.payload)) + 's', self.payload_len,
-                           self.padding, self.seq, self.pkt_chksum, bytes(self.payload))
-        self.pkt_chksum = sdn_ip_checksum(data, self.payload_len+SDN_RAH_LEN)
-
-        return struct.pack('!BBHH' + str(len(self.payload)) + 's', self.payload_len,
-                           self.padding, self.seq, self.pkt_chksum, bytes(self.payload))
+        self.pkt_chksum, packed = _pack_with_chksum(
+            _RA_HDR, (self.payload_len, self.padding, self.seq, self.pkt_chksum),
+            4, self.payload, self.payload_len+SDN_RAH_LEN)
+        return packed
 
     # optional: nice string representation of packet for printing purposes
 
     def __repr__(self):
         return "RA_Packet(payload_len={}, seq={}, pkt_chksum={}, payload={})".format(
-            hex(self.payload_len), self.seq, hex(self.pkt_chksum), self.payload)
+            hex(self.payload_len), self.seq, hex(self.pkt_chksum), bytes(self.payload))
 
     @classmethod
     def unpack(cls, packed_data, length):
-        payload_len, seq, pkt_chksum, payload = struct.unpack(
-            '!BBHH' + str(length-SDN_RAH_LEN) + 's', packed_data)
-        return cls(payload, payload_len=payload_len, seq=seq, pkt_chksum=pkt_chksum)
+        payload_len, padding, seq, pkt_chksum = _RA_HDR.unpack_from(packed_data)
+        payload = memoryview(packed_data)[SDN_RAH_LEN:length]
+        return cls(payload, payload_len=payload_len, padding=padding, seq=seq, pkt_chksum=pkt_chksum)
 
 
 class RA_Packet_Payload:
@@ -228,11 +262,9 @@ class RA_Packet_Payload:
         self.payload = payload
 
     def pack(self):
+        packed = _RA_ENTRY.pack(self.src, self.dst, self.via)
         if self.payload:
-            packed = struct.pack('>2s2s2s'+str(len(self.payload)) +
-                                 's', self.src, self.dst, self.via, bytes(self.payload))
-        else:
-            packed = struct.pack('!2s2s2s', self.src, self.dst, self.via)
+            packed += bytes(self.payload)
         return packed
 
 
@@ -246,17 +278,14 @@ class Cell_Packet:
         self.payload = payload
 
     def pack(self):
-        #  Let's first compute the checksum
-        data = struct.pack('!BBHH' + str(len(self.payload)) + 's', self.payload_len,
-                           self.sf_len, self.seq, self.pkt_chksum, bytes(self.payload))
-        self.pkt_chksum = sdn_ip_checksum(data, self.payload_len+SDN_SAH_LEN)
-
-        return struct.pack('!BBHH' + str(len(self.payload)) + 's', self.payload_len,
-                           self.sf_len, self.seq, self.pkt_chksum, bytes(self.payload))
+        self.pkt_chksum, packed = _pack_with_chksum(
+            _SA_HDR, (self.payload_len, self.sf_len, self.seq, self.pkt_chksum),
+            4, self.payload, self.payload_len+SDN_SAH_LEN)
+        return packed
 
     def __repr__(self):
         return "SA_Packet(payload_len={}, slotframe size={}, seq={}, pkt_chksum={}, payload={})".format(
-            hex(self.payload_len), self.sf_len, self.seq, hex(self.pkt_chksum), self.payload)
+            hex(self.payload_len), self.sf_len, self.seq, hex(self.pkt_chksum), bytes(self.payload))
 
 
 class Cell_Packet_Payload:
@@ -276,13 +305,10 @@ class Cell_Packet_Payload:
         self.payload = payload
 
     def pack(self):
+        packed = _SA_ENTRY.pack(self.type, self.channel, self.timeslot,
+                                self.padding, self.scr, self.dst)
         if self.payload:
-            packed = struct.pack('>bBBB2s2s'+str(len(self.payload)) +
-                                 's', self.type, self.channel, self.timeslot,
-                                 self.padding, self.scr, self.dst, bytes(self.payload))
-        else:
-            packed = struct.pack('!bBBB2s2s', self.type, self.channel,
-                                 self.timeslot, self.padding, self.scr, self.dst)
+            packed += bytes(self.payload)
         return packed
 
 
@@ -307,8 +333,8 @@ class Data_Packet:
 
     @classmethod
     def unpack(cls, packed_data):
-        cycle_seq, seq, temp, humidity, light, asn_ls4b_lsb, asn_ls4b_msb, asn_ms1b = struct.unpack(
-            '!HBBBBHHB', packed_data)
+        cycle_seq, seq, temp, humidity, light, asn_ls4b_lsb, asn_ls4b_msb, asn_ms1b = _DATA.unpack_from(
+            packed_data)
         return cls(cycle_seq=cycle_seq, seq=seq, temp=temp, humidity=humidity,
                    light=light, asn_ls4b_lsb=asn_ls4b_lsb, asn_ls4b_msb=asn_ls4b_msb, asn_ms1b=asn_ms1b)
 
@@ -329,12 +355,12 @@ class NA_Packet:
     def __repr__(self):
         return "NA_Packet(payload_len={}, rank={}, energy={}, cycle_seq={}, seq={}, pkt_chksum={}, payload={})".format(
             hex(self.payload_len), hex(self.rank), hex(self.energy),
-            hex(self.cycle_seq), hex(self.seq), hex(self.pkt_chksum), self.payload)
+            hex(self.cycle_seq), hex(self.seq), hex(self.pkt_chksum), bytes(self.payload))
 
     @classmethod
     def unpack(cls, packed_data, length):
-        payload_len, rank, energy, cycle_seq, seq, _, pkt_chksum, payload = struct.unpack(
-            '!BBHHBBH' + str(length-SDN_NAH_LEN) + 's', packed_data)
+        payload_len, rank, energy, cycle_seq, seq, _, pkt_chksum = _NA_HDR.unpack_from(packed_data)
+        payload = memoryview(packed_data)[SDN_NAH_LEN:length]
         return cls(payload, payload_len=payload_len, rank=rank, energy=energy,
                    cycle_seq=cycle_seq, seq=seq, pkt_chksum=pkt_chksum)
 
@@ -354,8 +380,6 @@ class NA_Packet_Payload:
             self.addrStr, self.rssi, self.etx)
 
     @classmethod
-    def unpack(cls, packed_data):
-        addr, rssi, etx = struct.unpack(
-            '!HhH', packed_data)
-        addrStr = addrConversion.to_string(addr).addrStr
-        return cls(addr=addr, addrStr=addrStr, rssi=rssi, etx=etx)
+    def unpack(cls, packed_data, offset=0):
+        addr, rssi, etx = _NA_ENTRY.unpack_from(packed_data, offset)
+        return cls(addr=addr, addrStr=_addr_str(addr), rssi=rssi, etx=etx)
@@ -21,9 +21,9 @@ import logging
 from sdwsn_controller.packet.packet import Data_Packet, NA_Packet, NA_Packet_Payload, SDN_NAPL_LEN
 from sdwsn_controller.packet.packet import SerialPacket, SDN_IP_Packet
 from sdwsn_controller.packet.packet import serial_protocol, sdn_protocols
-from sdwsn_controller.packet.packet import SDN_IPH_LEN
+from sdwsn_controller.packet.packet import SDN_IPH_LEN, sdn_ip_checksum
 
-import struct
+import threading
 
 
 logger = logging.getLogger(f'main.{__name__}')
@@ -36,6 +36,11 @@ class PacketDissector():
             config
     ):
         self.ack_pkt = None
+        # Events of the ACKs we are waiting for, indexed by reserved0
+        self.ack_events = {}
+        self.ack_lock = threading.Lock()
+        # Set whenever any of the expected ACKs arrives
+        self.ack_any = threading.Event()
         self.cycle_sequence = 0
         self.sequence = 0
         self.network = network
@@ -52,6 +57,13 @@ class PacketDissector():
         # Check if this is a serial ACK packet
         if serial_pkt.message_type == serial_protocol.ACK:
             self.ack_pkt = serial_pkt
+            with self.ack_lock:
+                event = self.ack_events.get(serial_pkt.reserved0)
+            if event is not None:
+                event.set()
+                self.ack_any.set()
+            else:
+                logger.debug(f"Unexpected ACK {serial_pkt.reserved0}")
             return
         # Let's now process the sdn IP packet
         pkt = self.process_sdn_ip_packet(serial_pkt.payload)
@@ -79,13 +91,8 @@ class PacketDissector():
                 node.energy_add(na_pkt.seq, na_pkt.energy)
                 # Process neighbors
                 blocks = len(na_pkt.payload) // SDN_NAPL_LEN
-                idx_start = 0
-                idx_end = 0
-                for _ in range(1, blocks+1):
-                    idx_end += SDN_NAPL_LEN
-                    payload = na_pkt.payload[idx_start:idx_end]
-                    idx_start = idx_end
-                    payload_unpacked = NA_Packet_Payload.unpack(payload)
+                for offset in range(0, blocks * SDN_NAPL_LEN, SDN_NAPL_LEN):
+                    payload_unpacked = NA_Packet_Payload.unpack(na_pkt.payload, offset)
                     node.neighbor_add(payload_unpacked.addr, payload_unpacked.rssi,
                                       payload_unpacked.etx)
                 return
@@ -114,6 +121,41 @@ class PacketDissector():
                 logger.warning("sdn IP packet type not found")
                 return
 
+    def ack_expect(self, ack):
+        """
+        Register an ACK we are waiting for.
+
+        Args:
+            ack (int): reserved0 field of the expected ACK.
+
+        Returns:
+            threading.Event: Event set when the ACK arrives.
+        """
+        with self.ack_lock:
+            event = self.ack_events.get(ack)
+            if event is None:
+                event = threading.Event()
+                self.ack_events[ack] = event
+            return event
+
+    def ack_forget(self, ack):
+        with self.ack_lock:
+            self.ack_events.pop(ack, None)
+
+    async def consume(self, queue):
+        """
+        Process the frames that an asyncio sink puts in the queue.
+
+        Args:
+            queue (asyncio.Queue): Frames received from the sink.
+        """
+        while True:
+            data = await queue.get()
+            try:
+                self.handle_serial_packet(data)
+            except Exception:
+                logger.exception("failed to process serial packet")
+
     def process_serial_packet(self, data):
         # Parse sdn IP packet
         logger.debug("processing serial packet")
@@ -143,7 +185,7 @@ class PacketDissector():
 
     def process_sdn_ip_packet(self, data):
         # We first check the integrity of the HEADER of the sdn IP packet
-        if (self.sdn_ip_checksum(data, SDN_IPH_LEN) != 0xffff):
+        if (sdn_ip_checksum(data, SDN_IPH_LEN) != 0xffff):
             logger.warning("bad IP checksum")
             return
         # Parse sdn IP packet
@@ -162,33 +204,10 @@ class PacketDissector():
         logger.debug("succeed unpacking sdn IP packet")
         return pkt
 
-    def chksum(self, sum, data, len):
-        total = sum
-        # Add up 16-bit words
-        num_words = len // 2
-        for chunk in struct.unpack("!%sH" % num_words, data[0:num_words * 2]):
-            total += chunk
-        # Add any left over byte
-        if len % 2:
-            total += data[-1] << 8
-        # Fold 32-bits into 16-bits
-        total = (total >> 16) + (total & 0xffff)
-        total += total >> 16
-        return ~total + 0x10000 & 0xffff
-
-    def sdn_ip_checksum(self, msg, len):
-        sum = self.chksum(0, msg, len)
-        result = 0
-        if (sum == 0):
-            result = 0xffff
-        else:
-            result = struct.pack(">i", sum)
-        return result
-
     def process_na_packet(self, pkt):
         length = pkt.tlen-SDN_IPH_LEN
         # We first check the integrity of the entire SDN NA packet
-        if (self.sdn_ip_checksum(pkt.payload, length) != 0xffff):
+        if (sdn_ip_checksum(pkt.payload, length) != 0xffff):
             logger.warning("bad NA checksum")
             return
         # Parse sdn NA packet
@@ -20,12 +20,15 @@ import logging
 from rich.table import Table
 
 from sdwsn_controller.common import common
+from sdwsn_controller.performance_metrics.running_stats import RunningStats
 
 
 logger = logging.getLogger(f'main.{__name__}')
 
 
 class Delay():
+    __slots__ = ('seq', 'delay')
+
     def __init__(
         self,
         # cycle_seq,
@@ -33,24 +36,35 @@ class Delay():
         delay
     ) -> None:
         # assert isinstance(cycle_seq, int)
-        assert isinstance(seq, int)
-        assert isinstance(delay, int)
         # self.cycle_seq = cycle_seq
         self.seq = seq
         self.delay = delay
 
 
 class DelaySamples():
+    __slots__ = ('node', 'callback', 'max_samples', 'samples', 'seen', 'stats')
+
     def __init__(
         self,
-        node
+        node,
+        max_samples: int | None = None
     ) -> None:
+        """
+        Delay samples of a node. Aggregates cover every sample added since
+        the last clear, while only the last `max_samples` samples are kept
+        (all of them if None).
+        """
         self.node = node
         self.callback = None
+        self.max_samples = max_samples
+        self.stats = RunningStats()
         self.clear()
 
     def clear(self):
         self.samples = {}
+        # Sequence numbers added since the last clear, evicted ones included
+        self.seen = set()
+        self.stats.clear()
 
     def size(self):
         return len(self.samples)
@@ -62,25 +76,26 @@ class DelaySamples():
         return self.samples.get(seq)
 
     def get_average(self):
-        last_samples = []
-        for sample in self.samples.values():
-            # if sample.cycle_seq == cycle_seq:
-            last_samples.append(sample.delay)
-        return sum(last_samples) / len(last_samples)
+        return self.stats.average()
 
     def add_sample(self, seq, delay) -> Delay:
-        if self.get_sample(seq):
+        if seq in self.seen:
             return
+        self.seen.add(seq)
         logger.debug(
             f'Node {self.node.id}: add delay {delay}, seq {seq}')
         delay_sample = Delay(seq=seq, delay=delay)
         self.samples.update({seq: delay_sample})
+        common.samples_evict(self.samples, self.max_samples)
+        self.stats.add(delay)
         # Fire callback
         if self.callback:
             self.callback(id=self.node.id, seq=seq, delay=delay)
         return delay_sample
 
     def print(self):
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         table = Table(
             title=f"Delay samples (Cycle seq: {self.node.cycle_seq})")
 
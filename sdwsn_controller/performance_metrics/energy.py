@@ -20,12 +20,15 @@ import logging
 from rich.table import Table
 
 from sdwsn_controller.common import common
+from sdwsn_controller.performance_metrics.running_stats import RunningStats
 
 
 logger = logging.getLogger(f'main.{__name__}')
 
 
 class Energy():
+    __slots__ = ('seq', 'energy')
+
     def __init__(
         self,
         # cycle_seq,
@@ -33,25 +36,38 @@ class Energy():
         energy
     ) -> None:
         # assert isinstance(cycle_seq, int)
-        assert isinstance(seq, int)
-        assert isinstance(energy, int)
         # self.cycle_seq = cycle_seq
         self.seq = seq
         self.energy = energy
 
 
 class EnergySamples():
+    __slots__ = ('node', 'callback', 'max_samples', 'samples', 'seen', 'last_seq', 'last', 'stats')
+
     def __init__(
         self,
-        node
+        node,
+        max_samples: int | None = None
     ) -> None:
+        """
+        Energy samples of a node. Aggregates cover every sample added since
+        the last clear, while only the last `max_samples` samples are kept
+        (all of them if None). The sample with the highest sequence number
+        is always kept, even if it has been evicted.
+        """
         self.node = node
         self.callback = None
+        self.max_samples = max_samples
+        self.stats = RunningStats()
         self.clear()
 
     def clear(self):
         self.samples = {}
+        # Sequence numbers added since the last clear, evicted ones included
+        self.seen = set()
         self.last_seq = 0
+        self.last = None
+        self.stats.clear()
 
     def size(self):
         return len(self.samples)
@@ -63,23 +79,29 @@ class EnergySamples():
         return self.samples.get(seq)
 
     def get_sample_last(self):
-        return self.get_sample(self.last_seq).energy
+        return self.last.energy
 
     def add_sample(self, seq, energy) -> Energy:
-        if self.get_sample(seq):
+        if seq in self.seen:
             return
+        self.seen.add(seq)
         logger.debug(
             f'Node {self.node.id}: add energy {energy}, seq {seq}')
         energy_sample = Energy(seq=seq, energy=energy)
         self.samples.update({seq: energy_sample})
-        if seq > self.last_seq:
+        common.samples_evict(self.samples, self.max_samples)
+        self.stats.add(energy)
+        if self.last is None or seq > self.last_seq:
             self.last_seq = seq
+            self.last = energy_sample
         # Fire callback
         if self.callback:
             self.callback(id=self.node.id, seq=seq, energy=energy)
         return energy_sample
 
     def print(self):
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         table = Table(
             title=f"Energy samples (Cycle seq: {self.node.cycle_seq})")
 
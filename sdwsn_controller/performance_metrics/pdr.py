@@ -26,28 +26,61 @@ logger = logging.getLogger(f'main.{__name__}')
 
 
 class PDR():
+    __slots__ = ('seq',)
+
     def __init__(
         self,
         # cycle_seq,
         seq
     ) -> None:
         # assert isinstance(cycle_seq, int)
-        assert isinstance(seq, int)
         # self.cycle_seq = cycle_seq
         self.seq = seq
 
 
+# Data packets carry an 8-bit sequence number
+SEQ_MOD = 256
+# Sequence numbers more than half the space ahead of the highest one are
+# taken as late packets
+SEQ_HALF = SEQ_MOD // 2
+_WINDOW_MASK = (1 << SEQ_MOD) - 1
+
+
 class PDRSamples():
+    __slots__ = ('node', 'callback', 'max_samples', 'samples', 'received', 'first', 'highest',
+                 'window')
+
     def __init__(
         self,
-        node
+        node,
+        max_samples: int | None = None
     ) -> None:
+        """
+        PDR samples of a node. The PDR is the number of distinct packets
+        received over the number of packets sent since the first one we
+        received, which we know from the gaps in the sequence numbers. The
+        8-bit sequence numbers are unwrapped with modulo-256 arithmetic and
+        a bitmap of the last 256 of them tells duplicates apart, so every
+        update is O(1) and the loss count is exact as long as fewer than
+        128 consecutive packets are lost.
+
+        Only the last `max_samples` samples are kept (all of them if None),
+        but the PDR covers every sample added since the last clear.
+        """
         self.node = node
         self.callback = None
+        self.max_samples = max_samples
         self.clear()
 
     def clear(self):
         self.samples = {}
+        # Distinct packets received since the last clear
+        self.received = 0
+        # First and highest unwrapped sequence numbers
+        self.first = None
+        self.highest = None
+        # Bit i set if we received sequence number `highest - i`
+        self.window = 0
 
     def size(self):
         return len(self.samples)
@@ -58,30 +91,64 @@ class PDRSamples():
     def get_sample(self, seq):
         return self.samples.get(seq)
 
+    def get_expected(self) -> int:
+        """ Packets sent since the first one we received. """
+        if self.first is None:
+            return 0
+        return self.highest - self.first + 1
+
+    def get_lost(self) -> int:
+        return self.get_expected() - self.received
+
     def get_average(self):
-        seqList = list(self.samples.values())
         # Get the averaged pdr for this period
-        if seqList:
-            avg_pdr = seqList[-1].seq/len(seqList)
-        else:
-            avg_pdr = 0
-        if avg_pdr > 1.0:
-            avg_pdr = 1.0
-        return avg_pdr
+        if not self.received:
+            return 0
+        return self.received / self.get_expected()
+
+    def __receive(self, seq) -> bool:
+        """
+        Mark `seq` as received.
+
+        Returns:
+            bool: False if it is a duplicate.
+        """
+        if self.highest is None:
+            self.first = self.highest = seq
+            self.window = 1
+            return True
+        ahead = (seq - self.highest) % SEQ_MOD
+        if ahead and ahead < SEQ_HALF:
+            self.highest += ahead
+            self.window = ((self.window << ahead) | 1) & _WINDOW_MASK
+            return True
+        # Late packet (or duplicate)
+        behind = (SEQ_MOD - ahead) % SEQ_MOD
+        if self.window >> behind & 1:
+            return False
+        self.window |= 1 << behind
+        self.first = min(self.first, self.highest - behind)
+        return True
 
     def add_sample(self, seq) -> PDR:
-        if self.get_sample(seq):
+        if not self.__receive(seq):
             return
         logger.debug(
             f'Node {self.node.id}: add pdr with seq {seq}')
         pdr_sample = PDR(seq=seq)
+        # Sequence numbers wrap around, the new sample is the newest one
+        self.samples.pop(seq, None)
         self.samples.update({seq: pdr_sample})
+        common.samples_evict(self.samples, self.max_samples)
+        self.received += 1
         # Fire callback
         if self.callback:
             self.callback(id=self.node.id, seq=seq, pdr=self.get_average())
         return pdr_sample
 
     def print(self):
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         table = Table(title=f"PDR samples (Cycle seq: {self.node.cycle_seq})")
 
         table.add_column("Node", justify="center",
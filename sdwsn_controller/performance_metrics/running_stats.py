@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import math
+
+
+class RunningStats():
+    __slots__ = ('count', 'total', 'mean', 'm2', 'min', 'max')
+
+    def __init__(self) -> None:
+        """
+        Count, sum, mean, min, max and variance of a stream of values,
+        updated in O(1) as the values arrive (Welford's algorithm), so
+        that they do not need the values themselves.
+        """
+        self.clear()
+
+    def clear(self):
+        self.count = 0
+        self.total = 0
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.min = None
+        self.max = None
+
+    def add(self, value):
+        self.count += 1
+        self.total += value
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (value - self.mean)
+        if self.min is None or value < self.min:
+            self.min = value
+        if self.max is None or value > self.max:
+            self.max = value
+
+    def average(self) -> float:
+        """ Sum of the values over their count, 0 without values. """
+        if not self.count:
+            return 0
+        return self.total / self.count
+
+    def variance(self) -> float:
+        """ Population variance, 0 with less than two values. """
+        if self.count < 2:
+            return 0.0
+        return self.m2 / self.count
+
+    def std(self) -> float:
+        return math.sqrt(self.variance())
@@ -24,11 +24,7 @@ import random
 from random import randrange
 
 from sdwsn_controller.common import common
-
-# These are the size of other schedules in orchestra
-eb_size = 397
-common_size = 31
-control_plane_size = 27
+from sdwsn_controller.tsch.slotframe_sizes import SlotframeSizes
 
 
 class Env(gym.Env):
@@ -40,6 +36,7 @@ class Env(gym.Env):
             # simulation_name: str,
             controller: object,
             max_slotframe_size: None,
+            orchestra_sizes=common.ORCHESTRA_SLOTFRAME_SIZES,
             # folder: str = './figures/'
     ):
         super(Env, self).__init__()
@@ -49,6 +46,9 @@ class Env(gym.Env):
 
         assert isinstance(max_slotframe_size, int)
         self.max_slotframe_size = max_slotframe_size
+        # Valid slotframe sizes, coprime with the other Orchestra slotframes
+        self.slotframe_sizes = SlotframeSizes(
+            max_slotframe_size, orchestra_sizes)
         # self.folder = folder
         # self.simulation_name = simulation_name
         # We define the number of actions
@@ -59,6 +59,8 @@ class Env(gym.Env):
         self.n_observations = 8
         self.observation_space = spaces.Box(low=-1, high=1,
                                             shape=(self.n_observations, ), dtype=np.float32)
+        # Observation buffer, filled in place at every step
+        self.__observation = np.zeros(self.n_observations, dtype=np.float32)
 
     """ Step action """
 
@@ -67,22 +69,23 @@ class Env(gym.Env):
         state = self.controller.get_state()
         if action == 0:
             # print("increasing slotframe size")
-            sf_len = common.next_coprime(state['current_sf_len'])
+            sf_len = self.slotframe_sizes.next(state['current_sf_len'])
         if action == 1:
             # print("decreasing slotframe size")
-            sf_len = common.previous_coprime(state['current_sf_len'])
+            sf_len = self.slotframe_sizes.previous(state['current_sf_len'])
         if action == 2:
             # print("same slotframe size")
             sf_len = state['current_sf_len']
         # Set the SF size
         self.controller.current_slotframe_size = sf_len
+        state['current_sf_len'] = sf_len
         # Send the entire TSCH schedule
         self.controller.send_tsch_schedules()
         # We now wait until we reach the processing_window
         while (not self.controller.wait()):
             print("resending schedules")
             self.controller.send_tsch_schedules()
-        observation, info = self._get_obs()
+        observation, info = self._get_obs(state)
         done = False
         reward = info['reward']
         # self.max_slotframe_size is the maximum slotframe size
@@ -95,30 +98,30 @@ class Env(gym.Env):
 
         return observation, reward, done, False, info
 
-    def _get_obs(self):
-        state = self.controller.get_state()
+    def _get_obs(self, state=None, observation=None):
+        """
+        Fill the observation buffer in place. The returned array is
+        overwritten by the next step, copy it to keep it.
+
+        Args:
+            state (dict, optional): State of the controller, as returned by
+                `get_state`. Defaults to None, to get it from the controller.
+            observation (numpy.ndarray, optional): Array to fill instead of
+                the observation buffer. Defaults to None.
+        """
+        if state is None:
+            state = self.controller.get_state()
         metrics = self.controller.calculate_reward(
             self.controller.alpha, self.controller.beta, self.controller.delta,
             state['current_sf_len'])
-        # Append to the observations
-        user_requirements = np.array(
-            state['user_requirements'], dtype=np.float32)
-        power_normalized = np.array(
-            metrics['power_normalized'], dtype=np.float32)
-        observation = np.append(user_requirements, power_normalized)
-        delay_normalized = np.array(
-            metrics['delay_normalized'], dtype=np.float32)
-        observation = np.append(observation, delay_normalized)
-        pdr_mean = np.array(metrics['pdr_mean'], dtype=np.float32)
-        observation = np.append(observation, pdr_mean)
-        last_ts_in_schedule = np.array(
-            state['last_ts_in_schedule']/self.max_slotframe_size, dtype=np.float32)
-        observation = np.append(
-            observation, last_ts_in_schedule)
-        slotframe_size = np.array(
-            state['current_sf_len']/self.max_slotframe_size, dtype=np.float32)
-        observation = np.append(
-            observation, slotframe_size)
+        if observation is None:
+            observation = self.__observation
+        observation[:3] = state['user_requirements']
+        observation[3] = metrics['power_normalized']
+        observation[4] = metrics['delay_normalized']
+        observation[5] = metrics['pdr_mean']
+        observation[6] = state['last_ts_in_schedule']/self.max_slotframe_size
+        observation[7] = state['current_sf_len']/self.max_slotframe_size
         return observation, metrics
 
     """ Reset the environment, reset the routing and the TSCH schedules """
@@ -136,8 +139,11 @@ class Env(gym.Env):
         path = self.controller.compute_routes(G)
         # Set the initial SF size, this has to be greater that the # sensors
         slotframe_size = 15
-        # We now set the TSCH schedules for the current routing
-        self.controller.compute_tsch_schedule(path, slotframe_size)
+        # We now set the TSCH schedules for the current routing, in a larger
+        # slotframe if the links do not fit
+        while (not self.controller.compute_tsch_schedule(path, slotframe_size) and
+               slotframe_size < self.max_slotframe_size):
+            slotframe_size = self.slotframe_sizes.next(slotframe_size)
         # We now set and save the user requirements
         balanced = (0.4, 0.3, 0.3)
         energy = (0.8, 0.1, 0.1)
@@ -163,7 +169,10 @@ class Env(gym.Env):
         # slotframe_size = last_ts_in_schedule
         self.controller.current_slotframe_size = slotframe_size
         # We now save the user requirements
-        observation, info = self._get_obs()
+        # Wrappers keep the terminal observation of the last step when they
+        # reset, do not overwrite it.
+        observation, info = self._get_obs(
+            observation=np.empty(self.n_observations, dtype=np.float32))
         return observation, info  # reward, done, info can't be included
 
     def render(self, mode='console'):
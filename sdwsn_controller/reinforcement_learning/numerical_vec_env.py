@@ -0,0 +1,199 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+""" Vectorized version of the SDWSN environment for the numerical controller """
+from gymnasium import spaces
+import numpy as np
+from stable_baselines3.common.vec_env import VecEnv
+
+from sdwsn_controller.common import common
+from sdwsn_controller.tsch.slotframe_sizes import SlotframeSizes
+
+
+class NumericalVecEnv(VecEnv):
+    """
+    K independent copies of the numerical SDWSN environment, stepped at
+    once on NumPy arrays.
+
+    It follows the dynamics of `Env` with the numerical controller: the
+    actions increase, decrease or keep the slotframe size, moving to the
+    next or previous coprime size, and the observations are the user
+    requirements, normalized power, delay and PDR, last active timeslot
+    and slotframe size. An episode ends when the slotframe size goes below
+    the last active timeslot or above the maximum slotframe size (reward
+    -4), or it is truncated after `max_episode_steps` steps. As any
+    stable-baselines3 `VecEnv`, finished environments are reset
+    automatically and their last observation goes into the
+    "terminal_observation" info.
+
+    All the environments share a single random generator. `seed` and
+    `set_options` are implemented here, as the `VecEnv` of the pinned
+    stable-baselines3 release does not keep them.
+    """
+
+    # Same user requirements as Env: balanced, energy, delay, reliability
+    USER_REQUIREMENTS = np.array([
+        (0.4, 0.3, 0.3),
+        (0.8, 0.1, 0.1),
+        (0.1, 0.8, 0.1),
+        (0.1, 0.1, 0.8)
+    ], dtype=np.float32)
+
+    def __init__(
+            self,
+            reward_processor,
+            num_envs: int,
+            max_slotframe_size: int,
+            orchestra_sizes=common.ORCHESTRA_SLOTFRAME_SIZES,
+            max_episode_steps: int | None = None,
+            seed: int | None = None
+    ):
+        """
+        Args:
+            reward_processor (NumericalRewardProcessing): Reward processor,
+                evaluated on the arrays of slotframe sizes.
+            num_envs (int): Number of environments.
+            max_slotframe_size (int): Maximum slotframe size.
+            orchestra_sizes (iterable, optional): Sizes of the other
+                Orchestra slotframes. Defaults to
+                common.ORCHESTRA_SLOTFRAME_SIZES.
+            max_episode_steps (int, optional): Steps after which episodes
+                are truncated, None for no limit. Defaults to None.
+            seed (int, optional): Seed of the random generator. Defaults
+                to None.
+        """
+        self.reward_processor = reward_processor
+        self.max_slotframe_size = max_slotframe_size
+        self.max_episode_steps = max_episode_steps
+        self.render_mode = None
+        self.rng = np.random.default_rng(seed)
+        # Seed and options for the next reset
+        self.__seed = None
+        self.__options = [{} for _ in range(num_envs)]
+        # Next and previous coprime slotframe sizes of every size we can be
+        # at before a step
+        self.slotframe_sizes = SlotframeSizes(
+            max_slotframe_size, orchestra_sizes)
+        # State of every environment
+        self.user_requirements = np.zeros((num_envs, 3), dtype=np.float32)
+        self.last_ts = np.zeros(num_envs, dtype=np.int64)
+        self.sf_len = np.zeros(num_envs, dtype=np.int64)
+        self.steps = np.zeros(num_envs, dtype=np.int64)
+        self.metrics = {}
+        self.actions = None
+        observation_space = spaces.Box(low=-1, high=1, shape=(8, ), dtype=np.float32)
+        super().__init__(num_envs, observation_space, spaces.Discrete(3))
+
+    def _reset_envs(self, indices):
+        count = len(indices)
+        choice = self.rng.integers(len(self.USER_REQUIREMENTS), size=count)
+        self.user_requirements[indices] = self.USER_REQUIREMENTS[choice]
+        last_ts = self.rng.integers(9 + 1, 20, size=count)
+        self.last_ts[indices] = last_ts
+        self.sf_len[indices] = self.rng.integers(last_ts + 5, self.max_slotframe_size - 5, endpoint=True)
+        self.steps[indices] = 0
+
+    def _get_obs(self):
+        metrics = self.reward_processor.calculate_reward(
+            self.user_requirements[:, 0], self.user_requirements[:, 1],
+            self.user_requirements[:, 2], self.sf_len)
+        self.metrics = metrics
+        obs = np.empty((self.num_envs, 8), dtype=np.float32)
+        obs[:, :3] = self.user_requirements
+        obs[:, 3] = metrics['power_normalized']
+        obs[:, 4] = metrics['delay_normalized']
+        obs[:, 5] = metrics['pdr_mean']
+        obs[:, 6] = self.last_ts / self.max_slotframe_size
+        obs[:, 7] = self.sf_len / self.max_slotframe_size
+        return obs, metrics['reward']
+
+    def seed(self, seed=None):
+        # Seeds the shared generator on the next reset
+        self.__seed = seed
+        if seed is None:
+            return [None] * self.num_envs
+        return [seed + idx for idx in range(self.num_envs)]
+
+    def set_options(self, options=None):
+        # The environment takes no options, they are dropped on reset
+        if not isinstance(options, list):
+            options = [options or {}] * self.num_envs
+        self.__options = options
+
+    def reset(self):
+        if self.__seed is not None:
+            self.rng = np.random.default_rng(self.__seed)
+            self.__seed = None
+        self.__options = [{} for _ in range(self.num_envs)]
+        self._reset_envs(np.arange(self.num_envs))
+        obs, _ = self._get_obs()
+        return obs
+
+    def step_async(self, actions):
+        self.actions = np.asarray(actions).reshape(self.num_envs)
+
+    def step_wait(self):
+        actions = self.actions
+        sf_len = self.sf_len
+        self.sf_len = np.where(actions == 0, self.slotframe_sizes.next(sf_len),
+                               np.where(actions == 1, self.slotframe_sizes.previous(sf_len), sf_len))
+        obs, reward = self._get_obs()
+        reward = np.asarray(reward, dtype=np.float32).copy()
+        terminated = (self.sf_len < self.last_ts) | (self.sf_len > self.max_slotframe_size)
+        reward[terminated] = -4
+        self.steps += 1
+        truncated = np.zeros(self.num_envs, dtype=bool)
+        if self.max_episode_steps is not None:
+            truncated = ~terminated & (self.steps >= self.max_episode_steps)
+        dones = terminated | truncated
+        infos = [{} for _ in range(self.num_envs)]
+        done_indices = np.flatnonzero(dones)
+        if len(done_indices):
+            for i in done_indices:
+                infos[i]["terminal_observation"] = obs[i]
+                infos[i]["TimeLimit.truncated"] = bool(truncated[i])
+            self._reset_envs(done_indices)
+            obs, _ = self._get_obs()
+        return obs, reward, dones, infos
+
+    def close(self):
+        pass
+
+    def _indices(self, indices):
+        if indices is None:
+            return range(self.num_envs)
+        if isinstance(indices, int):
+            return [indices]
+        return indices
+
+    def get_images(self):
+        return [None for _ in range(self.num_envs)]
+
+    def get_attr(self, attr_name, indices=None):
+        # The attributes are shared by all the environments
+        value = getattr(self, attr_name)
+        return [value for _ in self._indices(indices)]
+
+    def set_attr(self, attr_name, value, indices=None):
+        setattr(self, attr_name, value)
+
+    def env_method(self, method_name, *method_args, indices=None, **method_kwargs):
+        # A single object stands for every environment, call it only once
+        result = getattr(self, method_name)(*method_args, **method_kwargs)
+        return [result for _ in self._indices(indices)]
+
+    def env_is_wrapped(self, wrapper_class, indices=None):
+        return [False for _ in self._indices(indices)]
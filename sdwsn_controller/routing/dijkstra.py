@@ -14,18 +14,20 @@
 
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
-from sdwsn_controller.routing.router import Router
-import networkx as nx
+from sdwsn_controller.routing.shortest_path import ShortestPathRouter
 import logging
 
 logger = logging.getLogger(f'main.{__name__}')
 
 
-class Dijkstra(Router):
+class Dijkstra(ShortestPathRouter):
     def __init__(
             self,
             network
     ):
+        """
+        Shortest paths weighted by the RSSI of the links, in absolute value.
+        """
         self.__name = "Dijkstra"
         super().__init__(
             network=network
@@ -35,28 +37,5 @@ class Dijkstra(Router):
     def name(self):
         return self.__name
 
-    def run(self, G):
-        # Clear all previous routes
-        self.network.routes_clear()
-        # We want to compute the SP from all nodes to the controller
-        path = {}
-        for node in list(G.nodes):
-            if node != 1 and node != 0:
-                node = self.network.nodes_get(node)
-                logger.debug("sp from node "+str(node.id))
-                try:
-                    node_path = nx.dijkstra_path(
-                        G, node.id, 1, weight='weight')
-                    logger.debug("dijkstra path")
-                    logger.debug(node_path)
-                    path[node.id] = node_path
-                    # TODO: find a way to avoid forcing the last addr of
-                    # sensor nodes to 0.
-                    node.route_add(0, node_path[1])
-                except nx.NetworkXNoPath:
-                    logger.exception("path not found")
-
-        logger.debug("total path")
-        logger.debug(path)
-        self.network.routes_print()
-        return path
+    def link_cost(self, src, dst, data) -> float:
+        return data['weight']
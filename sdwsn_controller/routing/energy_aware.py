@@ -0,0 +1,73 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from sdwsn_controller.routing.shortest_path import ShortestPathRouter
+import logging
+
+logger = logging.getLogger(f'main.{__name__}')
+
+
+class EnergyAwareRouter(ShortestPathRouter):
+    def __init__(
+            self,
+            network,
+            energy_weight: float = 1.0
+    ):
+        """
+        Routes with few hops that avoid relaying through the nodes that
+        consume the most energy. Every link costs one hop plus, unless the
+        Rx node is the sink, the last energy sample of the Rx node
+        normalized by the highest one in the network and multiplied by
+        `energy_weight`.
+
+        Args:
+            network (Network): Network to route.
+            energy_weight (float, optional): Weight of the energy of the
+                relays compared to the number of hops. Defaults to 1.0.
+        """
+        self.__name = "Energy Aware"
+        self.energy_weight = energy_weight
+        self.energy = {}
+        super().__init__(
+            network=network
+        )
+
+    @property
+    def name(self):
+        return self.__name
+
+    def relay_energy(self, G) -> dict:
+        """
+        Last energy sample of the nodes in the graph, normalized to [0, 1].
+        Nodes without samples count as zero.
+        """
+        energy = {}
+        for node_id in G.nodes:
+            node = self.network.nodes_get(node_id)
+            if node is not None and node.energy.size():
+                energy[node_id] = node.energy_get_last()
+        max_energy = max(energy.values(), default=0)
+        if max_energy <= 0:
+            return {}
+        return {node_id: value / max_energy for node_id, value in energy.items()}
+
+    def prepare(self, G):
+        self.energy = self.relay_energy(G)
+
+    def link_cost(self, src, dst, data) -> float:
+        if dst == 1:
+            return 1
+        return 1 + self.energy_weight * self.energy.get(dst, 0)
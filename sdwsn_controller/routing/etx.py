@@ -0,0 +1,55 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from sdwsn_controller.routing.shortest_path import ShortestPathRouter
+import logging
+
+logger = logging.getLogger(f'main.{__name__}')
+
+
+class ETXRouter(ShortestPathRouter):
+    def __init__(
+            self,
+            network
+    ):
+        """
+        Shortest paths weighted by the ETX of the links, i.e., the routes
+        that need the fewest expected transmissions to reach the sink.
+
+        The ETX is used as the NA packets report it, in the fixed point of
+        the Contiki-NG link statistics (ETX x 128). Only the relative cost
+        of the links matters, so it is not rescaled. Links without an
+        estimate yet (ETX 0) cost as much as the worst link of the graph,
+        so that unmeasured links are never preferred over measured ones.
+        """
+        self.__name = "ETX"
+        # Cost of the links without an ETX estimate
+        self.unknown_etx = 1
+        super().__init__(
+            network=network
+        )
+
+    @property
+    def name(self):
+        return self.__name
+
+    def prepare(self, G):
+        self.unknown_etx = max((etx for _, _, etx in G.edges(data='etx') if etx > 0), default=1)
+
+    def link_cost(self, src, dst, data) -> float:
+        if data['etx'] > 0:
+            return data['etx']
+        return self.unknown_etx
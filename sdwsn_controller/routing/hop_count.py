@@ -0,0 +1,41 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from sdwsn_controller.routing.shortest_path import ShortestPathRouter
+import logging
+
+logger = logging.getLogger(f'main.{__name__}')
+
+
+class HopCountRouter(ShortestPathRouter):
+    def __init__(
+            self,
+            network
+    ):
+        """
+        Routes with the fewest hops to the sink.
+        """
+        self.__name = "Hop Count"
+        super().__init__(
+            network=network
+        )
+
+    @property
+    def name(self):
+        return self.__name
+
+    def link_cost(self, src, dst, data) -> float:
+        return 1
@@ -27,6 +27,8 @@ logger = logging.getLogger(f'main.{__name__}')
 
 # ---------------------------------------------------------------------------
 class Route():
+    __slots__ = ('dst_id', 'nexthop_id')
+
     def __init__(
         self,
         dst_id,
@@ -44,6 +46,8 @@ class Route():
 
 
 class RoutingTable():
+    __slots__ = ('node', 'routes', 'default_route')
+
     def __init__(
         self,
         node
@@ -95,6 +99,8 @@ class RoutingTable():
         return route.nexthop_id if route is not None else None
 
     def print(self):
+        if not logger.isEnabledFor(logging.INFO):
+            return
         table = Table(title="Routing table")
 
         table.add_column("Source", justify="center",
@@ -0,0 +1,120 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import logging
+
+from sdwsn_controller.routing.router import Router
+
+logger = logging.getLogger(f'main.{__name__}')
+
+
+class RouteStabiliser(Router):
+    def __init__(
+            self,
+            router,
+            margin: float = 0.1
+    ) -> None:
+        """
+        Hysteresis on top of a shortest-path router, so that small changes
+        of the link costs (e.g., RSSI jitter) do not make routes flap.
+
+        A node only switches its parent when the path through the new
+        parent is cheaper than the path through the current one by more
+        than `margin` (a fraction of the current cost), or when the current
+        parent can no longer take it to the sink. Nodes are decided in
+        increasing cost order, and a node only keeps a parent that has
+        already been decided, so the routes always form a tree.
+
+        Args:
+            router (ShortestPathRouter): Router that computes the
+                shortest-path tree and the link costs.
+            margin (float, optional): Relative improvement needed to switch
+                parents. Defaults to 0.1.
+        """
+        self.__name = f"{router.name} (hysteresis {margin:g})"
+        self.router = router
+        self.margin = margin
+        # Current parent of every node
+        self.parents = {}
+        super().__init__(
+            network=router.network
+        )
+        self.reset_stats()
+
+    @property
+    def name(self):
+        return self.__name
+
+    def reset_stats(self):
+        # Parents changed and route changes suppressed by the hysteresis
+        self.stats_route_changes = 0
+        self.stats_route_suppressed = 0
+
+    def clear(self):
+        self.parents = {}
+
+    def stable_parents(self, G) -> dict:
+        """
+        Parent of every node that can reach the sink, with hysteresis.
+
+        Args:
+            G (networkx.DiGraph): Link graph, as returned by `Network.links`.
+
+        Returns:
+            dict: node ID -> parent ID.
+        """
+        costs, distances, paths = self.router.shortest_tree(G)
+        # Cost to the sink through the parents chosen so far
+        current = {1: 0}
+        parents = {}
+        # A parent never costs more, nor has more hops, than its children
+        order = sorted(distances, key=lambda node_id: (distances[node_id], len(paths[node_id]), node_id))
+        for node_id in order:
+            parent = paths[node_id][1]
+            cost = costs[(node_id, parent)] + current[parent]
+            old_parent = self.parents.get(node_id)
+            if old_parent is not None and old_parent != parent:
+                old_link = costs.get((node_id, old_parent))
+                if old_link is not None and old_parent in current:
+                    old_cost = old_link + current[old_parent]
+                    if cost >= old_cost * (1 - self.margin):
+                        logger.debug(f"node {node_id}: keep parent {old_parent} ({old_cost}), "
+                                     f"instead of {parent} ({cost})")
+                        self.stats_route_suppressed += 1
+                        parent = old_parent
+                        cost = old_cost
+            if old_parent != parent:
+                self.stats_route_changes += 1
+            parents[node_id] = parent
+            current[node_id] = cost
+        self.parents = parents
+        return parents
+
+    def run(self, G):
+        # Clear all previous routes
+        self.network.routes_clear()
+        parents = self.stable_parents(G)
+        path = {}
+        for node_id, parent in parents.items():
+            # Parents are decided before their children
+            path[node_id] = [node_id, *path.get(parent, [parent])]
+            # TODO: find a way to avoid forcing the last addr of
+            # sensor nodes to 0.
+            self.network.nodes_get(node_id).route_add(0, parent)
+        logger.debug("total path")
+        logger.debug(path)
+        self.network.routes_print()
+        return path
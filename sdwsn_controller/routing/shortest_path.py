@@ -0,0 +1,139 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from abc import abstractmethod
+import logging
+
+import networkx as nx
+
+from sdwsn_controller.routing.router import Router
+
+logger = logging.getLogger(f'main.{__name__}')
+
+
+class ShortestPathRouter(Router):
+    def __init__(
+            self,
+            network
+    ) -> None:
+        """
+        Base of the routers that route every node to the sink through its
+        shortest path. Subclasses only define the cost of each link.
+
+        The shortest-path tree is computed with a single Dijkstra from the
+        sink over the reversed link graph, and it is cached: if the cost of
+        every link is the same as in the previous run, the previous tree is
+        reused.
+        """
+        super().__init__(
+            network=network
+        )
+        self.__costs = None
+        self.__tree = None
+
+    @abstractmethod
+    def link_cost(self, src, dst, data) -> float:
+        """
+        Cost of the link from `src` to `dst`.
+
+        Args:
+            src (int): Tx node.
+            dst (int): Rx node.
+            data (dict): Link attributes: `weight` (-RSSI), `rssi` and `etx`.
+
+        Returns:
+            float: Cost of the link, it must not be negative.
+        """
+        pass
+
+    def prepare(self, G):
+        """
+        Called with the link graph before the link costs are computed, to
+        refresh whatever state `link_cost` depends on besides the link.
+
+        Args:
+            G (networkx.DiGraph): Link graph, as returned by `Network.links`.
+        """
+        pass
+
+    def shortest_tree(self, G) -> tuple:
+        """
+        Shortest-path tree to the sink.
+
+        Args:
+            G (networkx.DiGraph): Link graph, as returned by `Network.links`.
+
+        Returns:
+            tuple: Cost of every link, (src, dst) -> cost; cost to the sink
+            of every node that can reach it; and its path to the sink, sink
+            included.
+        """
+        self.prepare(G)
+        costs = {(src, dst): self.link_cost(src, dst, data)
+                 for src, dst, data in G.edges(data=True)}
+        if costs == self.__costs:
+            logger.debug("link costs did not change, reusing the routes")
+            return self.__tree
+        distances = {}
+        paths = {}
+        if 1 in G:
+            # Edges of the reversed graph go from dst to src
+            sink_distances, sink_paths = nx.single_source_dijkstra(
+                G.reverse(copy=False), 1,
+                weight=lambda dst, src, _: costs[(src, dst)])
+            for node_id, node_path in sink_paths.items():
+                if node_id != 1 and node_id != 0:
+                    distances[node_id] = sink_distances[node_id]
+                    paths[node_id] = node_path[::-1]
+        else:
+            logger.warning("sink not found in the network graph")
+        self.__costs = costs
+        self.__tree = (costs, distances, paths)
+        return self.__tree
+
+    def shortest_paths(self, G) -> dict:
+        """
+        Shortest path to the sink of every node that can reach it.
+
+        Args:
+            G (networkx.DiGraph): Link graph, as returned by `Network.links`.
+
+        Returns:
+            dict: node ID -> path to the sink, sink included.
+        """
+        return self.shortest_tree(G)[2]
+
+    def run(self, G):
+        # Clear all previous routes
+        self.network.routes_clear()
+        # We want to compute the SP from all nodes to the controller
+        path = dict(self.shortest_paths(G))
+        for node_id in G.nodes:
+            if node_id == 1 or node_id == 0:
+                continue
+            node_path = path.get(node_id)
+            if node_path is None:
+                logger.warning(f"path not found for node {node_id}")
+                continue
+            logger.debug(f"sp from node {node_id}: {node_path}")
+            # TODO: find a way to avoid forcing the last addr of
+            # sensor nodes to 0.
+            self.network.nodes_get(node_id).route_add(0, node_path[1])
+
+        logger.debug("total path")
+        logger.debug(path)
+        self.network.routes_print()
+        return path
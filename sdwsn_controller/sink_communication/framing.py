@@ -0,0 +1,194 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+""" HDLC-like framing used between the controller and the sink node """
+import logging
+import re
+
+
+logger = logging.getLogger(f'main.{__name__}')
+
+FRAME_BOUNDARY = 0x7E
+FRAME_ESCAPE = 0x7D
+FRAME_XOR = 0x20
+# Maximum (unescaped) frame size, 122 bytes plus 2 bytes from the serial
+# communication.
+FRAME_MAX_LEN = 122 + 2
+# Shortest frame the sink can send us.
+FRAME_MIN_LEN = 6
+
+_BOUNDARY = bytes([FRAME_BOUNDARY])
+_ESCAPED = re.compile(rb'\x7d(.)', re.DOTALL)
+
+
+def escape(data):
+    """
+    Escape the boundary and escape octets of a whole payload at once.
+
+    Args:
+        data (bytes): Payload to escape.
+
+    Returns:
+        bytes: Escaped payload.
+    """
+    # The escape octet goes first, otherwise we would escape the escapes
+    return bytes(data).replace(b'\x7d', b'\x7d\x5d').replace(b'\x7e', b'\x7d\x5e')
+
+
+def encode_frame(data):
+    """
+    Build the frame of a single packet.
+
+    Args:
+        data (bytes): Packet to send.
+
+    Returns:
+        bytes: Frame ready to be written to the sink.
+    """
+    return b''.join((_BOUNDARY, escape(data), _BOUNDARY))
+
+
+def encode_frames(packets):
+    """
+    Build the frames of several packets so that they can be sent in a
+    single write. Every frame has its own opening and closing octets as
+    the sink does not share boundaries between frames.
+
+    Args:
+        packets (iterable): Packets to send.
+
+    Returns:
+        bytes: Frames ready to be written to the sink.
+    """
+    return b''.join(encode_frame(packet) for packet in packets)
+
+
+def _unescape_byte(match):
+    return bytes([match.group(1)[0] ^ FRAME_XOR])
+
+
+def unescape(data):
+    """
+    Remove the escape characters of a whole frame at once.
+
+    Args:
+        data (bytes): Escaped frame, without boundary octets.
+
+    Returns:
+        bytes: Unescaped frame.
+    """
+    if FRAME_ESCAPE not in data:
+        return bytes(data)
+    return _ESCAPED.sub(_unescape_byte, data)
+
+
+def _escape_pending(data):
+    """
+    Check whether the last byte of `data` is an escape character that has
+    not consumed its escaped byte yet, i.e., the run of trailing 0x7D bytes
+    has an odd length.
+    """
+    run = len(data) - len(data.rstrip(b'\x7d'))
+    return run % 2 == 1
+
+
+class FrameDecoder():
+    def __init__(
+        self,
+        max_len: int = FRAME_MAX_LEN,
+        min_len: int = FRAME_MIN_LEN
+    ) -> None:
+        """
+        Streaming decoder of the frames sent by the sink. It consumes chunks
+        of any size, looks for the frame boundaries with `bytes.find` and
+        unescapes every frame in one go. It follows the same overflow and
+        re-synchronization rules as `ByteStreamMixin._recv_internal`.
+
+        Args:
+            max_len (int, optional): Maximum unescaped frame length.
+                Defaults to FRAME_MAX_LEN.
+            min_len (int, optional): Minimum unescaped frame length.
+                Defaults to FRAME_MIN_LEN.
+        """
+        self.max_len = max_len
+        self.min_len = min_len
+        # An escaped frame is, at most, twice as long as the unescaped one.
+        self.__max_raw_len = 2 * (max_len + 1)
+        self.reset()
+
+    def reset(self):
+        # Escaped bytes received since the last frame boundary
+        self.__raw = bytearray()
+        self.frame_start = 0
+        self.overflow = 0
+
+    def __boundary(self, frames):
+        if _escape_pending(self.__raw):
+            # The boundary octet has been escaped. The sink ignores it and
+            # carries on with the current frame.
+            del self.__raw[-1]
+            return
+        if self.overflow:
+            logger.debug("serial overflow")
+            self.overflow = 0
+            self.frame_start = 1
+            self.__raw = bytearray()
+            return
+        frame = unescape(self.__raw)
+        self.__raw = bytearray()
+        if len(frame) > self.max_len:
+            logger.debug(f"Packet size overflow: {len(frame)} bytes")
+            self.frame_start = 1
+        elif len(frame) >= self.min_len and self.frame_start:
+            self.frame_start = 0
+            frames.append(bytearray(frame))
+        else:
+            # re-synchronization. Start over
+            self.frame_start = 1
+
+    def __extend(self, data):
+        self.__raw.extend(data)
+        if not self.overflow and len(self.__raw) > self.__max_raw_len:
+            self.overflow = 1
+        if self.overflow:
+            # We only need to remember whether an escape is pending
+            self.__raw = bytearray(
+                b'\x7d' if _escape_pending(self.__raw) else b'')
+
+    def feed(self, data) -> list:
+        """
+        Decode a chunk of bytes read from the sink.
+
+        Args:
+            data (bytes-like): Bytes read from the sink.
+
+        Returns:
+            list: Complete frames (bytearray) found in this chunk.
+        """
+        frames = []
+        data = bytes(data)
+        start = 0
+        while True:
+            end = data.find(_BOUNDARY, start)
+            if end < 0:
+                break
+            self.__extend(data[start:end])
+            self.__boundary(frames)
+            start = end + 1
+        if start < len(data):
+            self.__extend(data[start:])
+        return frames
@@ -17,17 +17,22 @@
 
 from abc import ABC, abstractmethod
 
+from collections import deque
+
 from typing import Optional
 
+from sdwsn_controller.sink_communication.framing import FrameDecoder, encode_frame, encode_frames
+
 from time import time
 
 import logging
 
-import sys
-
 
 logger = logging.getLogger(__name__)
 
+# Number of bytes we try to read from the sink at once
+RX_CHUNK_SIZE = 4096
+
 
 class SinkABC(ABC):
 
@@ -38,12 +43,8 @@ class SinkABC(ABC):
         """
         Abstract class for sink communication.
         """
-        self.byte_msg = bytearray()
-        self.overflow = 0
-        self.escape_character = 0
-        self.frame_start = 0
-        self.frame_length = 0
         self.msg = None
+        self.decoder = FrameDecoder()
 
     @abstractmethod
     def name(self):
@@ -73,16 +74,6 @@ class SinkABC(ABC):
         """
         pass
 
-    @abstractmethod
-    def read_byte(self):
-        """
-        Read a byte from the sink.
-
-        Returns:
-            int: Byte read.
-        """
-        pass
-
     @abstractmethod
     def error_exception(self):
         """
@@ -103,9 +94,124 @@ class SinkABC(ABC):
         """
         pass
 
+    @abstractmethod
+    def recv(self, timeout: Optional[float] = None) -> Optional[bytearray]:
+        """
+        Block waiting for a message from the sink.
+
+        Args:
+            timeout (Optional[float], optional): Seconds to wait for a message.
+                Defaults to None (Wait indefinitely).
+
+        Returns:
+            Message, None: Returns message.
+        """
+        pass
+
+    def attach(self, packet_dissector):
+        """
+        Let the sink deliver the received frames to the packet dissector by
+        itself.
+
+        Args:
+            packet_dissector (PacketDissector): Consumer of the frames.
+
+        Returns:
+            bool: False if the caller has to poll `recv` instead.
+        """
+        return False
+
+    def send(self, data) -> None:
+        """
+        Transmit a message to the sink
+
+        Args:
+            data (Message): Message object to transmit.
+        """
+        logger.debug('Sending message over the serial interface')
+        byte_msg = encode_frame(data)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f'packet to send\n{byte_msg.hex()}')
+        self.send_stream_bytes(byte_msg)
+
+    def send_many(self, packets) -> None:
+        """
+        Transmit several messages to the sink in a single write.
+
+        Args:
+            packets (list): Message objects to transmit.
+        """
+        logger.debug(f'Sending {len(packets)} messages over the serial interface')
+        self.send_stream_bytes(encode_frames(packets))
+
+    def empty_socket(self):
+        # Drop any partial frame
+        self.decoder.reset()
+
+    def shutdown(self) -> None:
+        """
+        Close the serial interface.
+        """
+        if self.ser is not None:
+            self.empty_socket()
+            logger.debug("socket buffer is now empty, we close ...")
+            self.ser.close()
+
+    def __iter__(self):
+        """Allow iteration on messages as they are received.
+
+            >>> for msg in bus:
+            ...     print(msg)
+
+
+        :yields:
+            :class:`Message` msg objects.
+        """
+        while True:
+            msg = self.recv(timeout=1.0)
+            if msg is not None:
+                yield msg
+
+
+class ByteStreamMixin(ABC):
+    """
+    Mixin of the sinks that are polled for bytes, e.g., blocking sockets or
+    serial ports. It reads chunks of bytes and turns them into frames.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.byte_msg = bytearray()
+        self.overflow = 0
+        self.escape_character = 0
+        self.frame_start = 0
+        self.frame_length = 0
+        self.frames = deque()
+        super().__init__(*args, **kwargs)
+
+    @abstractmethod
+    def read_byte(self):
+        """
+        Read a byte from the sink.
+
+        Returns:
+            int: Byte read.
+        """
+        pass
+
+    def read_chunk(self):
+        """
+        Read as many bytes as currently available from the sink. Sinks
+        should override this to avoid a system call per byte.
+
+        Returns:
+            bytes: Bytes read.
+        """
+        return self.read_byte()
+
     def _recv_internal(self):
         """
-        Read a message from the sink.
+        Read a message from the sink, one byte at a time. `recv` relies on
+        the chunked `FrameDecoder` instead.
 
         Returns:
             int, Message: Message received.
@@ -185,73 +291,36 @@ class SinkABC(ABC):
         time_left = timeout
 
         while time_left is None or time_left > 0:
-            msg, _ = self._recv_internal()
-            if msg != 0:
-                # logger.debug("Received: %s", msg)
-                return msg
-            if timeout is None:
-                continue
-            else:
+            if self.frames:
+                return self.frames.popleft()
+            try:
+                chunk = self.read_chunk()
+            except self.error_exception():
+                return None
+            if not chunk:
+                # Nothing to read (or the connection has been closed)
+                return None
+            self.frames.extend(self.decoder.feed(chunk))
+            if timeout is not None:
                 time_left = timeout - (time() - start)
 
+        if self.frames:
+            return self.frames.popleft()
         return None
 
-    def check_byte(self, byte_data, data):
-        if (ord(data) == 0x7E or ord(data) == 0x7D):
-            byte_data.extend(bytes.fromhex('7D'))
-            invert = ord(data) ^ ord(b'\x20')
-            invert_bytes = invert.to_bytes(len(data), sys.byteorder)
-            byte_data.extend(invert_bytes)
-        else:
-            byte_data.extend(data)
-
-    def send(self, data) -> None:
+    def drain(self):
         """
-        Transmit a message to the sink
-
-        Args:
-            data (Message): Message object to transmit.
+        Discard the bytes pending on the sink. Sinks that can do it without
+        decoding them override this.
         """
-        logger.debug('Sending message over the serial interface')
-        byte_msg = bytearray()
-        byte_msg.extend(bytes.fromhex('7E'))
-        data = [data[i:i+1] for i in range(len(data))]
-        for i in range(0, len(data)):
-            # logger.info('data')
-            # logger.info((data[i]))
-            self.check_byte(byte_msg, data[i])
-        byte_msg.extend(bytes.fromhex('7E'))
-        logger.debug('packet to send')
-        logger.debug(byte_msg.hex())
-        self.send_stream_bytes(byte_msg)
-
-    def empty_socket(self):
         try:
             while self.recv(0.1):
                 pass
         except TypeError:
             pass
 
-    def shutdown(self) -> None:
-        """
-        Close the serial interface.
-        """
-        if self.ser is not None:
-            self.empty_socket()
-            logger.debug("socket buffer is now empty, we close ...")
-            self.ser.close()
-
-    def __iter__(self):
-        """Allow iteration on messages as they are received.
-
-            >>> for msg in bus:
-            ...     print(msg)
-
-
-        :yields:
-            :class:`Message` msg objects.
-        """
-        while True:
-            msg = self.recv(timeout=1.0)
-            if msg is not None:
-                yield msg
+    def empty_socket(self):
+        self.drain()
+        # Drop the frames we have not consumed yet and any partial frame
+        self.frames.clear()
+        super().empty_socket()
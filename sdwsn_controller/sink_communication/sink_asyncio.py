@@ -0,0 +1,139 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from abc import abstractmethod
+
+from typing import Optional
+
+from sdwsn_controller.sink_communication.sink_abc import SinkABC
+
+import asyncio
+import logging
+import threading
+
+
+logger = logging.getLogger(f'main.{__name__}')
+
+_loop = None
+_loop_lock = threading.Lock()
+
+
+def get_event_loop():
+    """
+    Get the event loop shared by all asyncio sinks. The loop runs in its
+    own daemon thread and it is created the first time it is needed.
+
+    Returns:
+        asyncio.AbstractEventLoop: Event loop.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever,
+                             name="sink-event-loop", daemon=True).start()
+    return _loop
+
+
+class AsyncSinkABC(SinkABC):
+
+    @abstractmethod
+    def __init__(
+        self
+    ):
+        """
+        Abstract class for sinks served by an asyncio event loop. Frames
+        are delivered into an `asyncio.Queue` that the packet dissector
+        consumes, so there is no thread polling the sink.
+        """
+        self.loop = get_event_loop()
+        self.queue = None
+        self.consumers = []
+        super().__init__()
+
+    @abstractmethod
+    async def open(self):
+        """
+        Open the connection to the sink and start feeding the received
+        bytes to `data_received`. It runs in the event loop.
+        """
+        pass
+
+    @abstractmethod
+    async def close(self):
+        """
+        Close the connection to the sink. It runs in the event loop.
+        """
+        pass
+
+    def run(self, coro, timeout=None):
+        """
+        Run a coroutine in the event loop and wait for its result.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def data_received(self, data):
+        """
+        Decode the bytes received from the sink and enqueue the complete
+        frames. It runs in the event loop.
+        """
+        for frame in self.decoder.feed(data):
+            self.queue.put_nowait(frame)
+
+    async def __open(self):
+        self.queue = asyncio.Queue()
+        await self.open()
+
+    def connect(self, **kwargs):
+        try:
+            self.run(self.__open())
+        except OSError as ex:
+            logger.warning(f"{self.name} connection failed: {ex}")
+            return ex.errno or 1
+        return 0
+
+    def error_exception(self):
+        return OSError
+
+    def attach(self, packet_dissector):
+        # The packet dissector consumes the frames in the event loop
+        self.consumers.append(asyncio.run_coroutine_threadsafe(
+            packet_dissector.consume(self.queue), self.loop))
+        return True
+
+    def recv(self, timeout: Optional[float] = None) -> Optional[bytearray]:
+        if self.queue is None:
+            return None
+        try:
+            return self.run(asyncio.wait_for(self.queue.get(), timeout))
+        except asyncio.TimeoutError:
+            return None
+
+    def empty_socket(self):
+        if self.queue is not None:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+        super().empty_socket()
+
+    def shutdown(self) -> None:
+        for consumer in self.consumers:
+            consumer.cancel()
+        self.consumers = []
+        if self.ser is not None:
+            self.run(self.close())
+            logger.debug("sink connection closed")
+        self.empty_socket()
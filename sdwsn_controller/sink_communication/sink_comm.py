@@ -15,7 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from sdwsn_controller.sink_communication.sink_abc import SinkABC
+from sdwsn_controller.sink_communication.sink_abc import ByteStreamMixin, SinkABC, RX_CHUNK_SIZE
 
 import logging
 import socket
@@ -23,7 +23,7 @@ import socket
 logger = logging.getLogger(f'main.{__name__}')
 
 
-class SinkComm(SinkABC):
+class SinkComm(ByteStreamMixin, SinkABC):
     def __init__(
         self,
         config
@@ -34,6 +34,8 @@ class SinkComm(SinkABC):
         self.port = config.sink_comm.port_baud
         self.__name = "Socket"
         self.ser = None
+        self.rx_buffer = bytearray(RX_CHUNK_SIZE)
+        self.rx_view = memoryview(self.rx_buffer)
         super().__init__()
 
     @property
@@ -57,8 +59,24 @@ class SinkComm(SinkABC):
     def read_byte(self):
         return self.ser.recv(1)
 
+    def read_chunk(self):
+        num_bytes = self.ser.recv_into(self.rx_buffer)
+        return self.rx_view[:num_bytes]
+
     def error_exception(self):
         return socket.error
 
     def send_stream_bytes(self, stream_bytes):
         self.ser.send(stream_bytes)
+
+    def drain(self):
+        # Drain the bytes pending on the socket without blocking
+        try:
+            self.ser.setblocking(False)
+            try:
+                while self.ser.recv_into(self.rx_buffer):
+                    pass
+            finally:
+                self.ser.setblocking(True)
+        except socket.error:
+            pass
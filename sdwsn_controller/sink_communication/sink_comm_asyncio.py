@@ -0,0 +1,86 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from sdwsn_controller.sink_communication.sink_abc import RX_CHUNK_SIZE
+from sdwsn_controller.sink_communication.sink_asyncio import AsyncSinkABC
+
+import asyncio
+import logging
+
+logger = logging.getLogger(f'main.{__name__}')
+
+
+class AsyncSinkComm(AsyncSinkABC):
+    def __init__(
+        self,
+        config
+    ):
+        assert isinstance(config.sink_comm.host_dev, str)
+        assert isinstance(config.sink_comm.port_baud, int)
+        self.host = config.sink_comm.host_dev
+        self.port = config.sink_comm.port_baud
+        self.__name = "Asyncio socket"
+        self.__reader = None
+        self.__writer = None
+        self.__read_task = None
+        super().__init__()
+
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def ser(self):
+        return self.__writer
+
+    async def open(self):
+        self.__reader, self.__writer = await asyncio.open_connection(
+            self.host, self.port)
+        self.__read_task = asyncio.create_task(self.__read())
+
+    async def __read(self):
+        while True:
+            chunk = await self.__reader.read(RX_CHUNK_SIZE)
+            if not chunk:
+                logger.debug("Socket closed by the sink")
+                break
+            self.data_received(chunk)
+
+    async def close(self):
+        self.__read_task.cancel()
+        self.__writer.close()
+        try:
+            await self.__writer.wait_closed()
+        except OSError:
+            pass
+        self.__writer = None
+
+    def __connected(self):
+        return self.__writer is not None and not self.__writer.is_closing()
+
+    def __write(self, stream_bytes):
+        # The connection may have been closed since the write was scheduled
+        if not self.__connected():
+            logger.warning("Couldn't send data, the socket is closed")
+            return
+        self.__writer.write(stream_bytes)
+
+    def send_stream_bytes(self, stream_bytes):
+        if not self.__connected():
+            logger.warning("Couldn't send data, the socket is closed")
+            return
+        self.loop.call_soon_threadsafe(self.__write, bytes(stream_bytes))
@@ -15,7 +15,7 @@
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
-from sdwsn_controller.sink_communication.sink_abc import SinkABC
+from sdwsn_controller.sink_communication.sink_abc import ByteStreamMixin, SinkABC
 
 import logging
 import serial
@@ -23,7 +23,7 @@ import serial
 logger = logging.getLogger(f'main.{__name__}')
 
 
-class SinkSerial(SinkABC):
+class SinkSerial(ByteStreamMixin, SinkABC):
     def __init__(
         self,
         config
@@ -55,8 +55,19 @@ class SinkSerial(SinkABC):
     def read_byte(self):
         return self.ser.read()
 
+    def read_chunk(self):
+        # Block for, at least, one byte and take whatever is waiting
+        return self.ser.read(self.ser.in_waiting or 1)
+
     def error_exception(self):
         return serial.SerialException
 
     def send_stream_bytes(self, stream_bytes):
         self.ser.write(stream_bytes)
+
+    def drain(self):
+        # Discard the bytes pending on the serial port without blocking
+        try:
+            self.ser.reset_input_buffer()
+        except serial.SerialException:
+            pass
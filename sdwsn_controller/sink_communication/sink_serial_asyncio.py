@@ -0,0 +1,87 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+from sdwsn_controller.sink_communication.sink_asyncio import AsyncSinkABC
+
+import logging
+import serial
+
+logger = logging.getLogger(f'main.{__name__}')
+
+
+class AsyncSinkSerial(AsyncSinkABC):
+    def __init__(
+        self,
+        config
+    ):
+        assert isinstance(config.sink_comm.host_dev, str)
+        assert isinstance(config.sink_comm.port_baud, int)
+        self.dev = config.sink_comm.host_dev
+        self.baud = config.sink_comm.port_baud
+        self.__name = "Asyncio serial"
+        self.__ser = None
+        super().__init__()
+
+    @property
+    def name(self):
+        return self.__name
+
+    @property
+    def ser(self):
+        return self.__ser
+
+    async def open(self):
+        # Non-blocking port, the event loop tells us when there is data
+        try:
+            self.__ser = serial.Serial(self.dev, self.baud, timeout=0)
+        except serial.SerialException as ex:
+            raise OSError(str(ex))
+        self.loop.add_reader(self.__ser.fileno(), self.__readable)
+
+    def __readable(self):
+        try:
+            data = self.__ser.read(self.__ser.in_waiting or 1)
+        except serial.SerialException:
+            logger.exception("Serial port read failed")
+            self.loop.remove_reader(self.__ser.fileno())
+            return
+        if data:
+            self.data_received(data)
+
+    async def close(self):
+        self.loop.remove_reader(self.__ser.fileno())
+        self.__ser.close()
+        self.__ser = None
+
+    def __connected(self):
+        return self.__ser is not None and self.__ser.is_open
+
+    def __write(self, stream_bytes):
+        # The port may have been closed since the write was scheduled
+        if not self.__connected():
+            logger.warning("Couldn't send data, the serial port is closed")
+            return
+        try:
+            self.__ser.write(stream_bytes)
+        except serial.SerialException:
+            logger.exception("Serial port write failed")
+
+    def send_stream_bytes(self, stream_bytes):
+        if not self.__connected():
+            logger.warning("Couldn't send data, the serial port is closed")
+            return
+        self.loop.call_soon_threadsafe(self.__write, bytes(stream_bytes))
@@ -14,6 +14,7 @@
 
 # You should have received a copy of the GNU General Public License
 # along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from sdwsn_controller.exceptions import SlotframeFullError
 from sdwsn_controller.tsch.scheduler import TSCHScheduler
 import random
 from sdwsn_controller.tsch.schedule import cell_type
@@ -41,6 +42,8 @@ class ContentionFreeScheduler(TSCHScheduler):
             f"running contention free scheduler for sf size {current_sf_size}")
         self.network.tsch_clear()
         self.network.tsch_slotframe_size = current_sf_size
+        # Timeslots that are not used by any node, in any channel
+        free_timeslots = self.network.tsch_free_timeslots(current_sf_size-1)
         for _, p in path.items():
             if (len(p) >= 2):
                 logger.debug(f"add uc for {p}")
@@ -54,17 +57,15 @@ class ContentionFreeScheduler(TSCHScheduler):
                     if not self.network.tsch_link_exists(tx_node, rx_node):
                         logger.debug(
                             f'link {tx_node.id}-{rx_node.id} does not exists')
-                        # Random Tx link to RX if it is available
-                        ts = random.randrange(0,
-                                              current_sf_size-1)
+                        if not free_timeslots:
+                            raise SlotframeFullError(current_sf_size)
+                        # Random Tx link to RX among the free timeslots
+                        idx = random.randrange(len(free_timeslots))
+                        ts = free_timeslots[idx]
+                        free_timeslots[idx] = free_timeslots[-1]
+                        free_timeslots.pop()
                         ch = random.randrange(0,
                                               self.network.tsch_max_ch-1)
-                        # Let's first check whether this timeslot is already in use in the schedule
-                        while (not self.network.tsch_timeslot_free(ts)):
-                            logger.debug(
-                                f"ts {ts} already in use")
-                            ts = random.randrange(0, current_sf_size-1)
-                        # We have found an empty timeslot
                         logger.debug(
                             f'empty time slot {ts} found for {tx_node.id}-{rx_node.id}')
                         # Schedule Tx
@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from sdwsn_controller.exceptions import SlotframeFullError
+from sdwsn_controller.tsch.scheduler import TSCHScheduler
+from sdwsn_controller.tsch.schedule import cell_type
+import heapq
+import logging
+
+logger = logging.getLogger(f'main.{__name__}')
+
+
+class GraphColouringScheduler(TSCHScheduler):
+    def __init__(
+            self,
+            network
+    ) -> None:
+        """
+        Deterministic scheduler that colours the conflict graph of the
+        routing tree with DSatur. The vertices are the Tx-Rx links of the
+        paths and two links conflict if they share a node, as a radio is
+        half-duplex. Each colour is a timeslot, which holds up to
+        `tsch_max_ch - 1` non-conflicting links on different channels, the
+        channel offsets used by the contention free scheduler.
+        Timeslots are assigned from 0 upwards, so the last active timeslot
+        is kept as low as the colouring allows.
+        """
+        self.__name = "Graph Colouring Scheduler"
+        super().__init__(
+            network=network
+        )
+
+    @property
+    def name(self):
+        return self.__name
+
+    def links(self, path) -> list:
+        """
+        Unique Tx-Rx links of the paths, sorted so that the schedule does
+        not depend on the order of the paths.
+        """
+        links = set()
+        for p in path.values():
+            for i in range(len(p)-1):
+                links.add((p[i], p[i+1]))
+        return sorted(links)
+
+    def colour(self, links) -> list:
+        """
+        Assign a (timeslot, channel) cell to every link with DSatur.
+
+        Args:
+            links (list): Tx-Rx links.
+
+        Returns:
+            list: (ts, ch) cell of each link.
+        """
+        # Same channel offsets as the contention free scheduler
+        max_ch = max(1, self.network.tsch_max_ch - 1)
+        # Links of every node
+        node_links = {}
+        for idx, (tx, rx) in enumerate(links):
+            node_links.setdefault(tx, []).append(idx)
+            node_links.setdefault(rx, []).append(idx)
+        degree = [len(node_links[tx]) + len(node_links[rx]) - 2 for tx, rx in links]
+        # Timeslots used by the neighbours of every link (its saturation)
+        neighbour_ts = [set() for _ in links]
+        cells = [None] * len(links)
+        # Number of links scheduled in every timeslot
+        ts_load = []
+        heap = [(0, -degree[idx], idx) for idx in range(len(links))]
+        heapq.heapify(heap)
+        while heap:
+            saturation, _, idx = heapq.heappop(heap)
+            if cells[idx] is not None or -saturation != len(neighbour_ts[idx]):
+                # Stale entry
+                continue
+            tx, rx = links[idx]
+            used = neighbour_ts[idx]
+            ts = 0
+            while ts < len(ts_load) and (ts in used or ts_load[ts] >= max_ch):
+                ts += 1
+            if ts == len(ts_load):
+                ts_load.append(0)
+            cells[idx] = (ts, ts_load[ts])
+            ts_load[ts] += 1
+            for node in (tx, rx):
+                for other in node_links[node]:
+                    if cells[other] is None and ts not in neighbour_ts[other]:
+                        neighbour_ts[other].add(ts)
+                        heapq.heappush(heap, (-len(neighbour_ts[other]), -degree[other], other))
+        return cells
+
+    def run(self, path, current_sf_size):
+        logger.debug(
+            f"running graph colouring scheduler for sf size {current_sf_size}")
+        self.network.tsch_clear()
+        self.network.tsch_slotframe_size = current_sf_size
+        links = self.links(path)
+        cells = self.colour(links)
+        if cells and max(ts for ts, _ in cells) >= current_sf_size-1:
+            raise SlotframeFullError(current_sf_size)
+        for (tx, rx), (ts, ch) in zip(links, cells):
+            tx_node = self.network.nodes_add(tx)
+            rx_node = self.network.nodes_add(rx)
+            logger.debug(f'link {tx_node.id}-{rx_node.id} at ts {ts}, ch {ch}')
+            # Schedule Tx
+            tx_node.tsch_add_link(cell_type.UC_TX, ch, ts, rx_node.id)
+            # Schedule Rx
+            rx_node.tsch_add_link(cell_type.UC_RX, ch, ts)
+        # Print the schedule
+        self.network.tsch_print()
@@ -13,6 +13,8 @@ cell_type.UC_TX = 1
 
 
 class TSCHSchedule():
+    __slots__ = ('schedule_type', 'dst_id', 'ch', 'ts')
+
     def __init__(
         self,
         schedule_type=None,
@@ -20,10 +22,6 @@ class TSCHSchedule():
         ch=None,
         ts=None
     ) -> None:
-        assert isinstance(schedule_type, int)
-        assert isinstance(dst_id, int | type(None))
-        assert isinstance(ch, int)
-        assert isinstance(ts, int)
         self.schedule_type = schedule_type
         self.dst_id = dst_id
         self.ch = ch
@@ -31,16 +29,95 @@ class TSCHSchedule():
 # ---------------------------------------------------------------------------
 
 
+def _count_add(counts, key):
+    counts[key] = counts.get(key, 0) + 1
+
+
+def _count_remove(counts, key) -> bool:
+    # Returns True if there is no `key` left
+    count = counts[key] - 1
+    if count:
+        counts[key] = count
+        return False
+    del counts[key]
+    return True
+
+
+class TSCHOccupancy():
+    __slots__ = ('cells', 'timeslots', 'channels', 'last_ts', 'last_ch')
+
+    def __init__(self) -> None:
+        """
+        Network-wide index of the cells in use. It counts the cells
+        scheduled at each (ts, ch) pair, timeslot and channel, so that
+        checking whether a timeslot is free, or which are the last timeslot
+        and channel in use, does not need to go through the schedule of
+        every node.
+        """
+        self.clear()
+
+    def clear(self):
+        self.cells = {}
+        self.timeslots = {}
+        self.channels = {}
+        self.last_ts = 0
+        self.last_ch = 0
+
+    def add(self, ts, ch):
+        _count_add(self.cells, (ts, ch))
+        _count_add(self.timeslots, ts)
+        _count_add(self.channels, ch)
+        if ts > self.last_ts:
+            self.last_ts = ts
+        if ch > self.last_ch:
+            self.last_ch = ch
+
+    def remove(self, ts, ch):
+        _count_remove(self.cells, (ts, ch))
+        if _count_remove(self.timeslots, ts) and ts == self.last_ts:
+            self.last_ts = max(self.timeslots, default=0)
+        if _count_remove(self.channels, ch) and ch == self.last_ch:
+            self.last_ch = max(self.channels, default=0)
+
+    def cell_free(self, ts, ch) -> bool:
+        return (ts, ch) not in self.cells
+
+    def timeslot_free(self, ts) -> bool:
+        return ts not in self.timeslots
+
+    def free_timeslots(self, num_timeslots) -> list:
+        """
+        Timeslots in [0, num_timeslots) without any cell in any channel.
+        """
+        return [ts for ts in range(num_timeslots) if ts not in self.timeslots]
+
+# ---------------------------------------------------------------------------
+
+
 class TSCHScheduleTable():
+    __slots__ = ('node', 'occupancy', 'tsch_schedules', 'destinations', 'timeslots', 'channels',
+                 'slotframe_size', 'last_ts', 'last_ch')
+
     def __init__(
         self,
-        node
+        node,
+        occupancy=None
     ) -> None:
         self.node = node
+        # Network-wide index of the cells in use, if any
+        self.occupancy = occupancy
+        self.tsch_schedules = {}
         self.clear()
 
     def clear(self):
+        if self.occupancy is not None:
+            for ch, ts in self.tsch_schedules:
+                self.occupancy.remove(ts, ch)
         self.tsch_schedules = {}
+        # Number of cells per destination, timeslot and channel
+        self.destinations = {}
+        self.timeslots = {}
+        self.channels = {}
         self.slotframe_size = 0
         self.last_ts = 0
         self.last_ch = 0
@@ -49,19 +126,13 @@ class TSCHScheduleTable():
         return len(self.tsch_schedules)
 
     def get_schedule(self, ch, ts):
-        self.tsch_schedules.get((ch, ts))
+        return self.tsch_schedules.get((ch, ts))
 
     def get_destination(self, dst_id) -> bool:
-        for schedule in self.tsch_schedules.values():
-            if schedule.dst_id == dst_id:
-                return True
-        return False
+        return dst_id in self.destinations
 
     def timeslot_free(self, ts) -> bool:
-        for schedule in self.tsch_schedules.values():
-            if schedule.ts == ts:
-                return False
-        return True
+        return ts not in self.timeslots
 
     def add_tsch_schedule(self, schedule_type, ch, ts, dst=None) -> TSCHSchedule:
         if self.tsch_schedules.get((ch, ts)):
@@ -71,6 +142,11 @@ class TSCHScheduleTable():
         tsch_schedule = TSCHSchedule(
             schedule_type=schedule_type, dst_id=dst, ch=ch, ts=ts)
         self.tsch_schedules.update({(ch, ts): tsch_schedule})
+        _count_add(self.destinations, dst)
+        _count_add(self.timeslots, ts)
+        _count_add(self.channels, ch)
+        if self.occupancy is not None:
+            self.occupancy.add(ts, ch)
         if ts > self.last_ts:
             self.last_ts = ts
         if ch > self.last_ch:
@@ -80,17 +156,23 @@ class TSCHScheduleTable():
     def remove_tsch_schedule(self, ch, ts):
         logger.debug(
             f"Node {self.node.id}: remove TSCH schedule, ch {ch}, ts {ts}")
-        if (ch, ts) in self.tsch_schedules:
-            del self.tsch_schedules[(ch, ts)]
+        tsch_schedule = self.tsch_schedules.pop((ch, ts), None)
+        if tsch_schedule is None:
+            return
+        _count_remove(self.destinations, tsch_schedule.dst_id)
+        if _count_remove(self.timeslots, ts) and ts == self.last_ts:
+            self.last_ts = max(self.timeslots, default=0)
+        if _count_remove(self.channels, ch) and ch == self.last_ch:
+            self.last_ch = max(self.channels, default=0)
+        if self.occupancy is not None:
+            self.occupancy.remove(ts, ch)
 
     def link_exists(self, dst_id) -> bool:
-        for key in self.tsch_schedules:
-            tsch_schedule = self.tsch_schedules.get(key)
-            if tsch_schedule.dst_id == dst_id:
-                return True
-        return False
+        return dst_id in self.destinations
 
     def print(self):
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
         table = Table(title=f"TSCH schedules for node: {self.node.id}")
 
         table.add_column("Type", justify="center",
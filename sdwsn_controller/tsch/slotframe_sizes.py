@@ -0,0 +1,91 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import numpy as np
+
+from sdwsn_controller.common import common
+
+
+class SlotframeSizes():
+    def __init__(
+            self,
+            max_slotframe: int,
+            orchestra_sizes=common.ORCHESTRA_SLOTFRAME_SIZES
+    ) -> None:
+        """
+        Lookup table of the slotframe sizes that are coprime with the
+        sizes of the other Orchestra slotframes, so that the slotframes do
+        not keep colliding at the same timeslots. The valid sizes up to
+        `max_slotframe` (and the first one above it) are computed once,
+        and the next and previous valid size of any size in that range
+        are O(1) lookups. They also take NumPy arrays of sizes.
+
+        Args:
+            max_slotframe (int): Maximum slotframe size.
+            orchestra_sizes (iterable, optional): Sizes of the other
+                Orchestra slotframes. Defaults to
+                common.ORCHESTRA_SLOTFRAME_SIZES.
+        """
+        self.orchestra_sizes = tuple(orchestra_sizes)
+        # Include the first valid size above the maximum
+        limit = max_slotframe + 1
+        while not self.is_valid(limit):
+            limit += 1
+        candidates = np.arange(limit + 1)
+        valid = np.ones(limit + 1, dtype=bool)
+        for size in self.orchestra_sizes:
+            valid &= np.gcd(candidates, size) == 1
+        self.limit = limit
+        # Sorted array of the valid sizes
+        self.sizes = np.flatnonzero(valid)
+        # Next valid size of [0, limit) and previous one of [0, limit]
+        self.__next = self.sizes[np.searchsorted(self.sizes, candidates[:-1], side='right')]
+        first = np.searchsorted(self.sizes, candidates, side='left')
+        self.__previous = self.sizes[np.maximum(first - 1, 0)]
+        for size in np.flatnonzero(first == 0):
+            # Nothing valid below, same result as the search
+            self.__previous[size] = common.previous_coprime(int(size), self.orchestra_sizes)
+
+    def is_valid(self, size) -> bool:
+        return all(common.gcd(size, orchestra_size) == 1 for orchestra_size in self.orchestra_sizes)
+
+    def next(self, size):
+        """
+        Smallest valid size greater than `size`.
+
+        Args:
+            size (int or numpy.ndarray): Slotframe size(s). Arrays must be
+                in [0, limit).
+        """
+        if np.isscalar(size):
+            if 0 <= size < self.limit:
+                return int(self.__next[size])
+            return common.next_coprime(size, self.orchestra_sizes)
+        return self.__next[size]
+
+    def previous(self, size):
+        """
+        Greatest valid size smaller than `size`.
+
+        Args:
+            size (int or numpy.ndarray): Slotframe size(s). Arrays must be
+                in [0, limit].
+        """
+        if np.isscalar(size):
+            if 0 <= size <= self.limit:
+                return int(self.__previous[size])
+            return common.previous_coprime(size, self.orchestra_sizes)
+        return self.__previous[size]
@@ -0,0 +1,133 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+from sdwsn_controller.exceptions import SlotframeFullError
+from sdwsn_controller.tsch.scheduler import TSCHScheduler
+from sdwsn_controller.tsch.schedule import cell_type
+import logging
+
+logger = logging.getLogger(f'main.{__name__}')
+
+
+class TrafficAwareScheduler(TSCHScheduler):
+    def __init__(
+            self,
+            network
+    ) -> None:
+        """
+        Scheduler that gives every Tx-Rx link as many cells as packets it
+        forwards per slotframe, i.e., one per node whose path goes through
+        it, so links close to the sink get more cells. Links are scheduled
+        from the deepest ones to the sink, and the cells of a link always
+        come after those of the links that feed it (cascading timeslots),
+        so a packet can go from a leaf to the sink within one slotframe. A
+        node never has two cells in the same timeslot, and a timeslot holds
+        up to `tsch_max_ch - 1` links on different channels, the channel
+        offsets used by the contention free scheduler.
+
+        If the schedule does not fit in the slotframe, the number of cells
+        per link is capped, halving the cap until it fits.
+        """
+        self.__name = "Traffic Aware Scheduler"
+        super().__init__(
+            network=network
+        )
+
+    @property
+    def name(self):
+        return self.__name
+
+    def link_loads(self, path) -> dict:
+        """
+        Number of packets each Tx-Rx link forwards when every node sends
+        one packet along its path.
+
+        Args:
+            path (dict): Path to the sink of every node, as returned by the
+                router.
+
+        Returns:
+            dict: (tx, rx) -> (load, hops to the sink).
+        """
+        loads = {}
+        for p in path.values():
+            for i in range(len(p)-1):
+                load, _ = loads.get((p[i], p[i+1]), (0, 0))
+                loads[(p[i], p[i+1])] = (load + 1, len(p) - 1 - i)
+        return loads
+
+    def cells(self, loads, cap) -> dict:
+        """
+        Cascading, collision-free cells of every link.
+
+        Args:
+            loads (dict): As returned by `link_loads`.
+            cap (int): Max. number of cells per link.
+
+        Returns:
+            dict: (tx, rx) -> list of (ts, ch).
+        """
+        # Same channel offsets as the contention free scheduler
+        max_ch = max(1, self.network.tsch_max_ch - 1)
+        # Deepest links first, then by node ID so the result is deterministic
+        links = sorted(loads, key=lambda link: (-loads[link][1], link))
+        busy = set()
+        ts_load = {}
+        # Last timeslot of the links that deliver to every node
+        last_rx_ts = {}
+        cells = {}
+        for tx, rx in links:
+            ts = last_rx_ts.get(tx, -1) + 1
+            link_cells = []
+            while len(link_cells) < min(loads[(tx, rx)][0], cap):
+                if (tx, ts) not in busy and (rx, ts) not in busy and ts_load.get(ts, 0) < max_ch:
+                    ch = ts_load.get(ts, 0)
+                    ts_load[ts] = ch + 1
+                    busy.add((tx, ts))
+                    busy.add((rx, ts))
+                    link_cells.append((ts, ch))
+                ts += 1
+            cells[(tx, rx)] = link_cells
+            last_rx_ts[rx] = max(last_rx_ts.get(rx, -1), link_cells[-1][0])
+        return cells
+
+    def run(self, path, current_sf_size):
+        logger.debug(
+            f"running traffic aware scheduler for sf size {current_sf_size}")
+        self.network.tsch_clear()
+        self.network.tsch_slotframe_size = current_sf_size
+        loads = self.link_loads(path)
+        cap = max((load for load, _ in loads.values()), default=1)
+        while True:
+            cells = self.cells(loads, cap)
+            last_ts = max((ts for link_cells in cells.values() for ts, _ in link_cells), default=0)
+            if last_ts < current_sf_size-1:
+                break
+            if cap == 1:
+                raise SlotframeFullError(current_sf_size)
+            cap //= 2
+            logger.debug(f"schedule does not fit, up to {cap} cells per link")
+        for (tx, rx), link_cells in cells.items():
+            tx_node = self.network.nodes_add(tx)
+            rx_node = self.network.nodes_add(rx)
+            logger.debug(f'link {tx_node.id}-{rx_node.id}: {len(link_cells)} cells')
+            for ts, ch in link_cells:
+                # Schedule Tx
+                tx_node.tsch_add_link(cell_type.UC_TX, ch, ts, rx_node.id)
+                # Schedule Rx
+                rx_node.tsch_add_link(cell_type.UC_RX, ch, ts)
+        # Print the schedule
+        self.network.tsch_print()
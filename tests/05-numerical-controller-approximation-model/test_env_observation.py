@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import os
+
+import numpy as np
+
+from sdwsn_controller.config import SDWSNControllerConfig, CONTROLLERS
+
+SELF_PATH = os.path.dirname(os.path.abspath(__file__))
+CONFIG_FILE = os.path.normpath(os.path.join(
+    SELF_PATH, "numerical_controller_approx_model.json"))
+
+
+def expected_observation(controller, max_slotframe_size):
+    state = controller.get_state()
+    metrics = controller.calculate_reward(
+        controller.alpha, controller.beta, controller.delta, state['current_sf_len'])
+    return np.array([
+        *state['user_requirements'],
+        metrics['power_normalized'],
+        metrics['delay_normalized'],
+        metrics['pdr_mean'],
+        state['last_ts_in_schedule']/max_slotframe_size,
+        state['current_sf_len']/max_slotframe_size
+    ], dtype=np.float32)
+
+
+def test_observation_buffer():
+    config = SDWSNControllerConfig.from_json_file(CONFIG_FILE)
+    controller = CONTROLLERS[config.controller_type](config)
+    env = controller.reinforcement_learning.env.unwrapped
+    obs, _ = env.reset(seed=0)
+    assert obs.dtype == np.float32
+    np.testing.assert_array_equal(obs, expected_observation(controller, env.max_slotframe_size))
+    calls = []
+    get_state = controller.get_state
+
+    def counted_get_state():
+        calls.append(1)
+        return get_state()
+
+    controller.get_state = counted_get_state
+    step_obs = None
+    for action in (0, 1, 2, 0, 0):
+        obs, _, _, _, _ = env.step(action)
+        # The state is read once per step
+        assert len(calls) == 1
+        np.testing.assert_array_equal(obs, expected_observation(controller, env.max_slotframe_size))
+        # Steps fill the same buffer
+        assert step_obs is None or obs is step_obs
+        step_obs = obs
+        calls.clear()
+    # Reset does not overwrite the observation of the last step
+    last_obs = step_obs.copy()
+    obs, _ = env.reset()
+    assert obs is not step_obs
+    np.testing.assert_array_equal(step_obs, last_obs)
@@ -0,0 +1,92 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import os
+
+import numpy as np
+import pytest
+from stable_baselines3 import PPO
+from stable_baselines3.common.vec_env import VecMonitor
+
+from sdwsn_controller.config import SDWSNControllerConfig, CONTROLLERS
+
+SELF_PATH = os.path.dirname(os.path.abspath(__file__))
+CONFIG_FILE = os.path.normpath(os.path.join(
+    SELF_PATH, "numerical_controller_approx_model.json"))
+
+
+def build_controller():
+    config = SDWSNControllerConfig.from_json_file(CONFIG_FILE)
+    return CONTROLLERS[config.controller_type](config)
+
+
+def test_vec_env_matches_env():
+    controller = build_controller()
+    env = controller.reinforcement_learning.env.unwrapped
+    vec_env = controller.vec_env(64, seed=0)
+    obs = vec_env.reset()
+    assert obs.shape == (64, 8) and obs.dtype == np.float32
+    assert np.all((vec_env.sf_len >= vec_env.last_ts + 5) & (vec_env.sf_len <= env.max_slotframe_size - 5))
+    rng = np.random.default_rng(1)
+    for _ in range(20):
+        state = (vec_env.user_requirements.copy(), vec_env.last_ts.copy(), vec_env.sf_len.copy())
+        actions = rng.integers(3, size=64)
+        obs, rewards, dones, infos = vec_env.step(actions)
+        for i in range(64):
+            # Same step on the scalar environment
+            controller.user_requirements = tuple(float(x) for x in state[0][i])
+            controller.last_tsch_link = int(state[1][i])
+            controller.current_slotframe_size = int(state[2][i])
+            env_obs, env_reward, terminated, _, _ = env.step(int(actions[i]))
+            assert rewards[i] == pytest.approx(env_reward, rel=1e-5)
+            if dones[i]:
+                assert terminated or vec_env.steps[i] == 0
+                if terminated:
+                    assert not infos[i]["TimeLimit.truncated"]
+                np.testing.assert_allclose(infos[i]["terminal_observation"], env_obs, rtol=1e-5)
+            else:
+                np.testing.assert_allclose(obs[i], env_obs, rtol=1e-5)
+
+
+def test_vec_env_truncation():
+    vec_env = build_controller().vec_env(8, seed=0)
+    vec_env.reset()
+    # Keeping the slotframe size never terminates an episode
+    for step in range(5):
+        _, _, dones, infos = vec_env.step(np.full(8, 2))
+    assert dones.all()
+    assert all(info["TimeLimit.truncated"] for info in infos)
+    assert (vec_env.steps == 0).all()
+
+
+def test_vec_env_sb3():
+    vec_env = VecMonitor(build_controller().vec_env(16, seed=0))
+    model = PPO("MlpPolicy", vec_env, n_steps=32, batch_size=64, n_epochs=1, verbose=0)
+    model.learn(total_timesteps=1024)
+    assert len(model.ep_info_buffer) > 0
+
+
+def test_vec_env_seed_and_methods():
+    vec_env = build_controller().vec_env(4)
+    assert vec_env.seed(3) == [3, 4, 5, 6]
+    first = vec_env.reset().copy()
+    vec_env.seed(3)
+    np.testing.assert_array_equal(vec_env.reset(), first)
+    calls = []
+    vec_env.count_call = lambda: calls.append(1) or len(calls)
+    # One call for all the environments
+    assert vec_env.env_method("count_call") == [1] * 4
+    assert vec_env.get_attr("max_slotframe_size", indices=[0, 2]) == [vec_env.max_slotframe_size] * 2
@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import socket
+import time
+import types
+
+from sdwsn_controller.sink_communication.framing import encode_frames
+from sdwsn_controller.sink_communication.sink_comm_asyncio import AsyncSinkComm
+
+
+class Consumer():
+    """ Stands in for the packet dissector """
+
+    def __init__(self):
+        self.frames = []
+
+    async def consume(self, queue):
+        while True:
+            self.frames.append(bytes(await queue.get()))
+
+
+def wait_for(condition, timeout=2.0):
+    start = time.time()
+    while not condition() and time.time() - start < timeout:
+        time.sleep(0.01)
+    return condition()
+
+
+def test_asyncio_socket_sink():
+    server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    server.bind(("127.0.0.1", 0))
+    server.listen(1)
+    config = types.SimpleNamespace(sink_comm=types.SimpleNamespace(
+        host_dev="127.0.0.1", port_baud=server.getsockname()[1]))
+    sink = AsyncSinkComm(config)
+    assert sink.connect() == 0
+    conn, _ = server.accept()
+
+    frames = [bytes([i]) * 10 + b'\x7e\x7d' for i in range(3)]
+    conn.sendall(encode_frames(frames))
+    assert [sink.recv(2.0) for _ in frames] == frames
+    assert sink.recv(0.1) is None
+
+    # Frames go straight to the consumer once attached
+    consumer = Consumer()
+    assert sink.attach(consumer)
+    conn.sendall(encode_frames(frames))
+    assert wait_for(lambda: len(consumer.frames) == len(frames))
+    assert consumer.frames == frames
+
+    sink.send(frames[0])
+    conn.settimeout(2.0)
+    assert conn.recv(100) == encode_frames(frames[:1])
+
+    sink.shutdown()
+    assert sink.ser is None
+    # Sending after the shutdown drops the frame
+    sink.send(frames[0])
+    conn.close()
+    server.close()
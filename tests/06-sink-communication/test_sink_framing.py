@@ -0,0 +1,178 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import io
+import random
+import socket
+import types
+
+from sdwsn_controller.sink_communication.framing import FrameDecoder, encode_frame, encode_frames
+from sdwsn_controller.sink_communication.sink_abc import ByteStreamMixin, SinkABC
+from sdwsn_controller.sink_communication.sink_comm import SinkComm
+
+
+class MemorySink(ByteStreamMixin, SinkABC):
+    """
+    Sink that reads from an in-memory stream. Useful to test the framing.
+    """
+
+    def __init__(self, stream=b'', chunk_size=4096):
+        self.stream = io.BytesIO(stream)
+        self.chunk_size = chunk_size
+        self.sent = bytearray()
+        super().__init__()
+
+    @property
+    def name(self):
+        return "Memory"
+
+    @property
+    def ser(self):
+        return None
+
+    def connect(self, **kwargs):
+        return 0
+
+    def read_byte(self):
+        return self.stream.read(1)
+
+    def read_chunk(self):
+        return self.stream.read(self.chunk_size)
+
+    def error_exception(self):
+        return OSError
+
+    def send_stream_bytes(self, stream_bytes):
+        self.sent.extend(stream_bytes)
+
+
+def byte_by_byte(stream):
+    """ Decode the stream using the one byte at a time state machine """
+    sink = MemorySink(stream)
+    frames = []
+    for _ in range(len(stream)):
+        result = sink._recv_internal()
+        if isinstance(result, tuple):
+            frames.append(bytes(result[0]))
+    return frames
+
+
+def chunked(stream, chunk_size):
+    decoder = FrameDecoder()
+    frames = []
+    for i in range(0, len(stream), chunk_size):
+        frames += [bytes(f) for f in decoder.feed(stream[i:i+chunk_size])]
+    return frames
+
+
+def random_stream(rng, num_frames):
+    # Bias the alphabet towards the special characters
+    alphabet = [0x7E, 0x7D, 0x5E, 0x5D, 0x20, 0x00, 0xFF, 0x41]
+    stream = bytearray()
+    for _ in range(num_frames):
+        size = rng.choice([0, 3, 6, 20, 124, 125, 200, 300])
+        stream.extend(rng.choice(alphabet) if rng.random() < 0.3
+                      else rng.randrange(256) for _ in range(size))
+        stream.append(0x7E)
+    return bytes(stream)
+
+
+def test_known_frames():
+    frame = bytes(range(0x70, 0x80))
+    escaped = frame.replace(b'\x7d', b'\x7d\x5d').replace(b'\x7e', b'\x7d\x5e')
+    stream = b'\x7e' + escaped + b'\x7e' + b'\x7e' + escaped + b'\x7e'
+    assert chunked(stream, 4096) == [frame, frame]
+    assert byte_by_byte(stream) == [frame, frame]
+
+
+def test_overflow_and_resync():
+    too_long = bytes(125)
+    stream = b'\x7e' + too_long + b'\x7e' + bytes(124) + b'\x7e'
+    # The oversized frame is dropped and the next one recovers the sync
+    assert chunked(stream, 7) == [bytes(124)]
+    assert byte_by_byte(stream) == [bytes(124)]
+
+
+def test_chunked_matches_byte_by_byte():
+    rng = random.Random(1234)
+    for _ in range(200):
+        stream = random_stream(rng, rng.randrange(1, 10))
+        expected = byte_by_byte(stream)
+        for chunk_size in (1, 2, 5, 64, 4096):
+            assert chunked(stream, chunk_size) == expected
+
+
+def test_sink_recv():
+    frame = bytes([1, 2, 3, 0x7E, 0x7D, 4, 5, 6])
+    escaped = frame.replace(b'\x7d', b'\x7d\x5d').replace(b'\x7e', b'\x7d\x5e')
+    sink = MemorySink((b'\x7e' + escaped + b'\x7e') * 3, chunk_size=5)
+    assert [sink.recv(1.0) for _ in range(3)] == [frame] * 3
+    # Nothing else to read
+    assert sink.recv(0.1) is None
+
+
+def test_send_round_trip():
+    rng = random.Random(4321)
+    packets = [bytes(rng.choice([0x7E, 0x7D, 0x20, rng.randrange(256)])
+                     for _ in range(rng.randrange(6, 125)))
+               for _ in range(100)]
+    sink = MemorySink()
+    for packet in packets:
+        sink.send(packet)
+    # One write for all of them
+    sink.send_many(packets)
+    assert bytes(sink.sent) == encode_frames(packets) * 2
+    assert byte_by_byte(bytes(sink.sent)) == packets * 2
+    assert chunked(bytes(sink.sent), 4096) == packets * 2
+
+
+def test_encode_frame():
+    assert encode_frame(b'\x01\x7e\x02\x7d\x03') == \
+        b'\x7e\x01\x7d\x5e\x02\x7d\x5d\x03\x7e'
+    assert encode_frame(b'\x7d\x5e') == b'\x7e\x7d\x5d\x5e\x7e'
+
+
+def test_empty_socket():
+    frame = bytes(range(1, 10))
+    # Stale frames and the beginning of another one
+    sink = MemorySink(encode_frames([frame, frame]) + b'\x7e\x01\x02', chunk_size=5)
+    sink.empty_socket()
+    assert sink.recv(0.1) is None
+    sink.stream = io.BytesIO(encode_frame(frame))
+    assert sink.recv(0.1) == frame
+
+
+def test_socket_empty_socket():
+    stale = bytes(range(1, 10))
+    fresh = bytes(range(20, 30))
+    config = types.SimpleNamespace(
+        sink_comm=types.SimpleNamespace(host_dev="127.0.0.1", port_baud=60001))
+    sink = SinkComm(config)
+    sink.ser, peer = socket.socketpair()
+    try:
+        peer.sendall(encode_frames([stale, stale]))
+        assert sink.recv(1.0) == stale
+        peer.sendall(encode_frame(stale) + b'\x7e\x01\x02')
+        # Pending bytes and decoded frames are dropped without blocking
+        sink.empty_socket()
+        assert not sink.frames
+        peer.sendall(encode_frame(fresh))
+        assert sink.recv(1.0) == fresh
+        # Nothing pending
+        sink.empty_socket()
+    finally:
+        peer.close()
+        sink.ser.close()
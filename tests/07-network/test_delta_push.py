@@ -0,0 +1,138 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import types
+
+from sdwsn_controller.network.network import Network
+from sdwsn_controller.packet.packet import SerialPacket, SDN_IPH_LEN, SDN_SAH_LEN, serial_protocol
+
+
+class RecordingSink():
+    """
+    Fake sink that records the control packets and acknowledges them right
+    away, unless `lose` is set.
+    """
+
+    def __init__(self):
+        self.network = None
+        self.lose = False
+        self.sent = []
+
+    def send(self, data):
+        self.sent.append(SerialPacket.unpack(data))
+        if self.lose:
+            return
+        ack = SerialPacket(b'', message_type=serial_protocol.ACK,
+                           reserved0=self.sent[-1].reserved0+1)
+        self.network.packet_dissector.handle_serial_packet(ack.pack())
+
+    def shutdown(self):
+        pass
+
+    def pop(self):
+        sent = self.sent
+        self.sent = []
+        return sent
+
+
+def build_network(num_nodes=30):
+    sink = RecordingSink()
+    config = types.SimpleNamespace(
+        network=types.SimpleNamespace(processing_window=200, control_window=1,
+                                      control_mtu=104, control_delta=True,
+                                      samples_window=None),
+        tsch=types.SimpleNamespace(max_channel=3, max_slotframe=70, slot_duration=10))
+    network = Network(config=config, socket=sink)
+    network.network_running = True
+    network.timeout = 0.01
+    sink.network = network
+    for node_id in range(1, num_nodes + 1):
+        network.nodes_add(node_id)
+    for node_id in range(2, num_nodes + 1):
+        node = network.nodes_get(node_id)
+        node.route_add(1, node_id // 2 if node_id > 3 else 1)
+        node.tsch_add_link(1, 0, node_id, dst=node_id // 2)
+    network.tsch_slotframe_size = 31
+    return network, sink
+
+
+def sa_header(serial_pkt):
+    # Payload length and slotframe size of the SA packet
+    sa = serial_pkt.payload[SDN_IPH_LEN:SDN_IPH_LEN + SDN_SAH_LEN]
+    return sa[0], sa[1]
+
+
+def test_routes_delta():
+    network, sink = build_network()
+    assert network.routes_sendall()
+    assert len(sink.pop()) == 3
+    # Nothing changed
+    assert network.routes_sendall()
+    assert sink.pop() == []
+    # One route changes its next hop, another one is added
+    network.nodes_get(5).route_clear()
+    network.nodes_get(5).route_add(1, 3)
+    network.nodes_get(2).route_add(4, 4)
+    assert network.routes_sendall()
+    sent = sink.pop()
+    assert len(sent) == 1
+    assert sent[0].payload_len == SDN_IPH_LEN + 6 + 2 * 6
+    # Removed routes force a full push, 28 routes left
+    network.nodes_get(2).route_clear()
+    assert network.routes_sendall()
+    assert len(sink.pop()) == 2
+
+
+def test_tsch_delta():
+    network, sink = build_network()
+    assert network.tsch_sendall()
+    sent = sink.pop()
+    assert len(sent) == 3
+    assert sa_header(sent[0])[1] == 31
+    # Same schedule and slotframe size
+    assert network.tsch_sendall()
+    assert sink.pop() == []
+    # Only the slotframe size changes
+    network.tsch_slotframe_size = 37
+    assert network.tsch_sendall()
+    sent = sink.pop()
+    assert len(sent) == 1
+    assert sa_header(sent[0]) == (0, 37)
+    # A new cell
+    network.nodes_get(1).tsch_add_link(2, 0, 40)
+    assert network.tsch_sendall()
+    sent = sink.pop()
+    assert len(sent) == 1
+    assert sa_header(sent[0]) == (8, 0)
+    # A removed cell forces a full push
+    network.nodes_get(1).tsch_clear()
+    assert network.tsch_sendall()
+    assert len(sink.pop()) == 3
+
+
+def test_unacknowledged_push():
+    network, sink = build_network()
+    sink.lose = True
+    assert not network.tsch_sendall()
+    assert network.tsch_acked is None
+    sink.lose = False
+    sink.pop()
+    # We do not know what the network has, so we push everything
+    assert network.tsch_sendall()
+    assert len(sink.pop()) == 3
+    # A restart of the network forgets the snapshot
+    network.stop()
+    assert network.tsch_acked is None and network.routes_acked is None
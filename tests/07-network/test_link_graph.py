@@ -0,0 +1,98 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import random
+import types
+
+from sdwsn_controller.network.network import Network
+from sdwsn_controller.routing.dijkstra import Dijkstra
+
+
+def build_network():
+    config = types.SimpleNamespace(
+        network=types.SimpleNamespace(processing_window=200, control_window=1,
+                                      control_mtu=104, control_delta=False,
+                                      samples_window=None),
+        tsch=types.SimpleNamespace(max_channel=3, max_slotframe=500, slot_duration=10))
+    network = Network(config=config, socket=None)
+    network.nodes_add(id=0, sid="1.1", rank=0)
+    return network
+
+
+def neighbor_edges(network):
+    # Neighbors without RSSI are not links
+    return {(node.id, nbr.neighbor_id): (-nbr.rssi, nbr.rssi, nbr.etx)
+            for node in network.nodes.values() for nbr in node.neighbors_get().values() if nbr.rssi != 0}
+
+
+def graph_edges(G):
+    return {(u, v): (d['weight'], d['rssi'], d['etx']) for u, v, d in G.edges(data=True)}
+
+
+def test_link_graph_follows_neighbor_tables():
+    network = build_network()
+    rng = random.Random(1)
+    # Sparse IDs, as in testbeds
+    ids = [1] + rng.sample(range(2, 5000), 30)
+    for node_id in ids:
+        network.nodes_add(node_id)
+    for _ in range(500):
+        node = network.nodes_get(rng.choice(ids))
+        if rng.random() < 0.9:
+            rssi = 0 if rng.random() < 0.1 else -rng.randrange(40, 95)
+            node.neighbor_add(rng.choice(ids), rssi, rng.randrange(1, 5))
+        else:
+            node.neighbors.clear()
+        G = network.links()
+        assert graph_edges(G) == neighbor_edges(network)
+        # No isolated nodes
+        assert all(G.degree(node_id) for node_id in G.nodes)
+    assert network.max_node_id > 1000
+    assert network.links().number_of_nodes() <= len(ids)
+    network.nodes_clear()
+    assert network.links().number_of_nodes() == 0
+
+
+def test_link_graph_routing():
+    network = build_network()
+    for node_id in (1, 200, 3000):
+        network.nodes_add(node_id)
+    network.nodes_get(200).neighbor_add(1, -40, 1)
+    network.nodes_get(3000).neighbor_add(200, -45, 1)
+    network.nodes_get(3000).neighbor_add(1, -95, 1)
+    path = Dijkstra(network).run(network.links())
+    assert path == {200: [200, 1], 3000: [3000, 200, 1]}
+    # The link to the sink improves with the next NA packet
+    network.nodes_get(3000).neighbor_add(1, -50, 1)
+    path = Dijkstra(network).run(network.links())
+    assert path[3000] == [3000, 1]
+
+
+def test_links_snapshot():
+    network = build_network()
+    network.nodes_add(1)
+    network.nodes_add(2)
+    network.nodes_get(2).neighbor_add(1, -40, 1)
+    G = network.links()
+    # Later NA packets do not change the graph the routers are using
+    network.nodes_get(2).neighbor_add(1, -60, 1)
+    network.nodes_get(1).neighbor_add(2, -60, 1)
+    assert graph_edges(G) == {(2, 1): (40, -40, 1)}
+    # A neighbor without RSSI removes the link
+    network.nodes_get(2).neighbor_add(1, 0, 1)
+    assert graph_edges(network.links()) == {(1, 2): (60, -60, 1)}
+    network.nodes_get(1).neighbor_add(2, 0, 1)
+    assert network.links().number_of_nodes() == 0
@@ -0,0 +1,71 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import types
+
+import pytest
+
+from sdwsn_controller.common import common
+from sdwsn_controller.network.network import Network
+from sdwsn_controller.packet.packet import Cell_Packet_Payload, RA_Packet_Payload
+from sdwsn_controller.packet.packet import SDN_RA_ENTRY_LEN, SDN_SA_ENTRY_LEN
+
+
+def build_network(num_nodes, control_mtu=104):
+    config = types.SimpleNamespace(
+        network=types.SimpleNamespace(processing_window=200, control_window=1,
+                                      control_mtu=control_mtu, control_delta=False,
+                                      samples_window=None),
+        tsch=types.SimpleNamespace(max_channel=3, max_slotframe=70, slot_duration=10))
+    network = Network(config=config, socket=None)
+    for node_id in range(1, num_nodes + 1):
+        network.nodes_add(node_id)
+    for node_id in range(2, num_nodes + 1):
+        node = network.nodes_get(node_id)
+        node.route_add(1, node_id // 2 if node_id > 3 else 1)
+        node.tsch_add_link(1, 0, node_id, dst=node_id // 2)
+    return network
+
+
+def test_entry_sizes():
+    assert len(RA_Packet_Payload(src='1.0', dst='2.0', via='3.0', payload=None).pack()) == SDN_RA_ENTRY_LEN
+    assert len(Cell_Packet_Payload(payload=None, type=1, channel=2, timeslot=3, scr=4,
+                                   dst=5).pack()) == SDN_SA_ENTRY_LEN
+
+
+def test_packetize():
+    entries = [bytes([i] * 6) for i in range(30)]
+    payloads = common.packetize(entries, 88)
+    assert [len(payload) for payload in payloads] == [84, 84, 12]
+    assert b''.join(payloads) == b''.join(entries)
+    assert common.packetize([], 88) == []
+    with pytest.raises(ValueError):
+        common.packetize(entries, 5)
+
+
+@pytest.mark.parametrize('control_mtu', [40, 104, 116])
+def test_payloads_fill_the_mtu(control_mtu):
+    network = build_network(50, control_mtu=control_mtu)
+    for payloads, header_len, entry_len, num_entries in (
+            (network.routes_payloads(), 16, SDN_RA_ENTRY_LEN, 49),
+            (network.tsch_payloads(), 16, SDN_SA_ENTRY_LEN, 49)):
+        max_payload_len = control_mtu - header_len
+        assert all(header_len + len(payload) <= control_mtu for payload in payloads)
+        # Every packet but the last one is full
+        assert all(len(payload) + entry_len > max_payload_len for payload in payloads[:-1])
+        assert sum(len(payload) for payload in payloads) == num_entries * entry_len
+        per_pkt = max_payload_len // entry_len
+        assert len(payloads) == -(-num_entries // per_pkt)
@@ -0,0 +1,163 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import threading
+import time
+import types
+
+from sdwsn_controller.network.network import Network
+from sdwsn_controller.network.rtt_estimator import RTTEstimator
+from sdwsn_controller.packet.packet import SerialPacket, serial_protocol
+
+
+class AckingSink():
+    """
+    Fake sink that acknowledges every control packet after `delay` seconds,
+    except the first `drop` ones and those whose reserved0 is in `lost`.
+    """
+
+    def __init__(self, delay=0.01, drop=0, lost=()):
+        self.network = None
+        self.delay = delay
+        self.drop = drop
+        self.lost = set(lost)
+        self.sent = []
+        # Number of packets of every send_many write
+        self.writes = []
+
+    def send_many(self, packets):
+        self.writes.append(len(packets))
+        for data in packets:
+            self.send(data)
+
+    def send(self, data):
+        self.sent.append(data)
+        if self.drop > 0:
+            self.drop -= 1
+            return
+        serial_pkt = SerialPacket.unpack(data)
+        if serial_pkt.reserved0 in self.lost:
+            return
+        ack = SerialPacket(b'', message_type=serial_protocol.ACK,
+                           reserved0=serial_pkt.reserved0+1)
+        threading.Timer(self.delay, self.network.packet_dissector.handle_serial_packet,
+                        args=(ack.pack(),)).start()
+
+
+def build_network(sink, control_window=1):
+    config = types.SimpleNamespace(
+        network=types.SimpleNamespace(processing_window=200,
+                                      control_window=control_window,
+                                      control_mtu=104, control_delta=False,
+                                      samples_window=None),
+        tsch=types.SimpleNamespace(max_channel=3, max_slotframe=70, slot_duration=10))
+    network = Network(config=config, socket=sink)
+    network.network_running = True
+    sink.network = network
+    return network
+
+
+def build_packet(reserved0):
+    return SerialPacket(bytes(20), message_type=2, payload_len=20,
+                        reserved0=reserved0).pack()
+
+
+def test_ack_ends_the_wait():
+    sink = AckingSink(delay=0.01)
+    network = build_network(sink)
+    start = time.monotonic()
+    for reserved0 in range(1, 21):
+        assert network.reliable_send(build_packet(reserved0), reserved0+1)
+    # 20 packets used to take 20 x 1.2 s
+    assert time.monotonic() - start < 2
+    assert len(sink.sent) == 20
+    assert network.rtt_estimator.rto < network.timeout
+
+
+def test_retransmission():
+    sink = AckingSink(delay=0.01, drop=2)
+    network = build_network(sink)
+    network.timeout = 0.1
+    assert network.reliable_send(build_packet(7), 8)
+    assert len(sink.sent) == 3
+    # The ACK never comes back
+    network.timeout = 0.05
+    sink.drop = 7
+    assert not network.reliable_send(build_packet(9), 10)
+    assert network.packet_dissector.ack_events == {}
+
+
+def test_window():
+    # The first two packets are lost once, only them are retransmitted
+    sink = AckingSink(delay=0.05, drop=2)
+    network = build_network(sink, control_window=4)
+    network.timeout = 0.2
+    packets = [(build_packet(reserved0), reserved0+1) for reserved0 in range(1, 9)]
+    start = time.monotonic()
+    assert network.reliable_send_window(packets) == [True] * 8
+    assert len(sink.sent) == 10
+    assert [SerialPacket.unpack(data).reserved0 for data in sink.sent[8:]] == [1, 2]
+    # The packets that fill the window go in a single write
+    assert sink.writes[0] == 4
+    # Stop-and-wait would take at least 8 x 0.05 s plus the two timeouts
+    assert time.monotonic() - start < 0.6
+    assert network.packet_dissector.ack_events == {}
+
+
+def test_window_backoff_once_per_round():
+    # The whole window is lost once, that is a single loss event
+    sink = AckingSink(delay=0.01, drop=4)
+    network = build_network(sink, control_window=4)
+    network.timeout = 0.2
+    packets = [(build_packet(reserved0), reserved0+1) for reserved0 in range(1, 5)]
+    assert network.reliable_send_window(packets) == [True] * 4
+    assert len(sink.sent) == 8
+    assert sink.writes == [4, 4]
+    # Doubled once, and no RTT samples from the retransmissions
+    assert network.rtt_estimator.rto == 0.4
+
+
+def test_window_failures():
+    sink = AckingSink(delay=0.01, lost=[3])
+    network = build_network(sink, control_window=3)
+    network.timeout = 0.05
+    packets = [(build_packet(reserved0), reserved0+1) for reserved0 in range(1, 6)]
+    assert network.reliable_send_window(packets) == [True, True, False, True, True]
+    assert network.control_pkt_results == [True, True, False, True, True]
+    # Packet 3 is sent rtx_limit times, the others only once
+    assert len(sink.sent) == 4 + 7
+    assert network.packet_dissector.ack_events == {}
+
+
+def test_next_reserved0():
+    network = build_network(AckingSink())
+    tokens = [network.next_reserved0() for _ in range(300)]
+    assert min(tokens) == 1 and max(tokens) == 253
+    assert len(set(tokens[:253])) == 253
+
+
+def test_rtt_estimator():
+    estimator = RTTEstimator(1.2)
+    assert estimator.rto == 1.2
+    for _ in range(50):
+        estimator.update(0.05)
+    assert abs(estimator.srtt - 0.05) < 1e-3
+    assert estimator.rto == estimator.min_rto
+    estimator.backoff()
+    assert estimator.rto == 2 * estimator.min_rto
+    for _ in range(10):
+        estimator.backoff()
+    assert estimator.rto == estimator.max_rto
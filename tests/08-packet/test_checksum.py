@@ -0,0 +1,63 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import random
+import struct
+
+from sdwsn_controller.packet.packet import chksum, chksum_update, sdn_ip_checksum
+
+
+def reference_chksum(data):
+    # Word by word, as in RFC 1071
+    if len(data) % 2:
+        data += b'\x00'
+    total = sum(struct.unpack(f'!{len(data) // 2}H', data))
+    while total >> 16:
+        total = (total & 0xffff) + (total >> 16)
+    return ~total & 0xffff
+
+
+def test_chksum():
+    rng = random.Random(0)
+    buffers = [b'', bytes(10), b'\xff' * 10, b'\xff' * 11, b'\x12'] + [
+        bytes(rng.randrange(256) for _ in range(rng.randrange(1, 130))) for _ in range(500)]
+    for data in buffers:
+        assert chksum(0, data, len(data)) == reference_chksum(data)
+        # Only the first `len` bytes count
+        assert chksum(0, data + b'\xaa\xbb', len(data)) == reference_chksum(data)
+
+
+def test_validation():
+    header = bytearray(struct.pack('!BBBBHHH', 0x22, 40, 0x40, 0, 0, 0x0302, 0x0101))
+    struct.pack_into('!H', header, 4, sdn_ip_checksum(header, 10))
+    assert sdn_ip_checksum(header, 10) == 0xffff
+    header[1] ^= 0x01
+    assert sdn_ip_checksum(header, 10) != 0xffff
+
+
+def test_chksum_update():
+    rng = random.Random(1)
+    for _ in range(500):
+        data = bytearray(rng.randrange(256) for _ in range(2 * rng.randrange(1, 60)))
+        before = chksum(0, data, len(data))
+        offset = 2 * rng.randrange(len(data) // 2)
+        old_word, = struct.unpack_from('!H', data, offset)
+        new_word = rng.randrange(0x10000)
+        struct.pack_into('!H', data, offset, new_word)
+        after = chksum(0, data, len(data))
+        updated = chksum_update(before, old_word, new_word)
+        # 0x0000 and 0xffff are both zero in ones' complement
+        assert updated == after or {updated, after} == {0, 0xffff}
@@ -0,0 +1,74 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import struct
+
+from sdwsn_controller.packet.packet import (
+    Cell_Packet, Cell_Packet_Payload, Data_Packet, NA_Packet, NA_Packet_Payload, RA_Packet, RA_Packet_Payload,
+    SDN_IP_Packet, SerialPacket, addrConversion, sdn_ip_checksum)
+
+
+def test_serial_packet():
+    payload = bytes(range(40))
+    packed = SerialPacket(payload, addr=0, message_type=2, payload_len=40,
+                          reserved0=9, reserved1=0).pack()
+    # Same bytes as packing the header twice with a format string
+    data = struct.pack('!HHBBBB40s', 0, 0, 2, 40, 9, 0, payload)
+    chksum = sdn_ip_checksum(data, 48)
+    assert packed == struct.pack('!HHBBBB40s', 0, chksum, 2, 40, 9, 0, payload)
+    pkt = SerialPacket.unpack(packed)
+    assert (pkt.message_type, pkt.payload_len, pkt.reserved0) == (2, 40, 9)
+    # The payload is not copied
+    assert isinstance(pkt.payload, memoryview)
+    assert pkt.payload == payload
+
+
+def test_sdn_ip_packet():
+    packed = SDN_IP_Packet(b'\x01\x02', vap=0x22, tlen=12, ttl=0x40, scr=0x0302, dest=0x0101).pack()
+    assert sdn_ip_checksum(packed, 10) == 0xffff
+    pkt = SDN_IP_Packet.unpack(packed)
+    assert (pkt.vap, pkt.tlen, pkt.scr, pkt.scrStr, pkt.destStr) == (0x22, 12, 0x0302, '2.3', '1.1')
+    assert bytes(pkt.payload) == b'\x01\x02'
+
+
+def test_ra_and_sa_packets():
+    entry = RA_Packet_Payload(src='2.0', dst='3.0', via='1.0', payload=None).pack()
+    assert entry == b'\x00\x02\x00\x03\x00\x01'
+    packed = RA_Packet(entry * 2, payload_len=12, seq=7).pack()
+    assert sdn_ip_checksum(packed, 18) == 0xffff
+    pkt = RA_Packet.unpack(packed, len(packed))
+    assert (pkt.payload_len, pkt.seq) == (12, 7)
+    assert pkt.payload == entry * 2
+    cell = Cell_Packet_Payload(payload=None, type=1, channel=2, timeslot=3, scr=4, dst=None).pack()
+    assert cell == b'\x01\x02\x03\x00\x00\x04\x00\x00'
+    packed = Cell_Packet(cell, payload_len=8, sf_len=31, seq=7).pack()
+    assert sdn_ip_checksum(packed, 14) == 0xffff
+
+
+def test_na_and_data_packets():
+    neighbors = struct.pack('!HhHHhH', 0x0002, -70, 128, 0x0003, -80, 256)
+    packed = struct.pack('!BBHHBBH', 12, 3, 100, 5, 1, 0, 0) + neighbors
+    pkt = NA_Packet.unpack(packed, len(packed))
+    assert (pkt.payload_len, pkt.rank, pkt.energy, pkt.cycle_seq, pkt.seq) == (12, 3, 100, 5, 1)
+    nbr = NA_Packet_Payload.unpack(pkt.payload, 6)
+    assert (nbr.addr, nbr.addrStr, nbr.rssi, nbr.etx) == (3, '3.0', -80, 256)
+    data = Data_Packet.unpack(struct.pack('!HBBBBHHB', 5, 1, 2, 3, 4, 6, 7, 8))
+    assert (data.cycle_seq, data.seq, data.asn) == (5, 1, (8 << 32) | (7 << 16) | 6)
+
+
+def test_addr_conversion():
+    assert addrConversion.to_int('5.1').addr == b'\x01\x05'
+    assert addrConversion.to_string(0x0105).addrStr == '5.1'
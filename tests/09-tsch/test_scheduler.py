@@ -0,0 +1,203 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import random
+import types
+
+import pytest
+
+from sdwsn_controller.config import CONTROLLERS
+from sdwsn_controller.exceptions import SlotframeFullError
+from sdwsn_controller.network.network import Network
+from sdwsn_controller.tsch.contention_free_scheduler import ContentionFreeScheduler
+from sdwsn_controller.tsch.graph_colouring_scheduler import GraphColouringScheduler
+from sdwsn_controller.tsch.traffic_aware_scheduler import TrafficAwareScheduler
+
+
+def build_network():
+    config = types.SimpleNamespace(
+        network=types.SimpleNamespace(processing_window=200, control_window=1,
+                                      control_mtu=104, control_delta=False,
+                                      samples_window=None),
+        tsch=types.SimpleNamespace(max_channel=3, max_slotframe=500, slot_duration=10))
+    return Network(config=config, socket=None)
+
+
+def tree_paths(num_nodes):
+    # Path of every node to the sink (node 1) in a binary tree
+    paths = {}
+    for node_id in range(1, num_nodes + 1):
+        path = [node_id]
+        while path[-1] != 1:
+            path.append(path[-1] // 2)
+        paths[node_id] = path
+    return paths
+
+
+def brute_force_free(network, ts):
+    return all(sch.ts != ts for node in network.nodes.values() for sch in node.tsch_get().values())
+
+
+def test_occupancy_index():
+    network = build_network()
+    rng = random.Random(0)
+    for node_id in range(1, 20):
+        network.nodes_add(node_id)
+    for _ in range(200):
+        node = network.nodes_get(rng.randrange(1, 20))
+        ts, ch = rng.randrange(30), rng.randrange(3)
+        if rng.random() < 0.6:
+            node.tsch_add_link(1, ch, ts, dst=rng.choice([1, 2, None]))
+        else:
+            node.tsch_schedules.remove_tsch_schedule(ch, ts)
+        if rng.random() < 0.05:
+            node.tsch_clear()
+        for ts in range(30):
+            assert network.tsch_timeslot_free(ts) == brute_force_free(network, ts)
+            assert node.tsch_timeslot_free(ts) == all(sch.ts != ts for sch in node.tsch_get().values())
+        cells = [sch for node in network.nodes.values() for sch in node.tsch_get().values()]
+        assert network.tsch_last_ts() == max((sch.ts for sch in cells), default=0)
+        assert network.tsch_last_ch() == max((sch.ch for sch in cells), default=0)
+        assert node.tsch_last_ts() == max((sch.ts for sch in node.tsch_get().values()), default=0)
+        assert node.tsch_link_exists(1) == any(sch.dst_id == 1 for sch in node.tsch_get().values())
+    network.tsch_clear()
+    assert network.tsch_free_timeslots(30) == list(range(30))
+    network.nodes_get(3).tsch_add_link(1, 0, 4, dst=1)
+    network.nodes_clear()
+    assert network.tsch_timeslot_free(4)
+
+
+def test_contention_free_scheduler():
+    network = build_network()
+    scheduler = ContentionFreeScheduler(network)
+    scheduler.run(tree_paths(40), 47)
+    tx_timeslots = [sch.ts for node in network.nodes.values()
+                    for sch in node.tsch_get().values() if sch.schedule_type == 1]
+    # One link per node but the sink, each in its own timeslot
+    assert len(tx_timeslots) == 39
+    assert len(set(tx_timeslots)) == 39
+    assert max(tx_timeslots) < 46
+
+
+def test_slotframe_full():
+    network = build_network()
+    scheduler = ContentionFreeScheduler(network)
+    with pytest.raises(SlotframeFullError):
+        scheduler.run(tree_paths(40), 20)
+
+
+def test_compute_tsch_schedule_slotframe_full():
+    network = build_network()
+    controller = types.SimpleNamespace(tsch_scheduler=ContentionFreeScheduler(network))
+    compute_tsch_schedule = CONTROLLERS["native controller"].compute_tsch_schedule
+    # The error does not escape the controller
+    assert not compute_tsch_schedule(controller, tree_paths(40), 20)
+    assert compute_tsch_schedule(controller, tree_paths(40), 47)
+
+
+def cells_of(network):
+    return sorted((node.id, sch.schedule_type, sch.ts, sch.ch, sch.dst_id)
+                  for node in network.nodes.values() for sch in node.tsch_get().values())
+
+
+@pytest.mark.parametrize('num_nodes', [10, 40, 120])
+def test_graph_colouring_scheduler(num_nodes):
+    network = build_network()
+    GraphColouringScheduler(network).run(tree_paths(num_nodes), 200)
+    busy = set()
+    per_ts = {}
+    for node in network.nodes.values():
+        for sch in node.tsch_get().values():
+            # Half-duplex: one cell per node and timeslot
+            assert (node.id, sch.ts) not in busy
+            busy.add((node.id, sch.ts))
+            if sch.schedule_type == 1:
+                per_ts.setdefault(sch.ts, set()).add(sch.ch)
+    assert sum(len(chs) for chs in per_ts.values()) == num_nodes - 1
+    # Same channel offsets as the contention free scheduler
+    assert all(ch < network.tsch_max_ch - 1 for chs in per_ts.values() for ch in chs)
+    # Nodes have up to three links (two children and their parent) and a
+    # timeslot fits up to two links, one per channel offset
+    assert network.tsch_last_ts() + 1 == max(3, -(-(num_nodes - 1) // 2))
+    # Same schedule whatever the order of the paths
+    other = build_network()
+    GraphColouringScheduler(other).run(dict(reversed(list(tree_paths(num_nodes).items()))), 200)
+    assert cells_of(other) == cells_of(network)
+
+
+def test_graph_colouring_scheduler_chain_and_star():
+    network = build_network()
+    chain = {node_id: list(range(node_id, 0, -1)) for node_id in range(1, 8)}
+    GraphColouringScheduler(network).run(chain, 20)
+    # Two channel offsets for the six links
+    assert network.tsch_last_ts() == 2
+    star = {node_id: [node_id, 1] for node_id in range(2, 8)}
+    GraphColouringScheduler(network).run(star, 20)
+    assert network.tsch_last_ts() == 5
+    with pytest.raises(SlotframeFullError):
+        GraphColouringScheduler(network).run(star, 6)
+
+
+def tx_cells(network):
+    cells = {}
+    for node in network.nodes.values():
+        for sch in node.tsch_get().values():
+            if sch.schedule_type == 1:
+                cells.setdefault((node.id, sch.dst_id), []).append(sch.ts)
+    return cells
+
+
+@pytest.mark.parametrize('num_nodes', [10, 40])
+def test_traffic_aware_scheduler(num_nodes):
+    network = build_network()
+    paths = tree_paths(num_nodes)
+    TrafficAwareScheduler(network).run(paths, 200)
+    busy = set()
+    for node in network.nodes.values():
+        for sch in node.tsch_get().values():
+            assert (node.id, sch.ts) not in busy
+            busy.add((node.id, sch.ts))
+            # Same channel offsets as the contention free scheduler
+            assert sch.ch < network.tsch_max_ch - 1
+    cells = tx_cells(network)
+    for (tx, rx), timeslots in cells.items():
+        # One cell per node in the subtree of the Tx node
+        assert len(timeslots) == sum(tx in path for path in paths.values())
+        # Cascading: the cells of a link follow those of its children
+        for child in (2 * tx, 2 * tx + 1):
+            if (child, tx) in cells:
+                assert max(cells[(child, tx)]) < min(timeslots)
+    # A packet of every node reaches the sink within one slotframe
+    assert network.tsch_last_ts() < 200
+    other = build_network()
+    TrafficAwareScheduler(other).run(dict(reversed(list(paths.items()))), 200)
+    assert cells_of(other) == cells_of(network)
+
+
+def test_traffic_aware_scheduler_cap():
+    network = build_network()
+    star = {node_id: [node_id, 2, 1] for node_id in range(3, 8)}
+    star[2] = [2, 1]
+    TrafficAwareScheduler(network).run(star, 20)
+    cells = tx_cells(network)
+    assert len(cells[(2, 1)]) == 6
+    # The sink link does not fit with 6 cells, so links get up to 3 cells
+    TrafficAwareScheduler(network).run(star, 10)
+    cells = tx_cells(network)
+    assert len(cells[(2, 1)]) == 3
+    assert all(len(timeslots) == 1 for link, timeslots in cells.items() if link != (2, 1))
+    with pytest.raises(SlotframeFullError):
+        TrafficAwareScheduler(network).run(star, 6)
@@ -0,0 +1,48 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import numpy as np
+
+from sdwsn_controller.common import common
+from sdwsn_controller.tsch.slotframe_sizes import SlotframeSizes
+
+
+def test_same_sizes_as_coprime_search():
+    sizes = SlotframeSizes(70)
+    for size in range(sizes.limit + 20):
+        if size < sizes.limit + 1:
+            assert sizes.previous(size) == common.previous_coprime(size)
+        assert sizes.next(size) == common.next_coprime(size)
+    assert all(common.compare_coprime(int(size)) for size in sizes.sizes)
+
+
+def test_array_lookup():
+    sizes = SlotframeSizes(70)
+    sf_len = np.arange(sizes.limit)
+    assert np.array_equal(sizes.next(sf_len), [common.next_coprime(int(size)) for size in sf_len])
+    assert np.array_equal(sizes.previous(sf_len), [common.previous_coprime(int(size)) for size in sf_len])
+
+
+def test_custom_orchestra_sizes():
+    orchestra = (7, 11)
+    sizes = SlotframeSizes(100, orchestra)
+    assert sizes.limit == 101
+    assert sizes.next(6) == 8
+    assert sizes.previous(8) == 6
+    assert sizes.next(21) == 23
+    for size in range(sizes.limit + 1):
+        assert sizes.next(size) == common.next_coprime(size, orchestra)
+        assert sizes.previous(size) == common.previous_coprime(size, orchestra)
@@ -0,0 +1,219 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import random
+import types
+
+import networkx as nx
+import pytest
+
+from sdwsn_controller.network.network import Network
+from sdwsn_controller.config import ROUTING_ALGO
+from sdwsn_controller.config.routing import ROUTINGConfig
+from sdwsn_controller.routing.dijkstra import Dijkstra
+from sdwsn_controller.routing.energy_aware import EnergyAwareRouter
+from sdwsn_controller.routing.etx import ETXRouter
+from sdwsn_controller.routing.hop_count import HopCountRouter
+from sdwsn_controller.routing.route_stabiliser import RouteStabiliser
+
+
+def build_network():
+    config = types.SimpleNamespace(
+        network=types.SimpleNamespace(processing_window=200, control_window=1,
+                                      control_mtu=104, control_delta=False,
+                                      samples_window=None),
+        tsch=types.SimpleNamespace(max_channel=3, max_slotframe=500, slot_duration=10))
+    network = Network(config=config, socket=None)
+    # The dissector adds the controller as node 0 with the first NA packet
+    network.nodes_add(id=0, sid="1.1", rank=0)
+    return network
+
+
+def random_topology(network, num_nodes, seed):
+    # Random geometric-like topology; every node hears, at least, the one
+    # before it so that the network is connected.
+    rng = random.Random(seed)
+    for node_id in range(1, num_nodes + 1):
+        network.nodes_add(node_id)
+    for node_id in range(2, num_nodes + 1):
+        neighbors = {node_id - 1} | {rng.randrange(1, num_nodes + 1) for _ in range(3)}
+        for nbr in neighbors - {node_id}:
+            rssi = -rng.randrange(40, 95)
+            network.nodes_get(node_id).neighbor_add(nbr, rssi, 1)
+            network.nodes_get(nbr).neighbor_add(node_id, rssi, 1)
+
+
+def path_cost(G, path):
+    return sum(G[u][v]['weight'] for u, v in zip(path, path[1:]))
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_dijkstra_tree(seed):
+    network = build_network()
+    random_topology(network, 60, seed)
+    G = network.links()
+    path = Dijkstra(network).run(G)
+    assert set(path) == set(G.nodes) - {1}
+    for node_id, node_path in path.items():
+        assert node_path[0] == node_id and node_path[-1] == 1
+        # Same cost as the shortest path from the node itself
+        expected = nx.dijkstra_path(G, node_id, 1, weight='weight')
+        assert path_cost(G, node_path) == pytest.approx(path_cost(G, expected))
+        assert network.nodes_get(node_id).routes_get()[0].nexthop_id == node_path[1]
+
+
+def test_dijkstra_unreachable():
+    network = build_network()
+    for node_id in range(1, 5):
+        network.nodes_add(node_id)
+    network.nodes_get(2).neighbor_add(1, -50, 1)
+    network.nodes_get(3).neighbor_add(4, -50, 1)
+    path = Dijkstra(network).run(network.links())
+    assert path == {2: [2, 1]}
+    assert not network.nodes_get(3).routes_get()
+
+
+def diamond(network):
+    # 4 reaches the sink through 2 (strong but lossy links) or 3 (weak but
+    # reliable links)
+    for node_id in range(1, 5):
+        network.nodes_add(node_id)
+    network.nodes_get(2).neighbor_add(1, -40, 4)
+    network.nodes_get(3).neighbor_add(1, -80, 1)
+    network.nodes_get(4).neighbor_add(2, -40, 4)
+    network.nodes_get(4).neighbor_add(3, -80, 1)
+    network.nodes_get(4).neighbor_add(1, -95, 9)
+
+
+def test_routers():
+    network = build_network()
+    diamond(network)
+    G = network.links()
+    assert Dijkstra(network).run(G)[4] == [4, 2, 1]
+    assert ETXRouter(network).run(G)[4] == [4, 3, 1]
+    assert network.nodes_get(4).routes_get()[0].nexthop_id == 3
+    assert HopCountRouter(network).run(G)[4] == [4, 1]
+    assert set(ROUTING_ALGO) >= {"Dijkstra", "ETX", "Hop Count", "Energy Aware"}
+
+
+def test_etx_router_unknown_etx():
+    network = build_network()
+    for node_id in range(1, 5):
+        network.nodes_add(node_id)
+    # Contiki-NG fixed point ETX, the direct link of 3 is not measured yet
+    network.nodes_get(2).neighbor_add(1, -60, 128)
+    network.nodes_get(3).neighbor_add(2, -60, 128)
+    network.nodes_get(3).neighbor_add(1, -60, 0)
+    network.nodes_get(4).neighbor_add(1, -60, 300)
+    router = ETXRouter(network)
+    # The unmeasured link costs as much as the worst one (300)
+    assert router.run(network.links())[3] == [3, 2, 1]
+    network.nodes_get(4).neighbor_add(1, -60, 200)
+    assert router.run(network.links())[3] == [3, 1]
+
+
+def test_energy_aware_router():
+    network = build_network()
+    diamond(network)
+    network.nodes_get(4).neighbors.clear()
+    network.nodes_get(4).neighbor_add(2, -40, 1)
+    network.nodes_get(4).neighbor_add(3, -40, 1)
+    router = EnergyAwareRouter(network)
+    network.nodes_get(2).energy_add(1, 100)
+    network.nodes_get(3).energy_add(1, 50)
+    assert router.run(network.links())[4] == [4, 3, 1]
+    network.nodes_get(3).energy_add(2, 200)
+    assert router.run(network.links())[4] == [4, 2, 1]
+
+
+def test_route_stabiliser_energy_aware():
+    network = build_network()
+    diamond(network)
+    network.nodes_get(4).neighbors.clear()
+    network.nodes_get(4).neighbor_add(2, -40, 1)
+    network.nodes_get(4).neighbor_add(3, -40, 1)
+    network.nodes_get(2).energy_add(1, 100)
+    network.nodes_get(3).energy_add(1, 1)
+    # The stabiliser has to route on the energy of the relays too
+    router = RouteStabiliser(EnergyAwareRouter(network), margin=0.1)
+    assert router.run(network.links())[4] == [4, 3, 1]
+
+
+def test_router_cache():
+    network = build_network()
+    random_topology(network, 30, 0)
+    router = ETXRouter(network)
+    paths = router.shortest_paths(network.links())
+    assert router.shortest_paths(network.links()) is paths
+    # Routes are installed again even if the tree is cached
+    router.run(network.links())
+    assert all(network.nodes_get(node_id).routes_get() for node_id in paths)
+    network.nodes_get(2).neighbor_add(1, -50, 3)
+    assert router.shortest_paths(network.links()) is not paths
+
+
+def test_route_stabiliser():
+    network = build_network()
+    diamond(network)
+    network.nodes_get(4).neighbors.clear()
+    network.nodes_get(4).neighbor_add(2, -50, 1)
+    network.nodes_get(4).neighbor_add(3, -52, 1)
+    network.nodes_get(3).neighbor_add(1, -40, 1)
+    router = RouteStabiliser(Dijkstra(network), margin=0.1)
+    assert router.run(network.links())[4] == [4, 2, 1]
+    # Jitter: 3 is now slightly better, but not by 10%
+    network.nodes_get(4).neighbor_add(3, -48, 1)
+    assert router.run(network.links())[4] == [4, 2, 1]
+    assert network.nodes_get(4).routes_get()[0].nexthop_id == 2
+    assert router.stats_route_suppressed == 1
+    # 3 is much better now
+    network.nodes_get(4).neighbor_add(3, -40, 1)
+    assert router.run(network.links())[4] == [4, 3, 1]
+    assert router.stats_route_suppressed == 1
+    # The parent is gone, even if the alternative is worse
+    network.nodes_get(4).neighbors.clear()
+    network.nodes_get(4).neighbor_add(2, -60, 1)
+    assert router.run(network.links())[4] == [4, 2, 1]
+    # 2, 3 and 4 joined, then 4 changed its parent twice
+    assert router.stats_route_changes == 5
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_route_stabiliser_jitter(seed):
+    network = build_network()
+    random_topology(network, 60, seed)
+    router = RouteStabiliser(Dijkstra(network), margin=0.2)
+    rng = random.Random(seed)
+    router.run(network.links())
+    changes = router.stats_route_changes
+    for _ in range(20):
+        for node in network.nodes.values():
+            for nbr in list(node.neighbors_get().values()):
+                node.neighbor_add(nbr.neighbor_id, nbr.rssi + rng.choice((-1, 0, 1)), 1)
+        G = network.links()
+        path = router.run(G)
+        # Always a tree of existing links that reaches the sink
+        assert set(path) == set(G.nodes) - {1}
+        for node_path in path.values():
+            assert node_path[-1] == 1 and len(set(node_path)) == len(node_path)
+            assert all(G.has_edge(u, v) for u, v in zip(node_path, node_path[1:]))
+    assert router.stats_route_suppressed > 0
+    assert router.stats_route_changes - changes < router.stats_route_suppressed
+
+
+def test_routing_config():
+    assert ROUTINGConfig.from_json({"algo": "ETX"}).hysteresis is None
+    assert ROUTINGConfig.from_json({"algo": "ETX", "hysteresis": 0.2}).hysteresis == 0.2
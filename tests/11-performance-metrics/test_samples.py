@@ -0,0 +1,125 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import random
+import statistics
+
+import pytest
+
+from sdwsn_controller.node.node import Node
+from sdwsn_controller.performance_metrics.running_stats import RunningStats
+
+
+def test_running_stats():
+    rng = random.Random(0)
+    values = [rng.uniform(-100, 1000) for _ in range(1000)]
+    stats = RunningStats()
+    assert stats.average() == 0 and stats.variance() == 0.0
+    for value in values:
+        stats.add(value)
+    assert stats.count == len(values)
+    assert stats.average() == pytest.approx(statistics.fmean(values))
+    assert stats.mean == pytest.approx(statistics.fmean(values))
+    assert stats.variance() == pytest.approx(statistics.pvariance(values))
+    assert stats.std() == pytest.approx(statistics.pstdev(values))
+    assert (stats.min, stats.max) == (min(values), max(values))
+    stats.clear()
+    assert stats.count == 0 and stats.min is None
+
+
+@pytest.mark.parametrize('samples_window', [None, 16])
+def test_samples_aggregates(samples_window):
+    rng = random.Random(1)
+    node = Node(2, sid=None, samples_window=samples_window)
+    delays = []
+    callbacks = []
+    node.delay_register_callback(lambda **kwargs: callbacks.append(kwargs))
+    for seq in range(1, 101):
+        delay = rng.randrange(10, 500)
+        delays.append(delay)
+        node.delay_add(seq, delay)
+        node.energy_add(seq, delay * 2)
+        node.pdr_add(seq)
+        # Duplicates are ignored
+        assert node.delay_add(seq, 1) is None
+    assert node.delay_get_average() == sum(delays) / len(delays)
+    assert node.delay.stats.max == max(delays)
+    assert node.energy.stats.min == 2 * min(delays)
+    assert node.energy_get_last() == 2 * delays[-1]
+    assert node.pdr_get_average() == 1.0
+    assert len(callbacks) == 100
+    if samples_window:
+        assert node.delay.size() == node.energy.size() == node.pdr.size() == samples_window
+        assert list(node.delay.samples) == list(range(101 - samples_window, 101))
+    node.delay_clear()
+    assert node.delay_get_average() == 0 and node.delay.size() == 0
+
+
+def test_evicted_samples():
+    node = Node(2, sid=None, samples_window=4)
+    for seq in range(10, 0, -1):
+        node.energy_add(seq, seq * 10)
+        node.delay_add(seq, seq)
+    # The newest sample has long been evicted
+    assert node.energy.get_sample(10) is None
+    assert node.energy_get_last() == 100
+    # Retransmissions of evicted samples are still duplicates
+    assert node.energy_add(10, 1) is None
+    assert node.delay_add(10, 1) is None
+    assert node.energy.stats.count == node.delay.stats.count == 10
+    assert node.delay_get_average() == 5.5
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_pdr_sequence_gaps(seed):
+    rng = random.Random(seed)
+    node = Node(2, sid=None, samples_window=32)
+    first = rng.randrange(256)
+    sent = list(range(first, first + 1000))
+    delivered = [seq for seq in sent if rng.random() < 0.7]
+    # Some packets arrive late or twice
+    arrivals = []
+    for seq in delivered:
+        arrivals.append(seq)
+        if rng.random() < 0.1:
+            arrivals.append(seq)
+    for i in range(len(arrivals) - 1):
+        if rng.random() < 0.1:
+            arrivals[i], arrivals[i + 1] = arrivals[i + 1], arrivals[i]
+    callbacks = []
+    node.pdr_register_callback(lambda **kwargs: callbacks.append(kwargs['pdr']))
+    for seq in arrivals:
+        node.pdr_add(seq % 256)
+    expected = max(delivered) - min(delivered) + 1
+    assert node.pdr.received == len(delivered) == len(callbacks)
+    assert node.pdr.get_expected() == expected
+    assert node.pdr.get_lost() == expected - len(delivered)
+    assert node.pdr_get_average() == len(delivered) / expected
+    assert callbacks[-1] == node.pdr_get_average()
+
+
+def test_pdr_wraparound():
+    node = Node(2, sid=None)
+    assert node.pdr_get_average() == 0
+    for seq in (250, 251, 253, 255, 0, 2):
+        node.pdr_add(seq)
+    assert node.pdr.get_expected() == 9 and node.pdr.get_lost() == 3
+    # Late packet
+    node.pdr_add(252)
+    assert node.pdr.get_lost() == 2
+    assert node.pdr_add(252) is None
+    node.pdr_clear()
+    assert node.pdr.get_expected() == 0
@@ -0,0 +1,119 @@
+#!/usr/bin/python3
+#
+# Copyright (C) 2022  Fernando Jurado-Lasso <ffjla@dtu.dk>
+
+# This program is free software: you can redistribute it and/or modify
+# it under the terms of the GNU General Public License as published by
+# the Free Software Foundation, either version 3 of the License, or
+# (at your option) any later version.
+
+# This program is distributed in the hope that it will be useful,
+# but WITHOUT ANY WARRANTY; without even the implied warranty of
+# MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+# GNU General Public License for more details.
+
+# You should have received a copy of the GNU General Public License
+# along with this program.  If not, see <https://www.gnu.org/licenses/>.
+import logging
+import random
+import types
+
+import numpy as np
+import pytest
+
+from sdwsn_controller.common import common
+from sdwsn_controller.network.network import Network
+from sdwsn_controller.reinforcement_learning.reward_processing import EmulatedRewardProcessing
+
+
+def build_network(num_nodes, seed):
+    config = types.SimpleNamespace(
+        network=types.SimpleNamespace(processing_window=200, control_window=1,
+                                      control_mtu=104, control_delta=False,
+                                      samples_window=None),
+        tsch=types.SimpleNamespace(max_channel=3, max_slotframe=500, slot_duration=10))
+    network = Network(config=config, socket=None)
+    network.nodes_add(id=0, sid="1.1", rank=0)
+    network.nodes_add(id=1, rank=0)
+    rng = random.Random(seed)
+    for node_id in range(2, num_nodes + 1):
+        node = network.nodes_add(node_id, rank=rng.randrange(1, 8))
+        for _ in range(rng.randrange(1, 6)):
+            node.neighbor_add(rng.randrange(1, num_nodes + 1), -60, 1)
+        for seq in range(1, rng.randrange(2, 20)):
+            node.energy_add(seq, rng.randrange(100, 1000))
+            node.delay_add(seq, rng.randrange(10, 500))
+            if rng.random() < 0.8:
+                node.pdr_add(seq)
+    return network
+
+
+def build_reward_processing(network):
+    metric = types.SimpleNamespace(min=0, max=1000, norm_offset=0.1)
+    config = types.SimpleNamespace(performance_metrics=types.SimpleNamespace(
+        energy=metric, delay=metric, pdr=metric))
+    return EmulatedRewardProcessing(config, network=network)
+
+
+def reference_wam(network, value, weight):
+    # One node at a time, as the reward used to be computed
+    nodes = [node for node in network.nodes.values() if node.id > 1]
+    weights = np.array([weight(node) for node in nodes])
+    values = np.array([value(node) for node in nodes])
+    return np.dot(weights / weights.sum(), values), values.sum() / len(values)
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_emulated_reward(seed):
+    network = build_network(40, seed)
+    reward_processing = build_reward_processing(network)
+    info = reward_processing.calculate_reward(0.3, 0.3, 0.4, None)
+    last_rank = max(node.rank for node in network.nodes.values())
+    N = network.nodes_size()
+
+    def rank_nbr_weight(node):
+        return 0.9 * (node.rank / last_rank) + 0.1 * (node.neighbors_len() / N)
+
+    def rank_weight(node):
+        return 1 - node.rank / (last_rank + 1)
+
+    power_wam, power_mean = reference_wam(network, lambda node: node.energy_get_last(), rank_nbr_weight)
+    delay_wam, delay_mean = reference_wam(network, lambda node: node.delay_get_average(), rank_weight)
+    pdr_wam, pdr_mean = reference_wam(network, lambda node: node.pdr_get_average(), rank_nbr_weight)
+    assert info['power_wam'] == pytest.approx(power_wam)
+    assert info['power_mean'] == pytest.approx(power_mean)
+    assert info['power_normalized'] == pytest.approx(0.1 + power_wam / 1000)
+    assert info['delay_wam'] == pytest.approx(delay_wam)
+    assert info['delay_mean'] == pytest.approx(delay_mean)
+    assert info['pdr_wam'] == pytest.approx(pdr_wam - 0.1)
+    assert info['pdr_mean'] == pytest.approx(pdr_mean)
+    assert info['reward'] == pytest.approx(
+        2 - (0.3 * info['power_normalized'] + 0.3 * info['delay_normalized'] - 0.4 * info['pdr_wam']))
+    # Per-node weights, in the order of node_ids
+    assert list(reward_processing.node_ids) == list(range(2, 41))
+    assert reward_processing.delay_weights.sum() == pytest.approx(1)
+    node = network.nodes_get(7)
+    assert reward_processing.power_weights[5] == pytest.approx(
+        rank_nbr_weight(node) / sum(rank_nbr_weight(n) for n in network.nodes.values() if n.id > 1))
+
+
+def test_no_debug_tables(monkeypatch):
+    network = build_network(20, 0)
+    reward_processing = build_reward_processing(network)
+    rendered = []
+    monkeypatch.setattr(common, 'log_table', lambda table: rendered.append(table) or '')
+    main_logger = logging.getLogger('main')
+    level = main_logger.level
+    try:
+        main_logger.setLevel(logging.INFO)
+        reward_processing.calculate_reward(0.3, 0.3, 0.4, None)
+        network.routes_print()
+        network.tsch_print()
+        network.nodes_get(2).energy_print()
+        assert not rendered
+        main_logger.setLevel(logging.DEBUG)
+        reward_processing.calculate_reward(0.3, 0.3, 0.4, None)
+        network.tsch_print()
+        assert len(rendered) == 4
+    finally:
+        main_logger.setLevel(level)